@@ -0,0 +1,198 @@
+//SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/utils/Counters.sol";
+import "./LeanERC721.sol";
+import "./WinnerEncoding.sol";
+
+
+/// @title CIF E-Sports Trophy Contract, lean minting variant
+/// @author Matthias Nadler, University of Basel
+/// @notice Implements ERC721, Metadata and Enumerable interfaces. Compatible with the governance contract for
+/// passing trophies, setting the base URI and transferring ownership, without claims and batch passes.
+contract CifEsportsLeanTrophy is LeanERC721, Ownable {
+    using Counters for Counters.Counter;
+    Counters.Counter private _trophyIds;
+
+    event TrophyPassed(uint256 indexed trophyId, bytes32 infoHash);
+    // Carry what consumers of TrophyPassed and Transfer would otherwise read from the views
+    event TrophyDetails(uint256 indexed trophyId, string tournament, bytes32 infoHash, uint256 nWinners);
+    event WinnerMinted(uint256 indexed trophyId, address indexed holder, uint256 indexed tokenId, string winnerName);
+
+    // The tokens of a trophy are minted in one go, so their ids are consecutive
+    struct Trophy {
+        string tournament;
+        bytes32 infoHash;
+        uint64 timeReceived;
+        uint64 firstTokenId;
+        uint64 nWinners;
+    }
+    mapping(uint256 => Trophy) public trophies;
+
+    // Winner names by token id, the trophy id of a token is stored next to its owner
+    mapping(uint256 => string) private _tokenNames;
+
+    // URIs shared by all tokens of a trophy
+    mapping(uint256 => string) private _trophyURIs;
+    mapping(uint256 => bool) private _hasTokenURI;
+
+    // Number of tokens of a trophy held by an address, kept up to date on every transfer
+    mapping(uint256 => mapping(address => uint256)) private _trophyBalances;
+
+    constructor() public LeanERC721("CIF ESports Trophy", "CIF") {
+    }
+
+    function setBaseURI(string memory baseURI_) public onlyOwner {
+        _setBaseURI(baseURI_);
+    }
+
+    function setTokenURI(uint256 tokenId, string memory _tokenURI) public onlyOwner {
+        _setTokenURI(tokenId, _tokenURI);
+        _hasTokenURI[tokenId] = bytes(_tokenURI).length > 0;
+    }
+
+    /// @notice Shared by all tokens of the trophy that don't have their own token URI
+    function setTrophyURI(uint256 _trophyId, string memory _trophyURI) public onlyOwner {
+        require(_trophyId > 0 && _trophyId <= _trophyIds.current(), "Cif: trophy does not exist");
+        _trophyURIs[_trophyId] = _trophyURI;
+    }
+
+    function trophyURI(uint256 _trophyId) external view returns (string memory) {
+        return _trophyURIs[_trophyId];
+    }
+
+    /// @notice Resolves the token URI, then the trophy URI, then the token id, each appended to the base URI if set
+    function tokenURI(uint256 _tokenId) public view virtual override returns (string memory) {
+        string memory uri = _trophyURIs[_tokenAux(_tokenId)];
+        if (_hasTokenURI[_tokenId] || bytes(uri).length == 0) {
+            return super.tokenURI(_tokenId);
+        }
+        require(_exists(_tokenId), "ERC721Metadata: URI query for nonexistent token");
+        return string(abi.encodePacked(baseURI(), uri));
+    }
+
+    function passTrophy(
+        string memory _tournament,
+        bytes32 _infoHash,
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames
+    ) public onlyOwner {
+        uint256 nWinners = _winnerAddresses.length;
+        require(nWinners == _winnerNames.length, "Cif: not same length for address- and name arrays");
+
+        _trophyIds.increment();
+        uint256 newTrophyId = _trophyIds.current();
+        uint256 firstTokenId = totalSupply() + 1;
+        // Before the mint, a receiver may already move the token in onERC721Received
+        for (uint256 i=0; i < nWinners; i++) {
+            _tokenNames[firstTokenId + i] = _winnerNames[i];
+            emit WinnerMinted(newTrophyId, _winnerAddresses[i], firstTokenId + i, _winnerNames[i]);
+        }
+        // Winners that follow each other with the same address are minted as one run
+        uint256 runStart = 0;
+        for (uint256 i=1; i <= nWinners; i++) {
+            if (i == nWinners || _winnerAddresses[i] != _winnerAddresses[runStart]) {
+                _safeMintConsecutive(_winnerAddresses[runStart], i - runStart, uint96(newTrophyId));
+                runStart = i;
+            }
+        }
+        trophies[newTrophyId] = Trophy(
+            _tournament,
+            _infoHash,
+            uint64(block.timestamp),
+            uint64(firstTokenId),
+            uint64(nWinners)
+        );
+        emit TrophyPassed(newTrophyId, _infoHash);
+        emit TrophyDetails(newTrophyId, _tournament, _infoHash, nWinners);
+    }
+
+    /// @notice Same as passTrophy with the winners packed as described in WinnerEncoding, saves calldata
+    function passTrophy(string memory _tournament, bytes32 _infoHash, bytes memory _packedWinners) public onlyOwner {
+        (address[] memory winnerAddresses, string[] memory winnerNames) = WinnerEncoding.decode(_packedWinners);
+        passTrophy(_tournament, _infoHash, winnerAddresses, winnerNames);
+    }
+
+    function winners(uint256 _tokenId) public view returns (uint256 trophyId, string memory winnerName) {
+        return (_tokenAux(_tokenId), _tokenNames[_tokenId]);
+    }
+
+    function getInfoByTrophyId(uint256 _trophyId) public view returns (
+        string memory tournament,
+        uint256 trophyId,
+        bytes32 infoHash,
+        string[] memory winners_,
+        uint256[] memory tokenIds,
+        uint256 timeReceived,
+        uint256 timePassedOn
+    ) {
+        require(_trophyId > 0 && _trophyId <= _trophyIds.current(), "Cif: trophy does not exist");
+        Trophy storage trophy = trophies[_trophyId];
+        winners_ = new string[](trophy.nWinners);
+        tokenIds = new uint256[](trophy.nWinners);
+        for (uint256 i = 0; i < trophy.nWinners; i++) {
+            tokenIds[i] = trophy.firstTokenId + i;
+            winners_[i] = _tokenNames[tokenIds[i]];
+        }
+        if (_trophyId < _trophyIds.current()) {
+            timePassedOn = trophies[_trophyId + 1].timeReceived;
+        }
+        return (trophy.tournament, _trophyId, trophy.infoHash, winners_, tokenIds, trophy.timeReceived, timePassedOn);
+    }
+
+    function getInfoByTokenId(uint256 _tokenId) external view returns (
+        string memory tournament,
+        uint256 trophyId,
+        bytes32 infoHash,
+        string[] memory winners_,
+        uint256[] memory tokenIds,
+        uint256 timeReceived,
+        uint256 timePassedOn
+    ) {
+        require(_exists(_tokenId), "Cif: token does not exist");
+        return getInfoByTrophyId(_tokenAux(_tokenId));
+    }
+
+    function currentTrophy() external view returns (
+        string memory tournament,
+        uint256 trophyId,
+        bytes32 infoHash,
+        string[] memory winners_,
+        uint256[] memory tokenIds,
+        uint256 timeReceived,
+        uint256 timePassedOn
+    ) {
+        return getInfoByTrophyId(_trophyIds.current());
+    }
+
+    function currentTrophyId() public view returns (uint256 trophyId) {
+        return _trophyIds.current();
+    }
+
+    function holdsTrophy(address _holder, uint256 _trophyId) public view returns (bool) {
+        return _trophyBalances[_trophyId][_holder] > 0;
+    }
+
+    function hasAddressCurrentTrophy(address _holder) public view returns (bool ownsCurrent) {
+        return holdsTrophy(_holder, _trophyIds.current());
+    }
+
+    /// @dev All tokens of a batch belong to the same trophy
+    function _beforeTokenTransfer(
+        address _from,
+        address _to,
+        uint256 _firstTokenId,
+        uint256 _batchSize
+    ) internal virtual override {
+        super._beforeTokenTransfer(_from, _to, _firstTokenId, _batchSize);
+        uint256 trophyId = _tokenAux(_firstTokenId);
+        if (_from != address(0)) {
+            _trophyBalances[trophyId][_from] -= _batchSize;
+        }
+        if (_to != address(0)) {
+            _trophyBalances[trophyId][_to] += _batchSize;
+        }
+    }
+}
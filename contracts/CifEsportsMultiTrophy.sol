@@ -5,6 +5,9 @@ pragma experimental ABIEncoderV2;
 import "@openzeppelin/contracts/token/ERC721/ERC721.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
 import "@openzeppelin/contracts/utils/Counters.sol";
+import "@openzeppelin/contracts/utils/SafeCast.sol";
+import "@openzeppelin/contracts/cryptography/MerkleProof.sol";
+import "./WinnerEncoding.sol";
 
 
 /// @title CIF E-Sports Trophy Contract
@@ -12,24 +15,71 @@ import "@openzeppelin/contracts/utils/Counters.sol";
 /// @notice Implements ERC721, Metadata and Enumerable interfaces.
 contract CifEsportsMultiTrophy is ERC721, Ownable  {
     using Counters for Counters.Counter;
+    using SafeCast for uint256;
     Counters.Counter private _trophyIds;
-    Counters.Counter private _winnerIds;
+    uint256 private _lastTokenId; // Minted or reserved for claims
 
     event TrophyPassed(uint256 indexed trophyId, bytes32 infoHash);
+    event TrophyCancelled(uint256 indexed trophyId);
+    // Carry what consumers of TrophyPassed and Transfer would otherwise read from the views
+    event TrophyDetails(uint256 indexed trophyId, string tournament, bytes32 infoHash, uint256 nWinners);
+    event WinnerMinted(uint256 indexed trophyId, address indexed holder, uint256 indexed tokenId, string winnerName);
 
+    // Trophies and winners are packed to save storage slots, `trophies` and `winners` return them unpacked.
+    // `trophies` keeps its original three fields, the claim data of a trophy is read with `trophyClaims`
     struct Trophy {
         string tournament;
         bytes32 infoHash;
-        uint256 timeReceived;
-        uint256[] winnerIds;
+        uint64 timeReceived;
+        uint64 firstClaimTokenId;
+        uint64 claimTokenCount;
+        uint32[] winnerIds;
+        bytes32 claimRoot; // Merkle root of claimable tokens, empty if all tokens were minted on pass
     }
-    mapping(uint256 => Trophy) public trophies;
+    mapping(uint256 => Trophy) private _trophies;
 
     struct Winner {
+        uint32 trophyId;
+        uint8 shortNameLength; // 0 if the name is stored in longName
+        bytes27 shortName;
+        string longName; // Only used for names longer than 27 bytes
+    }
+    mapping(uint256 => Winner) private _winners;
+
+    // Return types of the range views
+    struct TrophyInfo {
+        string tournament;
         uint256 trophyId;
+        bytes32 infoHash;
+        string[] winners;
+        uint256[] tokenIds;
+        uint256 timeReceived;
+        uint256 timePassedOn;
+    }
+    struct WinnerInfo {
+        uint256 tokenId;
+        uint256 trophyId;
+        address holder;
         string name;
     }
-    mapping(uint256 => Winner) public winners;
+
+    // URIs shared by all tokens of a trophy
+    mapping(uint256 => string) private _trophyURIs;
+    mapping(uint256 => bool) private _hasTokenURI;
+
+    // Number of tokens of a trophy held by an address, kept up to date on every transfer
+    mapping(uint256 => mapping(address => uint256)) private _trophyBalances;
+
+    // Trophy that is being passed in batches, 0 if there is none
+    uint256 public openTrophyId;
+    bytes32 private _pendingRosterHash;
+    // Number of batch passes opened so far. Trophy ids are used again after a cancellation, this count is not.
+    uint256 public openTrophyCount;
+
+    modifier noOpenTrophy() {
+        require(openTrophyId == 0, "Cif: trophy pass in progress");
+        _;
+    }
 
     constructor() public ERC721("CIF ESports Trophy", "CIF") {
     }
@@ -40,6 +90,27 @@ contract CifEsportsMultiTrophy is ERC721, Ownable  {
 
     function setTokenURI(uint256 tokenId, string memory _tokenURI) public onlyOwner {
         _setTokenURI(tokenId, _tokenURI);
+        _hasTokenURI[tokenId] = bytes(_tokenURI).length > 0;
+    }
+
+    /// @notice Shared by all tokens of the trophy that don't have their own token URI
+    function setTrophyURI(uint256 _trophyId, string memory _trophyURI) public onlyOwner {
+        require(_trophyId > 0 && _trophyId <= _trophyIds.current(), "Cif: trophy does not exist");
+        _trophyURIs[_trophyId] = _trophyURI;
+    }
+
+    function trophyURI(uint256 _trophyId) external view returns (string memory) {
+        return _trophyURIs[_trophyId];
+    }
+
+    /// @notice Resolves the token URI, then the trophy URI, then the token id, each appended to the base URI if set
+    function tokenURI(uint256 _tokenId) public view virtual override returns (string memory) {
+        string memory uri = _trophyURIs[_winners[_tokenId].trophyId];
+        if (_hasTokenURI[_tokenId] || bytes(uri).length == 0) {
+            return super.tokenURI(_tokenId);
+        }
+        require(_exists(_tokenId), "ERC721Metadata: URI query for nonexistent token");
+        return string(abi.encodePacked(baseURI(), uri));
     }
 
     function passTrophy(
@@ -47,23 +118,205 @@ contract CifEsportsMultiTrophy is ERC721, Ownable  {
         bytes32 _infoHash,
         address[] memory _winnerAddresses,
         string[] memory _winnerNames
-    ) public onlyOwner {
+    ) public onlyOwner noOpenTrophy {
         uint256 nWinners = _winnerAddresses.length;
         require(nWinners == _winnerNames.length, "Cif: not same length for address- and name arrays");
 
         _trophyIds.increment();
         uint256 newTrophyId = _trophyIds.current();
-        uint256[] memory winnerIds = new uint256[](nWinners);
+        uint32[] memory winnerIds = new uint32[](nWinners);
 
         for (uint256 i=0; i < nWinners; i++) {
-            _winnerIds.increment();
-            uint256 newWinnerId = _winnerIds.current();
-            winners[newWinnerId] = Winner(newTrophyId, _winnerNames[i]);
-            winnerIds[i] = newWinnerId;
-            _safeMint(_winnerAddresses[i], newWinnerId);
+            winnerIds[i] = _mintWinner(newTrophyId, _winnerAddresses[i], _winnerNames[i]).toUint32();
         }
-        trophies[newTrophyId] = Trophy(_tournament, _infoHash, block.timestamp, winnerIds);
+        _trophies[newTrophyId] = Trophy(_tournament, _infoHash, uint64(block.timestamp), 0, 0, winnerIds, bytes32(0));
+        emit TrophyPassed(newTrophyId, _infoHash);
+        emit TrophyDetails(newTrophyId, _tournament, _infoHash, nWinners);
+    }
+
+    /// @notice Same as passTrophy with the winners packed as described in WinnerEncoding, saves calldata
+    function passTrophy(string memory _tournament, bytes32 _infoHash, bytes memory _packedWinners) public onlyOwner {
+        (address[] memory winnerAddresses, string[] memory winnerNames) = WinnerEncoding.decode(_packedWinners);
+        passTrophy(_tournament, _infoHash, winnerAddresses, winnerNames);
+    }
+
+    /// @notice Passes the trophy without minting. Each winner's token is minted on `claim`.
+    /// @dev Leaves are keccak256(abi.encode(winnerAddress, index, winnerName)) for index 0 to _nWinners - 1.
+    function passTrophyByClaim(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes32 _claimRoot,
+        uint256 _nWinners
+    ) public onlyOwner noOpenTrophy {
+        require(_claimRoot != bytes32(0), "Cif: claim root is empty");
+        // Token ids are stored in 32 bits, so the first id and the count also fit in 64 bits
+        require(_nWinners > 0 && _nWinners <= type(uint32).max - _lastTokenId, "Cif: number of winners out of range");
+
+        _trophyIds.increment();
+        uint256 newTrophyId = _trophyIds.current();
+        uint256 firstTokenId = _lastTokenId + 1;
+        // Reserve the token ids of all winners at once
+        _lastTokenId += _nWinners;
+
+        _trophies[newTrophyId] = Trophy(
+            _tournament,
+            _infoHash,
+            uint64(block.timestamp),
+            uint64(firstTokenId),
+            uint64(_nWinners),
+            new uint32[](0),
+            _claimRoot
+        );
         emit TrophyPassed(newTrophyId, _infoHash);
+        emit TrophyDetails(newTrophyId, _tournament, _infoHash, _nWinners);
+    }
+
+    /// @notice Starts passing a trophy whose winners are appended in batches with `appendWinners` by anyone.
+    /// The trophy becomes the current trophy on `finalizeTrophy`.
+    /// @dev _rosterHash commits to all batches in order: hash_i = keccak256(abi.encode(addresses_i, names_i, hash_i+1)),
+    /// the hash after the last batch is zero.
+    function openTrophy(string memory _tournament, bytes32 _infoHash, bytes32 _rosterHash) public onlyOwner noOpenTrophy {
+        require(_rosterHash != bytes32(0), "Cif: roster hash is empty");
+        openTrophyId = _trophyIds.current() + 1;
+        openTrophyCount += 1;
+        _pendingRosterHash = _rosterHash;
+        _trophies[openTrophyId] = Trophy(_tournament, _infoHash, 0, 0, 0, new uint32[](0), bytes32(0));
+    }
+
+    function appendWinners(
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames,
+        bytes32 _nextRosterHash
+    ) public {
+        require(openTrophyId != 0, "Cif: no trophy pass in progress");
+        require(_winnerAddresses.length == _winnerNames.length, "Cif: not same length for address- and name arrays");
+        require(
+            keccak256(abi.encode(_winnerAddresses, _winnerNames, _nextRosterHash)) == _pendingRosterHash,
+            "Cif: batch does not match roster"
+        );
+        _pendingRosterHash = _nextRosterHash;
+
+        uint256 trophyId = openTrophyId;
+        Trophy storage trophy = _trophies[trophyId];
+        for (uint256 i=0; i < _winnerAddresses.length; i++) {
+            trophy.winnerIds.push(_mintWinner(trophyId, _winnerAddresses[i], _winnerNames[i]).toUint32());
+        }
+    }
+
+    function finalizeTrophy() public {
+        require(openTrophyId != 0, "Cif: no trophy pass in progress");
+        require(_pendingRosterHash == bytes32(0), "Cif: roster is incomplete");
+        uint256 trophyId = openTrophyId;
+        openTrophyId = 0;
+        _trophyIds.increment();
+        Trophy storage trophy = _trophies[trophyId];
+        trophy.timeReceived = uint64(block.timestamp);
+        emit TrophyPassed(trophyId, trophy.infoHash);
+        emit TrophyDetails(trophyId, trophy.tournament, trophy.infoHash, trophy.winnerIds.length);
+    }
+
+    /// @notice Aborts the trophy pass in progress, for rosters that can't be appended completely.
+    /// Burns the tokens of the batches appended so far, the trophy id is used again by the next trophy.
+    function cancelOpenTrophy() public onlyOwner {
+        require(openTrophyId != 0, "Cif: no trophy pass in progress");
+        uint256 trophyId = openTrophyId;
+        uint32[] storage winnerIds = _trophies[trophyId].winnerIds;
+        for (uint256 i = 0; i < winnerIds.length; i++) {
+            uint256 tokenId = winnerIds[i];
+            _burn(tokenId);
+            delete _winners[tokenId];
+            delete _hasTokenURI[tokenId];
+        }
+        delete _trophies[trophyId];
+        openTrophyId = 0;
+        _pendingRosterHash = bytes32(0);
+        emit TrophyCancelled(trophyId);
+    }
+
+    /// @notice Mints a reserved token to its winner, can be sent by anyone holding the proof.
+    /// Unclaimed tokens do not exist: they are not listed by the trophy and do not count as held.
+    function claim(
+        uint256 _trophyId,
+        uint256 _index,
+        address _winnerAddress,
+        string memory _winnerName,
+        bytes32[] memory _proof
+    ) public {
+        Trophy storage trophy = _trophies[_trophyId];
+        require(trophy.claimRoot != bytes32(0), "Cif: trophy has no claimable tokens");
+        require(_index < trophy.claimTokenCount, "Cif: claim index out of range");
+        uint256 tokenId = trophy.firstClaimTokenId + _index;
+        require(!_exists(tokenId), "Cif: token already claimed");
+        bytes32 leaf = keccak256(abi.encode(_winnerAddress, _index, _winnerName));
+        require(MerkleProof.verify(_proof, trophy.claimRoot, leaf), "Cif: invalid claim proof");
+
+        _setWinner(tokenId, _trophyId, _winnerName);
+        trophy.winnerIds.push(tokenId.toUint32());
+        // Before the mint, a receiver may already move the token in onERC721Received
+        emit WinnerMinted(_trophyId, _winnerAddress, tokenId, _winnerName);
+        _safeMint(_winnerAddress, tokenId);
+    }
+
+    function _mintWinner(uint256 _trophyId, address _winnerAddress, string memory _winnerName) internal returns (uint256 tokenId) {
+        _lastTokenId += 1;
+        tokenId = _lastTokenId;
+        _setWinner(tokenId, _trophyId, _winnerName);
+        emit WinnerMinted(_trophyId, _winnerAddress, tokenId, _winnerName);
+        _safeMint(_winnerAddress, tokenId);
+        return tokenId;
+    }
+
+    /// @dev Names of up to 27 bytes share the slot with the trophy id
+    function _setWinner(uint256 _tokenId, uint256 _trophyId, string memory _name) internal {
+        bytes memory nameBytes = bytes(_name);
+        uint256 length = nameBytes.length;
+        if (length > 27) {
+            _winners[_tokenId] = Winner(_trophyId.toUint32(), 0, bytes27(0), _name);
+            return;
+        }
+        bytes27 shortName;
+        assembly {
+            // Keep the first `length` bytes of the name
+            shortName := and(mload(add(nameBytes, 32)), not(shr(mul(length, 8), not(0))))
+        }
+        _winners[_tokenId] = Winner(_trophyId.toUint32(), uint8(length), shortName, "");
+    }
+
+    function _winnerName(uint256 _tokenId) internal view returns (string memory winnerName) {
+        Winner storage winner = _winners[_tokenId];
+        uint256 length = winner.shortNameLength;
+        if (length == 0) {
+            return winner.longName;
+        }
+        winnerName = new string(length);
+        bytes27 shortName = winner.shortName;
+        assembly {
+            mstore(add(winnerName, 32), shortName)
+        }
+        return winnerName;
+    }
+
+    function trophies(uint256 _trophyId) public view returns (
+        string memory tournament,
+        bytes32 infoHash,
+        uint256 timeReceived
+    ) {
+        Trophy storage trophy = _trophies[_trophyId];
+        return (trophy.tournament, trophy.infoHash, trophy.timeReceived);
+    }
+
+    /// @notice Merkle root and reserved token ids of a trophy passed by claim, all zero otherwise
+    function trophyClaims(uint256 _trophyId) public view returns (
+        bytes32 claimRoot,
+        uint256 firstClaimTokenId,
+        uint256 claimTokenCount
+    ) {
+        Trophy storage trophy = _trophies[_trophyId];
+        return (trophy.claimRoot, trophy.firstClaimTokenId, trophy.claimTokenCount);
+    }
+
+    function winners(uint256 _tokenId) public view returns (uint256 trophyId, string memory winnerName) {
+        return (_winners[_tokenId].trophyId, _winnerName(_tokenId));
     }
 
     function getInfoByTrophyId(uint256 _trophyId) public view returns (
@@ -76,15 +329,13 @@ contract CifEsportsMultiTrophy is ERC721, Ownable  {
         uint256 timePassedOn
     ) {
         require(_trophyId > 0 && _trophyId <= _trophyIds.current(), "Cif: trophy does not exist");
-        Trophy storage trophy = trophies[_trophyId];
-        winners_ = new string[](trophy.winnerIds.length);
-        for (uint256 i = 0; i < trophy.winnerIds.length; i++) {
-            winners_[i] = winners[trophy.winnerIds[i]].name;
-        }
+        Trophy storage trophy = _trophies[_trophyId];
+        tokenIds = _unpackTokenIds(trophy.winnerIds);
+        winners_ = _winnerNames(tokenIds);
         if (_trophyId < _trophyIds.current()) {
-            timePassedOn = trophies[_trophyId + 1].timeReceived;
+            timePassedOn = _trophies[_trophyId + 1].timeReceived;
         }
-        return (trophy.tournament, _trophyId, trophy.infoHash, winners_, trophy.winnerIds, trophy.timeReceived, timePassedOn);
+        return (trophy.tournament, _trophyId, trophy.infoHash, winners_, tokenIds, trophy.timeReceived, timePassedOn);
     }
 
     function getInfoByTokenId(uint256 _tokenId) external view returns (
@@ -97,7 +348,88 @@ contract CifEsportsMultiTrophy is ERC721, Ownable  {
         uint256 timePassedOn
     ) {
         require(_exists(_tokenId), "Cif: token does not exist");
-        return getInfoByTrophyId(winners[_tokenId].trophyId);
+        return getInfoByTrophyId(_winners[_tokenId].trophyId);
+    }
+
+    /// @notice Trophies `_start` to `_start + _count - 1` as returned by `getInfoByTrophyId`, up to the current trophy
+    function getTrophiesRange(uint256 _start, uint256 _count) external view returns (TrophyInfo[] memory trophies_) {
+        require(_start > 0, "Cif: trophy does not exist");
+        uint256 lastTrophyId = _trophyIds.current();
+        if (_start > lastTrophyId) {
+            return new TrophyInfo[](0);
+        }
+        if (_count > lastTrophyId - _start + 1) {
+            _count = lastTrophyId - _start + 1;
+        }
+        trophies_ = new TrophyInfo[](_count);
+
+        // Walk backwards, so every trophy is passed on at the time the next one was received
+        uint256 timePassedOn = 0;
+        if (_start + _count <= lastTrophyId) {
+            timePassedOn = _trophies[_start + _count].timeReceived;
+        }
+        for (uint256 i = _count; i > 0; i--) {
+            trophies_[i - 1] = _trophyInfo(_start + i - 1, timePassedOn);
+            timePassedOn = trophies_[i - 1].timeReceived;
+        }
+        return trophies_;
+    }
+
+    /// @notice Minted tokens among the ids `_start` to `_start + _count - 1`. Reserved tokens that have not been claimed
+    /// yet and burned tokens are skipped, so a page can be shorter than `_count`, the next page starts at `_start + _count`.
+    function getWinnersRange(uint256 _start, uint256 _count) external view returns (WinnerInfo[] memory winners_) {
+        require(_start > 0, "Cif: token does not exist");
+        uint256 lastTokenId = _lastTokenId;
+        if (_start > lastTokenId) {
+            return new WinnerInfo[](0);
+        }
+        if (_count > lastTokenId - _start + 1) {
+            _count = lastTokenId - _start + 1;
+        }
+        winners_ = new WinnerInfo[](_count);
+        uint256 nMinted = 0;
+        for (uint256 i = 0; i < _count; i++) {
+            uint256 tokenId = _start + i;
+            if (_exists(tokenId)) {
+                winners_[nMinted] = WinnerInfo(tokenId, _winners[tokenId].trophyId, ownerOf(tokenId), _winnerName(tokenId));
+                nMinted += 1;
+            }
+        }
+        // Shrink the array to the number of minted tokens
+        assembly {
+            mstore(winners_, nMinted)
+        }
+        return winners_;
+    }
+
+    function _trophyInfo(uint256 _trophyId, uint256 _timePassedOn) internal view returns (TrophyInfo memory) {
+        Trophy storage trophy = _trophies[_trophyId];
+        uint256[] memory tokenIds = _unpackTokenIds(trophy.winnerIds);
+        return TrophyInfo(
+            trophy.tournament,
+            _trophyId,
+            trophy.infoHash,
+            _winnerNames(tokenIds),
+            tokenIds,
+            trophy.timeReceived,
+            _timePassedOn
+        );
+    }
+
+    function _winnerNames(uint256[] memory _tokenIds) internal view returns (string[] memory names) {
+        names = new string[](_tokenIds.length);
+        for (uint256 i = 0; i < _tokenIds.length; i++) {
+            names[i] = _winnerName(_tokenIds[i]);
+        }
+        return names;
+    }
+
+    function _unpackTokenIds(uint32[] storage _packedIds) internal view returns (uint256[] memory tokenIds) {
+        tokenIds = new uint256[](_packedIds.length);
+        for (uint256 i = 0; i < _packedIds.length; i++) {
+            tokenIds[i] = _packedIds[i];
+        }
+        return tokenIds;
     }
 
     function currentTrophy() external view returns (
@@ -117,12 +449,60 @@ contract CifEsportsMultiTrophy is ERC721, Ownable  {
     }
 
     function hasAddressCurrentTrophy(address _holder) public view returns (bool ownsCurrent) {
-        Trophy storage trophy = trophies[_trophyIds.current()];
-        for (uint256 i=0; i<trophy.winnerIds.length; i++) {
-            if (_holder == ownerOf(trophy.winnerIds[i])) {
-                return true;
+        return holdsTrophy(_holder, _trophyIds.current());
+    }
+
+    function holdsTrophy(address _holder, uint256 _trophyId) public view returns (bool) {
+        return _trophyBalances[_trophyId][_holder] > 0;
+    }
+
+    /// @notice Tokens `_offset` to `_offset + _limit - 1` of a holder and the distinct trophies among them
+    function trophiesOf(address _holder, uint256 _offset, uint256 _limit) external view returns (
+        uint256[] memory trophyIds,
+        WinnerInfo[] memory tokens
+    ) {
+        uint256 balance = balanceOf(_holder);
+        if (_offset >= balance) {
+            return (new uint256[](0), new WinnerInfo[](0));
+        }
+        if (_limit > balance - _offset) {
+            _limit = balance - _offset;
+        }
+        tokens = new WinnerInfo[](_limit);
+        trophyIds = new uint256[](_limit);
+        uint256 nTrophies = 0;
+        for (uint256 i = 0; i < _limit; i++) {
+            uint256 tokenId = tokenOfOwnerByIndex(_holder, _offset + i);
+            uint256 trophyId = _winners[tokenId].trophyId;
+            tokens[i] = WinnerInfo(tokenId, trophyId, _holder, _winnerName(tokenId));
+            bool isNew = true;
+            for (uint256 j = 0; j < nTrophies; j++) {
+                if (trophyIds[j] == trophyId) {
+                    isNew = false;
+                    break;
+                }
             }
+            if (isNew) {
+                trophyIds[nTrophies] = trophyId;
+                nTrophies += 1;
+            }
+        }
+        // Shrink the array to the number of distinct trophies
+        assembly {
+            mstore(trophyIds, nTrophies)
+        }
+        return (trophyIds, tokens);
+    }
+
+    /// @dev Token winners are assigned before minting, so mints are counted for the right trophy
+    function _beforeTokenTransfer(address _from, address _to, uint256 _tokenId) internal virtual override {
+        super._beforeTokenTransfer(_from, _to, _tokenId);
+        uint256 trophyId = _winners[_tokenId].trophyId;
+        if (_from != address(0)) {
+            _trophyBalances[trophyId][_from] -= 1;
+        }
+        if (_to != address(0)) {
+            _trophyBalances[trophyId][_to] += 1;
         }
-        return false;
     }
 }
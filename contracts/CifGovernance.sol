@@ -2,7 +2,9 @@
 pragma solidity 0.6.12;
 pragma experimental ABIEncoderV2;
 
+import "@openzeppelin/contracts/cryptography/ECDSA.sol";
 import "@openzeppelin/contracts/utils/Counters.sol";
+import "./WinnerEncoding.sol";
 
 interface ICifEsportsMultiTrophy {
     function trophies(uint256 trophyId) external view returns (
@@ -11,16 +13,29 @@ interface ICifEsportsMultiTrophy {
         uint256 timeReceived,
         uint256[] calldata winnerIds
     );
+    function owner() external view returns (address);
     function transferOwnership(address newOwner) external;
     function hasAddressCurrentTrophy(address holder) external view returns (bool);
     function currentTrophyId() external view returns (uint256 trophyId);
     function setBaseURI(string memory baseURI) external;
+    function setTrophyURI(uint256 trophyId, string memory trophyURI) external;
     function passTrophy(
         string memory _tournament,
         bytes32 _infoHash,
         address[] memory _winnerAddresses,
         string[] memory _winnerNames
     ) external;
+    function passTrophy(string memory _tournament, bytes32 _infoHash, bytes memory _packedWinners) external;
+    function passTrophyByClaim(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes32 _claimRoot,
+        uint256 _nWinners
+    ) external;
+    function openTrophy(string memory _tournament, bytes32 _infoHash, bytes32 _rosterHash) external;
+    function openTrophyId() external view returns (uint256 trophyId);
+    function openTrophyCount() external view returns (uint256 count);
+    function cancelOpenTrophy() external;
 }
 
 /// @title Governance Contract for the CIF Esports Trophy
@@ -33,7 +48,12 @@ contract CifGovernance {
     event Revocation(address indexed sender, uint256 indexed transactionId);
     event Submission(uint256 indexed transactionId);
     event Execution(uint256 indexed transactionId);
+    // Emitted next to Submission and Execution with what log consumers would otherwise read from `transactions`.
+    // The proposer is the sender, for submitTransactionWithSignatures that is the relayer, not a signer.
+    event ProposalSubmitted(uint256 indexed transactionId, TransactionType indexed txnType, address indexed proposer);
+    event ProposalExecuted(uint256 indexed transactionId, TransactionType indexed txnType);
     event ExecutionFailure(uint256 indexed transactionId);
+    event Cancellation(uint256 indexed transactionId);
     event MemberAddition(address indexed member);
     event MemberRemoval(address indexed member);
     event QuorumChange(uint256 indexed oldQuorum, uint256 indexed newQuorum);
@@ -46,6 +66,17 @@ contract CifGovernance {
     uint256 public quorum; // In percent of members (0-100)
     uint256 public requiredVotes;
 
+    // Confirmations are stored as one bitmap per transaction, bit i belongs to members[i].
+    // Every removal or replacement of a member is recorded as a slot move. Bitmaps remember
+    // how many moves they have seen and replay the missing ones before they are read.
+    uint256 private constant MAX_MEMBERS = 256;
+    mapping(address => uint256) private _memberSlots; // Index in members + 1, 0 for non-members
+    struct SlotMove {
+        uint128 from; // The member in this slot moves to `to`, nobody moves if from == to
+        uint128 to;   // The confirmations in this slot are discarded
+    }
+    SlotMove[] private _slotMoves;
+
     // Transactions and Payloads (Information Containers)
     // --------------------------------------------------
     // Payloads are mappings that use the same ID as the underlying transaction.
@@ -58,20 +89,38 @@ contract CifGovernance {
         passTrophy,
         transferOwnership,
         changeQuorum,
-        setBaseURI
+        setBaseURI,
+        passTrophyByClaim,
+        openTrophy,
+        passTrophyCommitted,
+        setTrophyURI,
+        cancelOpenTrophy
     }
+    // Type, status and version share a slot. `transactions` only returns the type and the executed flag,
+    // the stored bitmap misses the slot moves it has not seen yet, read it with `confirmations` or `getConfirmations`.
+    // The payload of a transaction is deleted once it is executed or cancelled.
     struct Transaction {
         TransactionType txnType;
         bool executed;
+        bool cancelled;
+        uint64 membershipVersion; // Number of slot moves applied to confirmationBits
+        uint256 confirmationBits;
     }
 
     Counters.Counter public transactionCount;
-    mapping(uint256 => Transaction) public transactions;
-    mapping(uint256 => mapping(address => bool)) public confirmations;
+    mapping(uint256 => Transaction) private _transactions;
+
+    // Indexes for listing transactions without scanning the whole history. Pending transactions form a doubly
+    // linked list in ascending id order, id 0 links the last pending transaction to the first one.
+    mapping(uint256 => uint256) private _nextPending;
+    mapping(uint256 => uint256) private _previousPending;
+    uint256 private _pendingCount;
+    uint256[] private _executedTransactionIds;
 
     mapping(uint256 => address) public addressPayloads;
     mapping(uint256 => uint256) public uintPayloads;
     mapping(uint256 => string) public stringPayloads;
+    mapping(uint256 => bytes32) public bytes32Payloads;
 
     struct ReplaceMemberPayload {
         address oldMember;
@@ -79,15 +128,58 @@ contract CifGovernance {
     }
     mapping(uint256 => ReplaceMemberPayload) public replaceMemberPayloads;
 
+    struct TrophyURIPayload {
+        uint256 trophyId;
+        string uri;
+    }
+    mapping(uint256 => TrophyURIPayload) public trophyURIPayloads;
+
     struct PassTrophyPayload {
         uint256 currentTrophyId;
         string tournament;
         bytes32 infoHash;
         address[] winnerAddresses;
         string[] winnerNames;
+        bytes packedWinners; // Used instead of the arrays for proposals with packed winners, see WinnerEncoding
     }
     mapping(uint256 => PassTrophyPayload) public passTrophyPayloads;
 
+    struct TrophyCommitmentPayload {
+        uint256 currentTrophyId;
+        string tournament;
+        bytes32 infoHash;
+        bytes32 commitment; // Merkle root of the claimable winners or roster hash of the batches
+        uint256 nWinners;   // Number of claimable winners, unused for batches
+    }
+    mapping(uint256 => TrophyCommitmentPayload) public trophyCommitmentPayloads;
+
+    // Returned by `getGovernanceSnapshot`
+    struct ProposalSnapshot {
+        uint256 transactionId;
+        TransactionType txnType;
+        address[] confirmations;
+        bytes payload; // ABI encoding of the proposal arguments, as signed for submitTransactionWithSignatures
+    }
+    struct GovernanceSnapshot {
+        address[] members;
+        uint256 quorum;
+        uint256 requiredVotes;
+        uint256 transactionCount;
+        uint256 pendingCount;
+        ProposalSnapshot[] proposals;
+    }
+
+    // EIP-712 signatures of members for proposals submitted by a relayer. Trophy passes also sign the
+    // current trophy id, so their signatures can't be used once the trophy has been passed on.
+    bytes32 public constant PROPOSAL_TYPEHASH = keccak256(
+        "Proposal(uint8 txnType,bytes32 payloadHash,uint256 nonce,uint256 deadline)"
+    );
+    bytes32 public constant TROPHY_PROPOSAL_TYPEHASH = keccak256(
+        "TrophyProposal(uint8 txnType,bytes32 payloadHash,uint256 nonce,uint256 deadline,uint256 currentTrophyId)"
+    );
+    bytes32 immutable public DOMAIN_SEPARATOR;
+    uint256 public proposalNonce; // Nonce of the next relayed proposal
+
 
     // Modifiers
 
@@ -97,7 +189,7 @@ contract CifGovernance {
     }
 
     modifier validTransaction(uint256 _transactionId) {
-        require(uint256(transactions[_transactionId].txnType) > 0, "Gov: invalid transaction");
+        require(uint256(_transactions[_transactionId].txnType) > 0, "Gov: invalid transaction");
         _;
     }
 
@@ -107,8 +199,11 @@ contract CifGovernance {
     constructor (address _cifTrophyAddress, uint256 _initialQuorum, address[] memory _members) public {
         quorum = _initialQuorum;
         uint256 nMembers = _members.length;
+        require(nMembers <= MAX_MEMBERS, "Gov: too many members");
         for (uint256 i = 0; i < nMembers; i++) {
+            require(!isMember[_members[i]], "Gov: member already exists");
             isMember[_members[i]] = true;
+            _memberSlots[_members[i]] = i + 1;
         }
         members = _members;
         _updateRequiredVotes();
@@ -116,6 +211,18 @@ contract CifGovernance {
         // The reference to the CIF Trophy contract can never be changed
         cifTrophyAddress = _cifTrophyAddress;
         _cifTrophy = ICifEsportsMultiTrophy(_cifTrophyAddress);
+
+        uint256 chainId;
+        assembly {
+            chainId := chainid()
+        }
+        DOMAIN_SEPARATOR = keccak256(abi.encode(
+            keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"),
+            keccak256("CifGovernance"),
+            keccak256("1"),
+            chainId,
+            address(this)
+        ));
     }
 
     /// @dev Always rounds up to the next full number of members
@@ -123,15 +230,49 @@ contract CifGovernance {
         requiredVotes = (members.length * quorum + 99) / 100;
     }
 
+    function _newTransaction(TransactionType _txnType) internal returns (uint256 transactionId) {
+        transactionCount.increment();
+        transactionId = transactionCount.current();
+        _transactions[transactionId] = Transaction(_txnType, false, false, uint64(_slotMoves.length), 0);
+        // Ids are increasing, appending keeps the list sorted
+        uint256 lastId = _previousPending[0];
+        _nextPending[lastId] = transactionId;
+        _previousPending[transactionId] = lastId;
+        _previousPending[0] = transactionId;
+        _pendingCount += 1;
+        emit ProposalSubmitted(transactionId, _txnType, msg.sender);
+        return transactionId;
+    }
+
+    function _markExecuted(uint256 _transactionId) internal {
+        _transactions[_transactionId].executed = true;
+        _removePending(_transactionId);
+        _executedTransactionIds.push(_transactionId);
+    }
+
+    function _removePending(uint256 _transactionId) internal {
+        uint256 previousId = _previousPending[_transactionId];
+        uint256 nextId = _nextPending[_transactionId];
+        _nextPending[previousId] = nextId;
+        _previousPending[nextId] = previousId;
+        delete _nextPending[_transactionId];
+        delete _previousPending[_transactionId];
+        _pendingCount -= 1;
+    }
+
     function addMember(address _newMember) public onlyMember returns (uint256 transactionId) {
+        transactionId = _submitAddMember(_newMember);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitAddMember(address _newMember) internal returns (uint256 transactionId) {
         require(_newMember != address(0), "Gov: new member is the zero address");
         require(!isMember[_newMember], "Gov: member already exists");
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.addMember, false);
+        require(members.length < MAX_MEMBERS, "Gov: too many members");
+        transactionId = _newTransaction(TransactionType.addMember);
         addressPayloads[transactionId] = _newMember;
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
@@ -139,49 +280,60 @@ contract CifGovernance {
         address _newMember = addressPayloads[_transactionId];
         require(_newMember != address(0), "Gov: new member is the zero address");
         require(!isMember[_newMember], "Gov: member already exists");
+        require(members.length < MAX_MEMBERS, "Gov: too many members");
         isMember[_newMember] = true;
         members.push(_newMember);
+        _memberSlots[_newMember] = members.length;
         _updateRequiredVotes();
         emit MemberAddition(_newMember);
     }
 
     function removeMember(address _oldMember) public onlyMember returns (uint256 transactionId){
+        transactionId = _submitRemoveMember(_oldMember);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitRemoveMember(address _oldMember) internal returns (uint256 transactionId) {
         require(isMember[_oldMember], "Gov: member does not exist");
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.removeMember, false);
+        transactionId = _newTransaction(TransactionType.removeMember);
         addressPayloads[transactionId] = _oldMember;
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
     function _removeMember(uint256 _transactionId) internal validTransaction(_transactionId) {
         address _oldMember = addressPayloads[_transactionId];
         require(isMember[_oldMember], "Gov: member does not exist");
+        uint256 slot = _memberSlots[_oldMember] - 1;
+        uint256 lastSlot = members.length - 1;
         isMember[_oldMember] = false;
-        for (uint256 i = 0; i < members.length - 1; i++) {
-            if (members[i] == _oldMember) {
-                members[i] = members[members.length - 1];
-                break;
-            }
+        _memberSlots[_oldMember] = 0;
+        if (slot != lastSlot) {
+            address movedMember = members[lastSlot];
+            members[slot] = movedMember;
+            _memberSlots[movedMember] = slot + 1;
         }
         members.pop();
+        _slotMoves.push(SlotMove(uint128(lastSlot), uint128(slot)));
         _updateRequiredVotes();
         emit MemberRemoval(_oldMember);
     }
 
     function replaceMember(address _oldMember, address _newMember) public onlyMember returns (uint256 transactionId){
+        transactionId = _submitReplaceMember(_oldMember, _newMember);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitReplaceMember(address _oldMember, address _newMember) internal returns (uint256 transactionId) {
         require(_newMember != address(0), "Gov: new member is the zero address");
         require(isMember[_oldMember], "Gov: old member does not exist");
         require(!isMember[_newMember], "Gov: new member already exists");
 
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.replaceMember, false);
+        transactionId = _newTransaction(TransactionType.replaceMember);
         replaceMemberPayloads[transactionId] = ReplaceMemberPayload(_oldMember, _newMember);
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
@@ -192,14 +344,13 @@ contract CifGovernance {
         require(isMember[_replacementAddresses.oldMember], "Gov: old member does not exist");
         require(!isMember[_replacementAddresses.newMember], "Gov: new member already exists");
 
+        uint256 slot = _memberSlots[_replacementAddresses.oldMember] - 1;
         isMember[_replacementAddresses.oldMember] = false;
         isMember[_replacementAddresses.newMember] = true;
-        for (uint256 i = 0; i < members.length; i++) {
-            if (members[i] == _replacementAddresses.oldMember) {
-                members[i] = _replacementAddresses.newMember;
-                break;
-            }
-        }
+        _memberSlots[_replacementAddresses.oldMember] = 0;
+        _memberSlots[_replacementAddresses.newMember] = slot + 1;
+        members[slot] = _replacementAddresses.newMember;
+        _slotMoves.push(SlotMove(uint128(slot), uint128(slot)));
         emit MemberRemoval(_replacementAddresses.oldMember);
         emit MemberAddition(_replacementAddresses.newMember);
     }
@@ -211,48 +362,87 @@ contract CifGovernance {
         string[] memory _winnerNames
     ) public onlyMember returns (uint256 transactionId) {
         require(_winnerAddresses.length == _winnerNames.length, "Gov: not same length for address- and name arrays");
-        uint256 currentTrophyId = _cifTrophy.currentTrophyId();
+        if (_canPassWithoutQuorum(_winnerAddresses)) {
+            // No transaction is created, trophy is passed immediately
+            _cifTrophy.passTrophy(_tournament, _infoHash, _winnerAddresses, _winnerNames);
+            return 0;
+        }
 
-        // Conditions for passing the trophy without quorum:
-        // This prevents winners from passing the trophy to themselves.
-        // 1. The transaction sender must be a governance member (checked in modifier)
-        // 2. The transaction sender must own a token of the current trophy
-        // 3. The transaction sender can't be a winner of the next trophy
-        // 4. All winners of the next trophy must be governance members
-        if (_cifTrophy.hasAddressCurrentTrophy(msg.sender)) {
-            bool conditionsOk = true;
-            for (uint256 i=0; i<_winnerAddresses.length; i++) {
-                if (_winnerAddresses[i] == msg.sender || !isMember[_winnerAddresses[i]]) {
-                    conditionsOk = false;
-                    break;
-                }
-            }
-            if (conditionsOk) {
-                // No transaction is created, trophy is passed immediately
-                _cifTrophy.passTrophy(_tournament, _infoHash, _winnerAddresses, _winnerNames);
-                return 0;
+        // Otherwise start a quorum vote to pass the trophy
+        transactionId = _submitPassTrophy(_tournament, _infoHash, _winnerAddresses, _winnerNames);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    /// @notice Same as passTrophy with the winners packed as described in WinnerEncoding.
+    /// The packed winners are stored and forwarded to the trophy contract as they are.
+    function passTrophy(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes memory _packedWinners
+    ) public onlyMember returns (uint256 transactionId) {
+        (address[] memory winnerAddresses, ) = WinnerEncoding.decode(_packedWinners);
+        if (_canPassWithoutQuorum(winnerAddresses)) {
+            _cifTrophy.passTrophy(_tournament, _infoHash, _packedWinners);
+            return 0;
+        }
+
+        transactionId = _newTransaction(TransactionType.passTrophy);
+        PassTrophyPayload storage payload = passTrophyPayloads[transactionId];
+        payload.currentTrophyId = _cifTrophy.currentTrophyId();
+        payload.tournament = _tournament;
+        payload.infoHash = _infoHash;
+        payload.packedWinners = _packedWinners;
+        emit Submission(transactionId);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    /// @dev Conditions for passing the trophy without quorum:
+    /// This prevents winners from passing the trophy to themselves.
+    /// 1. The transaction sender must be a governance member (checked in modifier)
+    /// 2. The transaction sender must own a token of the current trophy
+    /// 3. The transaction sender can't be a winner of the next trophy
+    /// 4. All winners of the next trophy must be governance members
+    function _canPassWithoutQuorum(address[] memory _winnerAddresses) internal view returns (bool) {
+        if (!_cifTrophy.hasAddressCurrentTrophy(msg.sender)) {
+            return false;
+        }
+        for (uint256 i=0; i<_winnerAddresses.length; i++) {
+            if (_winnerAddresses[i] == msg.sender || !isMember[_winnerAddresses[i]]) {
+                return false;
             }
         }
+        return true;
+    }
 
-        // Otherwise start a quorum vote to pass the trophy
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.passTrophy, false);
+    function _submitPassTrophy(
+        string memory _tournament,
+        bytes32 _infoHash,
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames
+    ) internal returns (uint256 transactionId) {
+        require(_winnerAddresses.length == _winnerNames.length, "Gov: not same length for address- and name arrays");
+        transactionId = _newTransaction(TransactionType.passTrophy);
         passTrophyPayloads[transactionId] = PassTrophyPayload(
-            currentTrophyId,
+            _cifTrophy.currentTrophyId(),
             _tournament,
             _infoHash,
             _winnerAddresses,
-            _winnerNames
+            _winnerNames,
+            ""
         );
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
     function _passTrophy(uint256 _transactionId) internal validTransaction(_transactionId) {
         PassTrophyPayload storage payload = passTrophyPayloads[_transactionId];
         require(payload.currentTrophyId == _cifTrophy.currentTrophyId(), "Gov: trophy has been passed already");
+        if (payload.packedWinners.length > 0) {
+            _cifTrophy.passTrophy(payload.tournament, payload.infoHash, payload.packedWinners);
+            return;
+        }
         _cifTrophy.passTrophy(
             payload.tournament,
             payload.infoHash,
@@ -261,14 +451,180 @@ contract CifGovernance {
         );
     }
 
+    /// @notice Only stores a hash of the arguments and the current trophy id (in uintPayloads).
+    /// The arguments are supplied again on execution, see `confirmPassTrophy` and `executePassTrophy`.
+    function passTrophyCommitted(
+        string memory _tournament,
+        bytes32 _infoHash,
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames
+    ) public onlyMember returns (uint256 transactionId) {
+        require(_winnerAddresses.length == _winnerNames.length, "Gov: not same length for address- and name arrays");
+        transactionId = _newTransaction(TransactionType.passTrophyCommitted);
+        uintPayloads[transactionId] = _cifTrophy.currentTrophyId();
+        bytes32Payloads[transactionId] = _passTrophyArgumentsHash(_tournament, _infoHash, _winnerAddresses, _winnerNames);
+        emit Submission(transactionId);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function confirmPassTrophy(
+        uint256 _transactionId,
+        string memory _tournament,
+        bytes32 _infoHash,
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames
+    ) public returns (bool success) {
+        confirmTransaction(_transactionId);
+        return executePassTrophy(_transactionId, _tournament, _infoHash, _winnerAddresses, _winnerNames);
+    }
+
+    function executePassTrophy(
+        uint256 _transactionId,
+        string memory _tournament,
+        bytes32 _infoHash,
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames
+    ) public onlyMember validTransaction(_transactionId) returns (bool success) {
+        require(_transactions[_transactionId].txnType == TransactionType.passTrophyCommitted, "Gov: not a committed trophy pass");
+        require(!_transactions[_transactionId].executed, "Gov: transaction already executed");
+        require(!_transactions[_transactionId].cancelled, "Gov: transaction cancelled");
+        if (!isConfirmed(_transactionId)) {
+            return false;
+        }
+        require(
+            bytes32Payloads[_transactionId] == _passTrophyArgumentsHash(_tournament, _infoHash, _winnerAddresses, _winnerNames),
+            "Gov: arguments do not match the proposal"
+        );
+        require(uintPayloads[_transactionId] == _cifTrophy.currentTrophyId(), "Gov: trophy has been passed already");
+        _markExecuted(_transactionId);
+        _cifTrophy.passTrophy(_tournament, _infoHash, _winnerAddresses, _winnerNames);
+        _deletePayload(_transactionId, TransactionType.passTrophyCommitted);
+        emit Execution(_transactionId);
+        emit ProposalExecuted(_transactionId, TransactionType.passTrophyCommitted);
+        return true;
+    }
+
+    function _passTrophyArgumentsHash(
+        string memory _tournament,
+        bytes32 _infoHash,
+        address[] memory _winnerAddresses,
+        string[] memory _winnerNames
+    ) internal pure returns (bytes32) {
+        return keccak256(abi.encode(_tournament, _infoHash, _winnerAddresses, _winnerNames));
+    }
+
+    /// @notice Winners mint their own tokens on the trophy contract with a Merkle proof, see `claim`
+    function passTrophyByClaim(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes32 _claimRoot,
+        uint256 _nWinners
+    ) public onlyMember returns (uint256 transactionId) {
+        transactionId = _submitPassTrophyByClaim(_tournament, _infoHash, _claimRoot, _nWinners);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitPassTrophyByClaim(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes32 _claimRoot,
+        uint256 _nWinners
+    ) internal returns (uint256 transactionId) {
+        require(_claimRoot != bytes32(0), "Gov: claim root is empty");
+        transactionId = _newTransaction(TransactionType.passTrophyByClaim);
+        trophyCommitmentPayloads[transactionId] = TrophyCommitmentPayload(
+            _cifTrophy.currentTrophyId(),
+            _tournament,
+            _infoHash,
+            _claimRoot,
+            _nWinners
+        );
+        emit Submission(transactionId);
+        return transactionId;
+    }
+
+    function _passTrophyByClaim(uint256 _transactionId) internal validTransaction(_transactionId) {
+        TrophyCommitmentPayload storage payload = trophyCommitmentPayloads[_transactionId];
+        require(payload.currentTrophyId == _cifTrophy.currentTrophyId(), "Gov: trophy has been passed already");
+        _cifTrophy.passTrophyByClaim(payload.tournament, payload.infoHash, payload.commitment, payload.nWinners);
+    }
+
+    /// @notice Once executed, anyone can append the committed batches and finalize the trophy,
+    /// see `openTrophy` on the trophy contract
+    function openTrophy(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes32 _rosterHash
+    ) public onlyMember returns (uint256 transactionId) {
+        transactionId = _submitOpenTrophy(_tournament, _infoHash, _rosterHash);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitOpenTrophy(
+        string memory _tournament,
+        bytes32 _infoHash,
+        bytes32 _rosterHash
+    ) internal returns (uint256 transactionId) {
+        require(_rosterHash != bytes32(0), "Gov: roster hash is empty");
+        transactionId = _newTransaction(TransactionType.openTrophy);
+        trophyCommitmentPayloads[transactionId] = TrophyCommitmentPayload(
+            _cifTrophy.currentTrophyId(),
+            _tournament,
+            _infoHash,
+            _rosterHash,
+            0
+        );
+        emit Submission(transactionId);
+        return transactionId;
+    }
+
+    function _openTrophy(uint256 _transactionId) internal validTransaction(_transactionId) {
+        TrophyCommitmentPayload storage payload = trophyCommitmentPayloads[_transactionId];
+        require(payload.currentTrophyId == _cifTrophy.currentTrophyId(), "Gov: trophy has been passed already");
+        _cifTrophy.openTrophy(payload.tournament, payload.infoHash, payload.commitment);
+    }
+
+    /// @notice Aborts the batch pass that is open on the trophy contract, see `cancelOpenTrophy` there.
+    /// The `openTrophyCount` of the open pass is stored in uintPayloads, the proposal can only cancel that pass.
+    /// Its trophy id is not enough, the next batch pass gets the same id after a cancellation.
+    function cancelOpenTrophy() public onlyMember returns (uint256 transactionId) {
+        transactionId = _submitCancelOpenTrophy();
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitCancelOpenTrophy() internal returns (uint256 transactionId) {
+        require(_cifTrophy.openTrophyId() != 0, "Gov: no trophy pass in progress");
+        transactionId = _newTransaction(TransactionType.cancelOpenTrophy);
+        uintPayloads[transactionId] = _cifTrophy.openTrophyCount();
+        emit Submission(transactionId);
+        return transactionId;
+    }
+
+    function _cancelOpenTrophy(uint256 _transactionId) internal validTransaction(_transactionId) {
+        require(_isOpenTrophy(uintPayloads[_transactionId]), "Gov: trophy pass is not open anymore");
+        _cifTrophy.cancelOpenTrophy();
+    }
+
+    /// @dev Whether the batch pass opened as number `_openTrophyCount` is still open
+    function _isOpenTrophy(uint256 _openTrophyCount) internal view returns (bool) {
+        return _cifTrophy.openTrophyId() != 0 && _cifTrophy.openTrophyCount() == _openTrophyCount;
+    }
+
     function transferOwnership(address _newOwner) public onlyMember returns (uint256 transactionId){
+        transactionId = _submitTransferOwnership(_newOwner);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitTransferOwnership(address _newOwner) internal returns (uint256 transactionId) {
         require(_newOwner != address(0), "Gov: new owner is the zero address");
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.transferOwnership, false);
+        transactionId = _newTransaction(TransactionType.transferOwnership);
         addressPayloads[transactionId] = _newOwner;
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
@@ -277,13 +633,16 @@ contract CifGovernance {
     }
 
     function changeQuorum(uint256 _newQuorum) public onlyMember returns (uint256 transactionId){
+        transactionId = _submitChangeQuorum(_newQuorum);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitChangeQuorum(uint256 _newQuorum) internal returns (uint256 transactionId) {
         require(_newQuorum <= 100, "Gov: new quorum must be between 0 and 100");
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.changeQuorum, false);
+        transactionId = _newTransaction(TransactionType.changeQuorum);
         uintPayloads[transactionId] = _newQuorum;
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
@@ -296,12 +655,15 @@ contract CifGovernance {
     }
 
     function setBaseURI(string memory _baseURI) public onlyMember returns (uint256 transactionId){
-        transactionCount.increment();
-        transactionId = transactionCount.current();
-        transactions[transactionId] = Transaction(TransactionType.setBaseURI, false);
+        transactionId = _submitSetBaseURI(_baseURI);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitSetBaseURI(string memory _baseURI) internal returns (uint256 transactionId) {
+        transactionId = _newTransaction(TransactionType.setBaseURI);
         stringPayloads[transactionId] = _baseURI;
         emit Submission(transactionId);
-        confirmTransaction(transactionId);
         return transactionId;
     }
 
@@ -309,26 +671,265 @@ contract CifGovernance {
         _cifTrophy.setBaseURI(stringPayloads[_transactionId]);
     }
 
+    function setTrophyURI(uint256 _trophyId, string memory _trophyURI) public onlyMember returns (uint256 transactionId){
+        transactionId = _submitSetTrophyURI(_trophyId, _trophyURI);
+        confirmTransaction(transactionId);
+        return transactionId;
+    }
+
+    function _submitSetTrophyURI(uint256 _trophyId, string memory _trophyURI) internal returns (uint256 transactionId) {
+        require(_trophyId > 0 && _trophyId <= _cifTrophy.currentTrophyId(), "Gov: trophy does not exist");
+        transactionId = _newTransaction(TransactionType.setTrophyURI);
+        trophyURIPayloads[transactionId] = TrophyURIPayload(_trophyId, _trophyURI);
+        emit Submission(transactionId);
+        return transactionId;
+    }
+
+    function _setTrophyURI(uint256 _transactionId) internal validTransaction(_transactionId) {
+        TrophyURIPayload storage payload = trophyURIPayloads[_transactionId];
+        _cifTrophy.setTrophyURI(payload.trophyId, payload.uri);
+    }
+
+    /// @notice Submits and executes a proposal in one transaction, anyone can relay it.
+    /// `_payload` is the ABI encoding of the arguments of the proposal function for `_txnType`.
+    /// The signatures must reach the quorum and at least one member has to sign. The nonce must be
+    /// `proposalNonce`, so every relayed proposal invalidates the signatures collected for the same nonce.
+    function submitTransactionWithSignatures(
+        TransactionType _txnType,
+        bytes memory _payload,
+        uint256 _nonce,
+        uint256 _deadline,
+        bytes[] memory _signatures
+    ) public returns (uint256 transactionId) {
+        require(block.timestamp <= _deadline, "Gov: signatures expired");
+        require(_nonce == proposalNonce, "Gov: invalid nonce");
+        require(_signatures.length > 0, "Gov: not enough signatures");
+        proposalNonce += 1;
+        bytes32 digest = proposalDigest(_txnType, _payload, _nonce, _deadline);
+        transactionId = _submitEncoded(_txnType, _payload);
+
+        uint256 bits = 0;
+        for (uint256 i = 0; i < _signatures.length; i++) {
+            address signer = ECDSA.recover(digest, _signatures[i]);
+            require(isMember[signer], "Gov: signer is not a member");
+            uint256 memberBit = _memberBit(signer);
+            require(bits & memberBit == 0, "Gov: duplicate signature");
+            bits |= memberBit;
+            emit Confirmation(signer, transactionId);
+        }
+        _transactions[transactionId].confirmationBits = bits;
+        require(_executeTransaction(transactionId), "Gov: not enough signatures");
+        return transactionId;
+    }
+
+    /// @notice EIP-712 digest of a TrophyProposal for trophy passes and of a Proposal for all other types
+    function proposalDigest(
+        TransactionType _txnType,
+        bytes memory _payload,
+        uint256 _nonce,
+        uint256 _deadline
+    ) public view returns (bytes32) {
+        bytes32 structHash;
+        if (_txnType == TransactionType.passTrophy || _txnType == TransactionType.passTrophyByClaim
+            || _txnType == TransactionType.openTrophy) {
+            structHash = keccak256(abi.encode(
+                TROPHY_PROPOSAL_TYPEHASH,
+                uint8(_txnType),
+                keccak256(_payload),
+                _nonce,
+                _deadline,
+                _cifTrophy.currentTrophyId()
+            ));
+        } else {
+            structHash = keccak256(abi.encode(PROPOSAL_TYPEHASH, uint8(_txnType), keccak256(_payload), _nonce, _deadline));
+        }
+        return keccak256(abi.encodePacked("\x19\x01", DOMAIN_SEPARATOR, structHash));
+    }
+
+    function _submitEncoded(TransactionType _txnType, bytes memory _payload) internal returns (uint256 transactionId) {
+        if (_txnType == TransactionType.addMember) {
+            return _submitAddMember(abi.decode(_payload, (address)));
+        } else if (_txnType == TransactionType.removeMember) {
+            return _submitRemoveMember(abi.decode(_payload, (address)));
+        } else if (_txnType == TransactionType.replaceMember) {
+            (address oldMember, address newMember) = abi.decode(_payload, (address, address));
+            return _submitReplaceMember(oldMember, newMember);
+        } else if (_txnType == TransactionType.passTrophy) {
+            (string memory tournament, bytes32 infoHash, address[] memory winnerAddresses, string[] memory winnerNames) =
+                abi.decode(_payload, (string, bytes32, address[], string[]));
+            return _submitPassTrophy(tournament, infoHash, winnerAddresses, winnerNames);
+        } else if (_txnType == TransactionType.transferOwnership) {
+            return _submitTransferOwnership(abi.decode(_payload, (address)));
+        } else if (_txnType == TransactionType.changeQuorum) {
+            return _submitChangeQuorum(abi.decode(_payload, (uint256)));
+        } else if (_txnType == TransactionType.setBaseURI) {
+            return _submitSetBaseURI(abi.decode(_payload, (string)));
+        } else if (_txnType == TransactionType.passTrophyByClaim) {
+            (string memory tournament, bytes32 infoHash, bytes32 claimRoot, uint256 nWinners) =
+                abi.decode(_payload, (string, bytes32, bytes32, uint256));
+            return _submitPassTrophyByClaim(tournament, infoHash, claimRoot, nWinners);
+        } else if (_txnType == TransactionType.openTrophy) {
+            (string memory tournament, bytes32 infoHash, bytes32 rosterHash) = abi.decode(_payload, (string, bytes32, bytes32));
+            return _submitOpenTrophy(tournament, infoHash, rosterHash);
+        } else if (_txnType == TransactionType.setTrophyURI) {
+            (uint256 trophyId, string memory uri) = abi.decode(_payload, (uint256, string));
+            return _submitSetTrophyURI(trophyId, uri);
+        } else if (_txnType == TransactionType.cancelOpenTrophy) {
+            return _submitCancelOpenTrophy();
+        }
+        revert("Gov: transaction type can't be signed");
+    }
+
     function confirmTransaction(uint256 _transactionId) public onlyMember validTransaction(_transactionId) {
-        require(!transactions[_transactionId].executed, "Gov: transaction already executed");
-        require(!confirmations[_transactionId][msg.sender], "Gov: transaction already confirmed");
-        confirmations[_transactionId][msg.sender] = true;
+        require(!_transactions[_transactionId].executed, "Gov: transaction already executed");
+        require(!_transactions[_transactionId].cancelled, "Gov: transaction cancelled");
+        require(_confirmTransaction(_transactionId), "Gov: transaction already confirmed");
+        _executeTransaction(_transactionId);
+    }
+
+    /// @notice Skips invalid, executed and already confirmed transactions instead of reverting. A payload that fails
+    /// to execute emits `ExecutionFailure` and stays pending with the new confirmation, the rest of the batch goes on.
+    /// Bit i of `confirmed` is set if `_transactionIds[i]` was confirmed by this call.
+    function confirmTransactions(uint256[] memory _transactionIds) public onlyMember returns (uint256 confirmed) {
+        require(_transactionIds.length <= 256, "Gov: too many transactions");
+        for (uint256 i = 0; i < _transactionIds.length; i++) {
+            // The sender can lose the membership through one of the executed transactions
+            if (!isMember[msg.sender]) {
+                break;
+            }
+            uint256 transactionId = _transactionIds[i];
+            if (_isPending(transactionId) && _confirmTransaction(transactionId)) {
+                confirmed |= uint256(1) << i;
+                _tryExecuteTransaction(transactionId);
+            }
+        }
+        return confirmed;
+    }
+
+    /// @dev Returns false if the sender has already confirmed the transaction
+    function _confirmTransaction(uint256 _transactionId) internal returns (bool) {
+        uint256 memberBit = _memberBit(msg.sender);
+        Transaction storage txn = _syncConfirmations(_transactionId);
+        if (txn.confirmationBits & memberBit != 0) {
+            return false;
+        }
+        txn.confirmationBits |= memberBit;
         emit Confirmation(msg.sender, _transactionId);
-        executeTransaction(_transactionId);
+        return true;
     }
 
     function revokeConfirmation(uint256 _transactionId) public onlyMember validTransaction(_transactionId) {
-        require(!transactions[_transactionId].executed, "Gov: transaction already executed");
-        require(confirmations[_transactionId][msg.sender], "Gov: transaction not confirmed");
-        confirmations[_transactionId][msg.sender] = false;
+        require(!_transactions[_transactionId].executed, "Gov: transaction already executed");
+        require(!_transactions[_transactionId].cancelled, "Gov: transaction cancelled");
+        uint256 memberBit = _memberBit(msg.sender);
+        Transaction storage txn = _syncConfirmations(_transactionId);
+        require(txn.confirmationBits & memberBit != 0, "Gov: transaction not confirmed");
+        txn.confirmationBits &= ~memberBit;
         emit Revocation(msg.sender, _transactionId);
     }
 
     function executeTransaction(uint256 _transactionId) public onlyMember validTransaction(_transactionId) returns (bool success){
-        require(!transactions[_transactionId].executed, "Gov: transaction already executed");
-        if (isConfirmed(_transactionId)) {
-            Transaction storage txn = transactions[_transactionId];
-            txn.executed = true;
+        require(!_transactions[_transactionId].executed, "Gov: transaction already executed");
+        require(!_transactions[_transactionId].cancelled, "Gov: transaction cancelled");
+        return _executeTransaction(_transactionId);
+    }
+
+    /// @notice Skips invalid and executed transactions instead of reverting. A payload that fails to execute
+    /// emits `ExecutionFailure` and stays pending, the rest of the batch goes on.
+    /// Bit i of `executed` is set if `_transactionIds[i]` was executed by this call.
+    function executeTransactions(uint256[] memory _transactionIds) public onlyMember returns (uint256 executed) {
+        require(_transactionIds.length <= 256, "Gov: too many transactions");
+        for (uint256 i = 0; i < _transactionIds.length; i++) {
+            if (_isPending(_transactionIds[i]) && _tryExecuteTransaction(_transactionIds[i])) {
+                executed |= uint256(1) << i;
+            }
+        }
+        return executed;
+    }
+
+    /// @notice Only callable by the contract itself, the batch functions call it to roll back a failing payload
+    /// without reverting the whole batch
+    function executeBatched(uint256 _transactionId) external returns (bool success) {
+        require(msg.sender == address(this), "Gov: caller is not the governance");
+        return _executeTransaction(_transactionId);
+    }
+
+    /// @dev Only pays for the external call when the transaction can execute
+    function _tryExecuteTransaction(uint256 _transactionId) internal returns (bool success) {
+        if (!isConfirmed(_transactionId) || _transactions[_transactionId].txnType == TransactionType.passTrophyCommitted) {
+            return false;
+        }
+        try this.executeBatched(_transactionId) returns (bool executed) {
+            return executed;
+        } catch {
+            emit ExecutionFailure(_transactionId);
+            return false;
+        }
+    }
+
+    /// @notice Cancels trophy passes that were proposed for a trophy that has been passed on since and
+    /// cancellations of batch passes that are not open anymore, they can never execute.
+    /// Skips all other transactions instead of reverting.
+    /// Bit i of `cancelled` is set if `_transactionIds[i]` was cancelled by this call.
+    function cancelStale(uint256[] memory _transactionIds) public onlyMember returns (uint256 cancelled) {
+        require(_transactionIds.length <= 256, "Gov: too many transactions");
+        uint256 currentTrophyId = _cifTrophy.currentTrophyId();
+        for (uint256 i = 0; i < _transactionIds.length; i++) {
+            uint256 transactionId = _transactionIds[i];
+            if (_isPending(transactionId) && _isStale(transactionId, currentTrophyId)) {
+                Transaction storage txn = _transactions[transactionId];
+                txn.cancelled = true;
+                _removePending(transactionId);
+                _deletePayload(transactionId, txn.txnType);
+                emit Cancellation(transactionId);
+                cancelled |= uint256(1) << i;
+            }
+        }
+        return cancelled;
+    }
+
+    function _isStale(uint256 _transactionId, uint256 _currentTrophyId) internal view returns (bool) {
+        TransactionType txnType = _transactions[_transactionId].txnType;
+        if (txnType == TransactionType.passTrophy) {
+            return passTrophyPayloads[_transactionId].currentTrophyId != _currentTrophyId;
+        } else if (txnType == TransactionType.passTrophyByClaim || txnType == TransactionType.openTrophy) {
+            return trophyCommitmentPayloads[_transactionId].currentTrophyId != _currentTrophyId;
+        } else if (txnType == TransactionType.passTrophyCommitted) {
+            return uintPayloads[_transactionId] != _currentTrophyId;
+        } else if (txnType == TransactionType.cancelOpenTrophy) {
+            return !_isOpenTrophy(uintPayloads[_transactionId]);
+        }
+        return false;
+    }
+
+    /// @dev Clearing the payload in the executing transaction earns the storage refund
+    function _deletePayload(uint256 _transactionId, TransactionType _txnType) internal {
+        if (_txnType == TransactionType.addMember || _txnType == TransactionType.removeMember
+            || _txnType == TransactionType.transferOwnership) {
+            delete addressPayloads[_transactionId];
+        } else if (_txnType == TransactionType.replaceMember) {
+            delete replaceMemberPayloads[_transactionId];
+        } else if (_txnType == TransactionType.passTrophy) {
+            delete passTrophyPayloads[_transactionId];
+        } else if (_txnType == TransactionType.changeQuorum || _txnType == TransactionType.cancelOpenTrophy) {
+            delete uintPayloads[_transactionId];
+        } else if (_txnType == TransactionType.setBaseURI) {
+            delete stringPayloads[_transactionId];
+        } else if (_txnType == TransactionType.passTrophyByClaim || _txnType == TransactionType.openTrophy) {
+            delete trophyCommitmentPayloads[_transactionId];
+        } else if (_txnType == TransactionType.passTrophyCommitted) {
+            delete uintPayloads[_transactionId];
+            delete bytes32Payloads[_transactionId];
+        } else if (_txnType == TransactionType.setTrophyURI) {
+            delete trophyURIPayloads[_transactionId];
+        }
+    }
+
+    function _executeTransaction(uint256 _transactionId) internal returns (bool success) {
+        // Committed trophy passes need their arguments, see executePassTrophy
+        if (isConfirmed(_transactionId) && _transactions[_transactionId].txnType != TransactionType.passTrophyCommitted) {
+            _markExecuted(_transactionId);
+            Transaction storage txn = _transactions[_transactionId];
             if (txn.txnType == TransactionType.addMember) {
                 _addMember(_transactionId);
             } else if (txn.txnType == TransactionType.removeMember) {
@@ -343,76 +944,323 @@ contract CifGovernance {
                 _changeQuorum(_transactionId);
             } else if (txn.txnType == TransactionType.setBaseURI) {
                 _setBaseURI(_transactionId);
+            } else if (txn.txnType == TransactionType.passTrophyByClaim) {
+                _passTrophyByClaim(_transactionId);
+            } else if (txn.txnType == TransactionType.openTrophy) {
+                _openTrophy(_transactionId);
+            } else if (txn.txnType == TransactionType.setTrophyURI) {
+                _setTrophyURI(_transactionId);
+            } else if (txn.txnType == TransactionType.cancelOpenTrophy) {
+                _cancelOpenTrophy(_transactionId);
             } else {
                 emit ExecutionFailure(_transactionId);
                 return false;
             }
+            _deletePayload(_transactionId, txn.txnType);
             emit Execution(_transactionId);
+            emit ProposalExecuted(_transactionId, txn.txnType);
             return true;
         }
         return false;
     }
 
+    function _isPending(uint256 _transactionId) internal view returns (bool) {
+        Transaction storage txn = _transactions[_transactionId];
+        return txn.txnType != TransactionType.invalid && !txn.executed && !txn.cancelled;
+    }
+
     function isConfirmed(uint256 _transactionId) public view validTransaction(_transactionId) returns (bool) {
-        uint256 count = 0;
-        for (uint256 i = 0; i < members.length; i++) {
-            if (confirmations[_transactionId][members[i]]) {
-                count += 1;
-            }
-            if (count == requiredVotes) {
-                return true;
-            }
+        return getConfirmationCount(_transactionId) >= requiredVotes;
+    }
+
+    /// @dev Only valid for members
+    function _memberBit(address _member) internal view returns (uint256) {
+        return uint256(1) << (_memberSlots[_member] - 1);
+    }
+
+    /// @dev Writes back the confirmations of a transaction if the member set changed since they were stored
+    function _syncConfirmations(uint256 _transactionId) internal returns (Transaction storage txn) {
+        txn = _transactions[_transactionId];
+        if (txn.membershipVersion != _slotMoves.length) {
+            txn.confirmationBits = _confirmationBits(_transactionId);
+            txn.membershipVersion = uint64(_slotMoves.length);
         }
-        return false;
+    }
+
+    /// @dev Replays the slot moves the stored bitmap has not seen yet
+    function _confirmationBits(uint256 _transactionId) internal view returns (uint256 bits) {
+        Transaction storage txn = _transactions[_transactionId];
+        bits = txn.confirmationBits;
+        for (uint256 i = txn.membershipVersion; i < _slotMoves.length; i++) {
+            SlotMove storage move = _slotMoves[i];
+            uint256 movedBit = move.from == move.to ? uint256(0) : (bits >> move.from) & 1;
+            bits &= ~((uint256(1) << move.from) | (uint256(1) << move.to));
+            bits |= movedBit << move.to;
+        }
+        return bits;
+    }
+
+    function _popcount(uint256 _bits) internal pure returns (uint256 count) {
+        while (_bits != 0) {
+            _bits &= _bits - 1;
+            count += 1;
+        }
+        return count;
     }
 
 
     // Web3 View Functions
 
-    function getConfirmationCount(uint256 _transactionId) public view validTransaction(_transactionId) returns (uint256 count) {
-        for (uint256 i=0; i<members.length; i++) {
-            if (confirmations[_transactionId][members[i]]) {
-                count += 1;
+    /// @notice Predicts `confirmTransaction` by `_voter`, use the zero address to only check the current votes.
+    /// `canVote` is false if the vote would revert because `_voter` is not a member, has already confirmed or
+    /// the transaction is not pending anymore. `reason` is the revert message the execution would fail with,
+    /// empty if the payload would execute. Committed trophy passes are never executed by `confirmTransaction`,
+    /// their reason points to `confirmPassTrophy` and `executePassTrophy`.
+    function previewExecution(uint256 _transactionId, address _voter) external view validTransaction(_transactionId) returns (
+        bool reachesQuorum,
+        uint256 votes,
+        uint256 required,
+        bool executable,
+        string memory reason,
+        bool canVote
+    ) {
+        votes = getConfirmationCount(_transactionId);
+        required = requiredVotes;
+        canVote = isMember[_voter] && _isPending(_transactionId) && !confirmations(_transactionId, _voter);
+        reachesQuorum = (canVote ? votes + 1 : votes) >= required;
+        reason = _executionFailure(_transactionId);
+        executable = bytes(reason).length == 0;
+    }
+
+    /// @dev Mirrors the checks of the execution functions and the trophy contract, in the same order
+    function _executionFailure(uint256 _transactionId) internal view returns (string memory) {
+        Transaction storage txn = _transactions[_transactionId];
+        if (txn.executed) {
+            return "Gov: transaction already executed";
+        }
+        if (txn.cancelled) {
+            return "Gov: transaction cancelled";
+        }
+        TransactionType txnType = txn.txnType;
+        if (txnType == TransactionType.addMember) {
+            address newMember = addressPayloads[_transactionId];
+            if (isMember[newMember]) {
+                return "Gov: member already exists";
+            }
+            if (members.length >= MAX_MEMBERS) {
+                return "Gov: too many members";
             }
+            return "";
+        } else if (txnType == TransactionType.removeMember) {
+            if (!isMember[addressPayloads[_transactionId]]) {
+                return "Gov: member does not exist";
+            }
+            return "";
+        } else if (txnType == TransactionType.replaceMember) {
+            ReplaceMemberPayload storage payload = replaceMemberPayloads[_transactionId];
+            if (!isMember[payload.oldMember]) {
+                return "Gov: old member does not exist";
+            }
+            if (isMember[payload.newMember]) {
+                return "Gov: new member already exists";
+            }
+            return "";
+        } else if (txnType == TransactionType.changeQuorum) {
+            return "";
         }
-        return count;
+        // All other transactions call the trophy contract, trophy passes first check the trophy id they were proposed for
+        if (_isStale(_transactionId, _cifTrophy.currentTrophyId())) {
+            if (txnType == TransactionType.cancelOpenTrophy) {
+                return "Gov: trophy pass is not open anymore";
+            }
+            return "Gov: trophy has been passed already";
+        }
+        if (txnType == TransactionType.passTrophyCommitted) {
+            return "Gov: committed trophy pass, execute with confirmPassTrophy or executePassTrophy";
+        }
+        if (_cifTrophy.owner() != address(this)) {
+            return "Ownable: caller is not the owner";
+        }
+        if ((txnType == TransactionType.passTrophy || txnType == TransactionType.passTrophyByClaim
+            || txnType == TransactionType.openTrophy) && _hasOpenTrophy()) {
+            return "Cif: trophy pass in progress";
+        }
+        return "";
+    }
+
+    /// @dev False for trophy contracts without batch passes
+    function _hasOpenTrophy() internal view returns (bool) {
+        try _cifTrophy.openTrophyId() returns (uint256 openTrophyId) {
+            return openTrophyId != 0;
+        } catch {
+            return false;
+        }
+    }
+
+    function getConfirmationCount(uint256 _transactionId) public view validTransaction(_transactionId) returns (uint256 count) {
+        return _popcount(_confirmationBits(_transactionId));
+    }
+
+    function confirmations(uint256 _transactionId, address _member) public view returns (bool) {
+        uint256 slot = _memberSlots[_member];
+        return slot > 0 && (_confirmationBits(_transactionId) >> (slot - 1)) & 1 == 1;
+    }
+
+    function transactions(uint256 _transactionId) external view returns (TransactionType txnType, bool executed) {
+        Transaction storage txn = _transactions[_transactionId];
+        return (txn.txnType, txn.executed);
+    }
+
+    /// @notice Whether the transaction was cancelled with `cancelStale`
+    function isCancelled(uint256 _transactionId) external view returns (bool) {
+        return _transactions[_transactionId].cancelled;
     }
 
     function getMembers() external view returns (address[] memory _members) {
         return members;
     }
 
-    function getConfirmations(uint256 _transactionId) external view returns (address[] memory _confirmations) {
-        address[] memory confirmationsTemp = new address[](members.length);
+    function getConfirmations(uint256 _transactionId) public view returns (address[] memory _confirmations) {
+        uint256 bits = _confirmationBits(_transactionId);
+        _confirmations = new address[](_popcount(bits));
         uint256 count = 0;
-        uint256 i;
-        for (i=0; i<members.length; i++) {
-            if (confirmations[_transactionId][members[i]]) {
-                confirmationsTemp[count] = members[i];
+        for (uint256 i = 0; bits != 0; i++) {
+            if (bits & 1 == 1) {
+                _confirmations[count] = members[i];
                 count += 1;
             }
+            bits >>= 1;
         }
-        _confirmations = new address[](count);
-        for (i=0; i<count; i++) {
-            _confirmations[i] = confirmationsTemp[i];
+    }
+
+    /// @notice All pending or executed transactions in ascending order. Reads the indexes, executed ids are
+    /// sorted in memory, which is cheap because transactions mostly execute in the order they were submitted.
+    function getTransactionIds(bool isExecuted) external view returns (uint256[] memory _transactionIds) {
+        if (!isExecuted) {
+            return _getPendingPage(0, _pendingCount);
+        }
+        _transactionIds = _getPage(_executedTransactionIds, 0, _executedTransactionIds.length);
+        for (uint256 i = 1; i < _transactionIds.length; i++) {
+            uint256 transactionId = _transactionIds[i];
+            uint256 j = i;
+            for (; j > 0 && _transactionIds[j - 1] > transactionId; j--) {
+                _transactionIds[j] = _transactionIds[j - 1];
+            }
+            _transactionIds[j] = transactionId;
         }
+        return _transactionIds;
     }
 
-    function getTransactionIds(bool isExecuted) external view returns (uint256[] memory _transactionIds)
-    {
-        uint256[] memory transactionIdsTemp = new uint[](transactionCount.current());
-        uint256 count = 0;
-        uint256 i;
-        for (i=1; i<=transactionCount.current(); i++) {
-            if (transactions[i].executed == isExecuted) {
-                transactionIdsTemp[count] = i;
-                count += 1;
+    /// @notice Pending transactions are listed in ascending id order, executed transactions in order of execution.
+    /// Offsets are positions in the current list: a transaction that is executed or cancelled between two calls
+    /// moves every later pending id one position down. Order is kept, overlapping pages and dropping the ids up to the
+    /// last one already seen skips nothing.
+    function getTransactionIds(bool isExecuted, uint256 offset, uint256 limit) public view returns (uint256[] memory _transactionIds) {
+        if (isExecuted) {
+            return _getPage(_executedTransactionIds, offset, limit);
+        }
+        return _getPendingPage(offset, limit);
+    }
+
+    function getPendingTransactionIds(uint256 offset, uint256 limit) external view returns (uint256[] memory _transactionIds) {
+        return _getPendingPage(offset, limit);
+    }
+
+    function getTransactionIdCount(bool isExecuted) external view returns (uint256 count) {
+        return isExecuted ? _executedTransactionIds.length : _pendingCount;
+    }
+
+    /// @notice Members, quorum and a page of pending proposals with their confirmations and payloads in one call.
+    /// The page is the same as `getTransactionIds(false, _offset, _limit)`.
+    function getGovernanceSnapshot(uint256 _offset, uint256 _limit) external view returns (GovernanceSnapshot memory snapshot) {
+        uint256[] memory transactionIds = _getPendingPage(_offset, _limit);
+        snapshot.members = members;
+        snapshot.quorum = quorum;
+        snapshot.requiredVotes = requiredVotes;
+        snapshot.transactionCount = transactionCount.current();
+        snapshot.pendingCount = _pendingCount;
+        snapshot.proposals = new ProposalSnapshot[](transactionIds.length);
+        for (uint256 i = 0; i < transactionIds.length; i++) {
+            uint256 transactionId = transactionIds[i];
+            TransactionType txnType = _transactions[transactionId].txnType;
+            snapshot.proposals[i] = ProposalSnapshot(
+                transactionId,
+                txnType,
+                getConfirmations(transactionId),
+                _encodePayload(transactionId, txnType)
+            );
+        }
+        return snapshot;
+    }
+
+    /// @dev Inverse of `_submitEncoded`. Packed winners are decoded into the arrays, committed trophy passes
+    /// encode the stored trophy id and arguments hash because they can't be signed.
+    function _encodePayload(uint256 _transactionId, TransactionType _txnType) internal view returns (bytes memory) {
+        if (_txnType == TransactionType.addMember || _txnType == TransactionType.removeMember
+            || _txnType == TransactionType.transferOwnership) {
+            return abi.encode(addressPayloads[_transactionId]);
+        } else if (_txnType == TransactionType.replaceMember) {
+            ReplaceMemberPayload memory members_ = replaceMemberPayloads[_transactionId];
+            return abi.encode(members_.oldMember, members_.newMember);
+        } else if (_txnType == TransactionType.passTrophy) {
+            PassTrophyPayload memory trophy = passTrophyPayloads[_transactionId];
+            if (trophy.packedWinners.length > 0) {
+                (trophy.winnerAddresses, trophy.winnerNames) = WinnerEncoding.decode(trophy.packedWinners);
             }
+            return abi.encode(trophy.tournament, trophy.infoHash, trophy.winnerAddresses, trophy.winnerNames);
+        } else if (_txnType == TransactionType.changeQuorum) {
+            return abi.encode(uintPayloads[_transactionId]);
+        } else if (_txnType == TransactionType.setBaseURI) {
+            string memory baseURI = stringPayloads[_transactionId];
+            return abi.encode(baseURI);
+        } else if (_txnType == TransactionType.passTrophyByClaim) {
+            TrophyCommitmentPayload memory claim = trophyCommitmentPayloads[_transactionId];
+            return abi.encode(claim.tournament, claim.infoHash, claim.commitment, claim.nWinners);
+        } else if (_txnType == TransactionType.openTrophy) {
+            TrophyCommitmentPayload memory roster = trophyCommitmentPayloads[_transactionId];
+            return abi.encode(roster.tournament, roster.infoHash, roster.commitment);
+        } else if (_txnType == TransactionType.passTrophyCommitted) {
+            return abi.encode(uintPayloads[_transactionId], bytes32Payloads[_transactionId]);
+        } else if (_txnType == TransactionType.setTrophyURI) {
+            TrophyURIPayload memory uri = trophyURIPayloads[_transactionId];
+            return abi.encode(uri.trophyId, uri.uri);
         }
-        _transactionIds = new uint256[](count);
-        for (i=0; i<count; i++) {
-            _transactionIds[i] = transactionIdsTemp[i];
+        return "";
+    }
+
+    function _getPage(uint256[] storage _ids, uint256 _offset, uint256 _limit) internal view returns (uint256[] memory page) {
+        if (_offset >= _ids.length) {
+            return new uint256[](0);
         }
-        return _transactionIds;
+        uint256 count = _ids.length - _offset;
+        if (count > _limit) {
+            count = _limit;
+        }
+        page = new uint256[](count);
+        for (uint256 i = 0; i < count; i++) {
+            page[i] = _ids[_offset + i];
+        }
+        return page;
+    }
+
+    /// @dev Walks the pending list, costs `_offset + _limit` reads however long the history is
+    function _getPendingPage(uint256 _offset, uint256 _limit) internal view returns (uint256[] memory page) {
+        if (_offset >= _pendingCount) {
+            return new uint256[](0);
+        }
+        uint256 count = _pendingCount - _offset;
+        if (count > _limit) {
+            count = _limit;
+        }
+        uint256 transactionId = _nextPending[0];
+        for (uint256 i = 0; i < _offset; i++) {
+            transactionId = _nextPending[transactionId];
+        }
+        page = new uint256[](count);
+        for (uint256 i = 0; i < count; i++) {
+            page[i] = transactionId;
+            transactionId = _nextPending[transactionId];
+        }
+        return page;
     }
 }
@@ -0,0 +1,267 @@
+//SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/introspection/ERC165.sol";
+import "@openzeppelin/contracts/token/ERC721/IERC721.sol";
+import "@openzeppelin/contracts/token/ERC721/IERC721Metadata.sol";
+import "@openzeppelin/contracts/token/ERC721/IERC721Enumerable.sol";
+import "@openzeppelin/contracts/token/ERC721/IERC721Receiver.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+import "@openzeppelin/contracts/utils/Strings.sol";
+
+
+/// @title ERC721 with sequential token ids and consecutive minting
+/// @author Matthias Nadler, University of Basel
+/// @notice Implements ERC721, Metadata and Enumerable interfaces. Tokens are minted with ids 1, 2, 3, ...
+/// and can't be burned, so the global enumeration follows from the number of minted tokens.
+/// Consecutive tokens minted to the same address share one ownership slot and one EIP-2309 event.
+/// @dev tokenOfOwnerByIndex scans all tokens and is only meant for calls
+abstract contract LeanERC721 is ERC165, IERC721, IERC721Metadata, IERC721Enumerable {
+    using Address for address;
+    using Strings for uint256;
+
+    bytes4 private constant _ERC721_RECEIVED = 0x150b7a02;
+    bytes4 private constant _INTERFACE_ID_ERC721 = 0x80ac58cd;
+    bytes4 private constant _INTERFACE_ID_ERC721_METADATA = 0x5b5e139f;
+    bytes4 private constant _INTERFACE_ID_ERC721_ENUMERABLE = 0x780e9d63;
+
+    event ConsecutiveTransfer(
+        uint256 indexed fromTokenId,
+        uint256 toTokenId,
+        address indexed fromAddress,
+        address indexed toAddress
+    );
+
+    string private _name;
+    string private _symbol;
+    string private _baseURI;
+    mapping(uint256 => string) private _tokenURIs;
+
+    // Owner in the lower 160 bits, auxiliary data of the token in the upper 96 bits.
+    // Only the first token of a consecutive mint is written, an empty slot belongs to the previous token's owner.
+    mapping(uint256 => uint256) private _packedOwnerships;
+    mapping(address => uint256) private _balances;
+    uint256 private _mintedCount;
+
+    mapping(uint256 => address) private _tokenApprovals;
+    mapping(address => mapping(address => bool)) private _operatorApprovals;
+
+    constructor (string memory name_, string memory symbol_) public {
+        _name = name_;
+        _symbol = symbol_;
+        _registerInterface(_INTERFACE_ID_ERC721);
+        _registerInterface(_INTERFACE_ID_ERC721_METADATA);
+        _registerInterface(_INTERFACE_ID_ERC721_ENUMERABLE);
+    }
+
+    function balanceOf(address owner) public view override returns (uint256) {
+        require(owner != address(0), "ERC721: balance query for the zero address");
+        return _balances[owner];
+    }
+
+    function ownerOf(uint256 tokenId) public view override returns (address) {
+        require(_exists(tokenId), "ERC721: owner query for nonexistent token");
+        return address(uint160(_packedOwnershipOf(tokenId)));
+    }
+
+    function name() public view override returns (string memory) {
+        return _name;
+    }
+
+    function symbol() public view override returns (string memory) {
+        return _symbol;
+    }
+
+    /// @notice Same resolution as the OpenZeppelin ERC721: token URI appended to the base URI if both are set,
+    /// otherwise the base URI followed by the token id
+    function tokenURI(uint256 tokenId) public view virtual override returns (string memory) {
+        require(_exists(tokenId), "ERC721Metadata: URI query for nonexistent token");
+        string memory _tokenURI = _tokenURIs[tokenId];
+        if (bytes(_baseURI).length == 0) {
+            return _tokenURI;
+        }
+        if (bytes(_tokenURI).length > 0) {
+            return string(abi.encodePacked(_baseURI, _tokenURI));
+        }
+        return string(abi.encodePacked(_baseURI, tokenId.toString()));
+    }
+
+    function baseURI() public view returns (string memory) {
+        return _baseURI;
+    }
+
+    function totalSupply() public view override returns (uint256) {
+        return _mintedCount;
+    }
+
+    function tokenByIndex(uint256 index) public view override returns (uint256) {
+        require(index < _mintedCount, "ERC721Enumerable: global index out of bounds");
+        return index + 1;
+    }
+
+    /// @notice Scans the token ids from 1 until the `index`-th token of `owner` is found, which is up to
+    /// `totalSupply()` storage reads. Only meant for `eth_call`, the cost grows with every trophy passed.
+    function tokenOfOwnerByIndex(address owner, uint256 index) public view override returns (uint256) {
+        require(index < balanceOf(owner), "ERC721Enumerable: owner index out of bounds");
+        address tokenOwner;
+        for (uint256 tokenId = 1; tokenId <= _mintedCount; tokenId++) {
+            uint256 packed = _packedOwnerships[tokenId];
+            if (packed != 0) {
+                tokenOwner = address(uint160(packed));
+            }
+            if (tokenOwner == owner) {
+                if (index == 0) {
+                    return tokenId;
+                }
+                index -= 1;
+            }
+        }
+    }
+
+    function approve(address to, uint256 tokenId) public virtual override {
+        address owner = ownerOf(tokenId);
+        require(to != owner, "ERC721: approval to current owner");
+        require(msg.sender == owner || isApprovedForAll(owner, msg.sender),
+            "ERC721: approve caller is not owner nor approved for all"
+        );
+        _approve(to, tokenId);
+    }
+
+    function getApproved(uint256 tokenId) public view override returns (address) {
+        require(_exists(tokenId), "ERC721: approved query for nonexistent token");
+        return _tokenApprovals[tokenId];
+    }
+
+    function setApprovalForAll(address operator, bool approved) public virtual override {
+        require(operator != msg.sender, "ERC721: approve to caller");
+        _operatorApprovals[msg.sender][operator] = approved;
+        emit ApprovalForAll(msg.sender, operator, approved);
+    }
+
+    function isApprovedForAll(address owner, address operator) public view override returns (bool) {
+        return _operatorApprovals[owner][operator];
+    }
+
+    function transferFrom(address from, address to, uint256 tokenId) public virtual override {
+        require(_isApprovedOrOwner(msg.sender, tokenId), "ERC721: transfer caller is not owner nor approved");
+        _transfer(from, to, tokenId);
+    }
+
+    function safeTransferFrom(address from, address to, uint256 tokenId) public virtual override {
+        safeTransferFrom(from, to, tokenId, "");
+    }
+
+    function safeTransferFrom(address from, address to, uint256 tokenId, bytes memory _data) public virtual override {
+        require(_isApprovedOrOwner(msg.sender, tokenId), "ERC721: transfer caller is not owner nor approved");
+        _transfer(from, to, tokenId);
+        require(_checkOnERC721Received(from, to, tokenId, _data), "ERC721: transfer to non ERC721Receiver implementer");
+    }
+
+    function _exists(uint256 tokenId) internal view returns (bool) {
+        return tokenId > 0 && tokenId <= _mintedCount;
+    }
+
+    function _isApprovedOrOwner(address spender, uint256 tokenId) internal view returns (bool) {
+        address owner = ownerOf(tokenId);
+        return (spender == owner || getApproved(tokenId) == spender || isApprovedForAll(owner, spender));
+    }
+
+    /// @dev Mints the next `quantity` token ids to `to` with a single ownership slot.
+    /// `aux` is stored next to the owner and kept on transfers.
+    function _safeMintConsecutive(address to, uint256 quantity, uint96 aux) internal returns (uint256 firstTokenId) {
+        require(to != address(0), "ERC721: mint to the zero address");
+        require(quantity > 0, "ERC721: mint of zero tokens");
+        firstTokenId = _mintedCount + 1;
+        uint256 lastTokenId = firstTokenId + quantity - 1;
+        _mintedCount = lastTokenId;
+        _balances[to] += quantity;
+        _packedOwnerships[firstTokenId] = uint256(uint160(to)) | (uint256(aux) << 160);
+        _beforeTokenTransfer(address(0), to, firstTokenId, quantity);
+
+        if (quantity == 1) {
+            emit Transfer(address(0), to, firstTokenId);
+        } else {
+            emit ConsecutiveTransfer(firstTokenId, lastTokenId, address(0), to);
+        }
+        if (to.isContract()) {
+            for (uint256 tokenId = firstTokenId; tokenId <= lastTokenId; tokenId++) {
+                require(_checkOnERC721Received(address(0), to, tokenId, ""), "ERC721: transfer to non ERC721Receiver implementer");
+            }
+        }
+        return firstTokenId;
+    }
+
+    function _tokenAux(uint256 tokenId) internal view returns (uint96) {
+        return uint96(_packedOwnershipOf(tokenId) >> 160);
+    }
+
+    /// @dev Walks back to the first token of the consecutive mint if the token has never been transferred.
+    /// Zero for tokens that don't exist.
+    function _packedOwnershipOf(uint256 tokenId) internal view returns (uint256 packed) {
+        if (!_exists(tokenId)) {
+            return 0;
+        }
+        packed = _packedOwnerships[tokenId];
+        while (packed == 0) {
+            tokenId -= 1;
+            packed = _packedOwnerships[tokenId];
+        }
+        return packed;
+    }
+
+    function _transfer(address from, address to, uint256 tokenId) internal virtual {
+        uint256 packed = _packedOwnershipOf(tokenId);
+        require(address(uint160(packed)) == from, "ERC721: transfer of token that is not own");
+        require(to != address(0), "ERC721: transfer to the zero address");
+        _beforeTokenTransfer(from, to, tokenId, 1);
+
+        if (_tokenApprovals[tokenId] != address(0)) {
+            _approve(address(0), tokenId);
+        }
+        _balances[from] -= 1;
+        _balances[to] += 1;
+        _packedOwnerships[tokenId] = (packed >> 160 << 160) | uint256(uint160(to));
+        // The next token inherited its owner from this slot, it needs its own now
+        uint256 nextTokenId = tokenId + 1;
+        if (nextTokenId <= _mintedCount && _packedOwnerships[nextTokenId] == 0) {
+            _packedOwnerships[nextTokenId] = packed;
+        }
+        emit Transfer(from, to, tokenId);
+    }
+
+    function _setTokenURI(uint256 tokenId, string memory _tokenURI) internal virtual {
+        require(_exists(tokenId), "ERC721Metadata: URI set of nonexistent token");
+        _tokenURIs[tokenId] = _tokenURI;
+    }
+
+    function _setBaseURI(string memory baseURI_) internal virtual {
+        _baseURI = baseURI_;
+    }
+
+    function _checkOnERC721Received(address from, address to, uint256 tokenId, bytes memory _data)
+        private returns (bool)
+    {
+        if (!to.isContract()) {
+            return true;
+        }
+        try IERC721Receiver(to).onERC721Received(msg.sender, from, tokenId, _data) returns (bytes4 retval) {
+            return retval == _ERC721_RECEIVED;
+        } catch (bytes memory reason) {
+            if (reason.length == 0) {
+                revert("ERC721: transfer to non ERC721Receiver implementer");
+            }
+            assembly {
+                revert(add(32, reason), mload(reason))
+            }
+        }
+    }
+
+    function _approve(address to, uint256 tokenId) private {
+        _tokenApprovals[tokenId] = to;
+        emit Approval(ownerOf(tokenId), to, tokenId);
+    }
+
+    /// @dev Called once for the `batchSize` consecutive tokens starting at `firstTokenId`.
+    /// The auxiliary data of minted tokens is already stored when the hook runs.
+    function _beforeTokenTransfer(address from, address to, uint256 firstTokenId, uint256 batchSize) internal virtual { }
+}
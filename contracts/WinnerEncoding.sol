@@ -0,0 +1,45 @@
+//SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+
+
+/// @title Compact calldata encoding of trophy winners
+/// @author Matthias Nadler, University of Basel
+/// @notice Each winner is a 20 byte address, followed by the length of the name in one byte and the UTF-8 name.
+/// The winners are concatenated without padding, names are at most 255 bytes long.
+library WinnerEncoding {
+    function decode(bytes memory _packed) internal pure returns (address[] memory addresses, string[] memory names) {
+        uint256 length = _packed.length;
+        uint256 count = 0;
+        uint256 offset = 0;
+        while (offset < length) {
+            require(offset + 21 <= length, "WinnerEncoding: malformed winners");
+            offset += 21 + uint8(_packed[offset + 20]);
+            count += 1;
+        }
+        require(offset == length, "WinnerEncoding: malformed winners");
+
+        addresses = new address[](count);
+        names = new string[](count);
+        offset = 0;
+        for (uint256 i = 0; i < count; i++) {
+            uint256 nameLength = uint8(_packed[offset + 20]);
+            bytes memory nameBytes = new bytes(nameLength);
+            address winner;
+            // Copies whole words, then clears what was copied past the end of the name.
+            // `nameBytes` is the last allocation, so nothing else lives behind it.
+            assembly {
+                let src := add(add(_packed, 32), offset)
+                winner := shr(96, mload(src))
+                src := add(src, 21)
+                let dst := add(nameBytes, 32)
+                for { let k := 0 } lt(k, nameLength) { k := add(k, 32) } {
+                    mstore(add(dst, k), mload(add(src, k)))
+                }
+                mstore(add(dst, nameLength), 0)
+            }
+            addresses[i] = winner;
+            names[i] = string(nameBytes);
+            offset += 21 + nameLength;
+        }
+    }
+}
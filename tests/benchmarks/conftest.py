@@ -0,0 +1,52 @@
+import json
+import warnings
+from pathlib import Path
+
+import pytest
+
+from helpers.winners import filler_addresses
+
+BASELINE_PATH = Path(__file__).parent / "gas_baseline.json"
+
+
+class GasRecorder:
+    def __init__(self, baseline, compare, tolerance):
+        self.baseline = baseline
+        self.compare = compare
+        self.tolerance = tolerance
+        self.results = {}
+
+    def record(self, name, gas_used):
+        self.results[name] = gas_used
+        if self.compare:
+            if name not in self.baseline:
+                # New or renamed entry points can only be compared once they are recorded with --gas-update
+                warnings.warn(f"{name} is not in the baseline, record it with --gas-update")
+                return gas_used
+            allowed = self.baseline[name] * (100 + self.tolerance) / 100
+            assert gas_used <= allowed, (
+                f"{name}: {gas_used} gas is more than {self.tolerance}% above the baseline of {self.baseline[name]}"
+            )
+        return gas_used
+
+
+@pytest.fixture(scope="session")
+def gas(request):
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    recorder = GasRecorder(
+        baseline,
+        request.config.getoption("--gas-compare"),
+        request.config.getoption("--gas-tolerance"),
+    )
+    yield recorder
+    if request.config.getoption("--gas-update"):
+        baseline.update(recorder.results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="module")
+def deploy_gov(CifGovernance, cif, gov_deployer, accounts):
+    def deploy(n_members, quorum=50):
+        members = list(accounts[:4]) + filler_addresses(n_members - 4)
+        return gov_deployer.deploy(CifGovernance, cif, quorum, members)
+    yield deploy
@@ -0,0 +1,249 @@
+import pytest
+
+from helpers.winners import calldata_gas, encode_winners, filler_addresses
+
+MEMBER_COUNTS = [4, 10, 50, 100, 200]
+WINNER_COUNTS = [1, 10, 50, 100]
+HISTORY_LENGTHS = [0, 100, 1000, 5000]
+
+
+@pytest.mark.parametrize("n_members", MEMBER_COUNTS)
+def test_confirm_transaction_by_members(deploy_gov, gas, accounts, n_members):
+    # Quorum 100 keeps the proposal open, so every call walks the whole member set
+    gov = deploy_gov(n_members, quorum=100)
+    gov.changeQuorum(50, {'from': accounts[0]})
+    tx = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert "Execution" not in tx.events
+
+    gas.record(f"CifGovernance.confirmTransaction[members={n_members}]", tx.gas_used)
+    gas.record(f"CifGovernance.isConfirmed[members={n_members}]", gov.isConfirmed.estimate_gas(1))
+    gas.record(
+        f"CifGovernance.getConfirmationCount[members={n_members}]", gov.getConfirmationCount.estimate_gas(1)
+    )
+
+
+@pytest.mark.parametrize("n_members", MEMBER_COUNTS)
+def test_remove_member_by_members(deploy_gov, gas, accounts, n_members):
+    # Pick the quorum so that exactly two votes execute the removal
+    gov = deploy_gov(n_members, quorum=200 // n_members)
+    assert gov.requiredVotes() == 2
+    to_remove = gov.members(n_members - 2)
+    gov.removeMember(to_remove, {'from': accounts[0]})
+    tx = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert tx.events["MemberRemoval"]["member"] == to_remove
+
+    gas.record(f"CifGovernance._removeMember[members={n_members}]", tx.gas_used)
+
+
+@pytest.mark.parametrize("n_winners", WINNER_COUNTS)
+def test_pass_trophy_gov_by_winners(gov, cif, deployer, gas, accounts, n_winners):
+    cif.transferOwnership(gov, {'from': deployer})
+    winners = filler_addresses(n_winners)
+    names = [f"Winner {i}" for i in range(n_winners)]
+    tx_submit = gov.passTrophy("Tournament", "0xabcd", winners, names, {'from': accounts[0]})
+    tx_execute = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert tx_execute.events["TrophyPassed"]["trophyId"] == 1
+
+    gas.record(f"CifGovernance.passTrophy[winners={n_winners}]", tx_submit.gas_used)
+    gas.record(f"CifGovernance.confirmTransaction(passTrophy)[winners={n_winners}]", tx_execute.gas_used)
+
+
+@pytest.mark.parametrize("n_winners", WINNER_COUNTS)
+def test_pass_trophy_by_winners(cif, deployer, gas, n_winners):
+    winners = filler_addresses(n_winners)
+    names = [f"Winner {i}" for i in range(n_winners)]
+    tx = cif.passTrophy("Tournament", "0xabcd", winners, names, {'from': deployer})
+    assert cif.currentTrophyId() == 1
+
+    gas.record(f"CifEsportsMultiTrophy.passTrophy[winners={n_winners}]", tx.gas_used)
+
+
+@pytest.mark.parametrize("history", HISTORY_LENGTHS)
+def test_confirm_transaction_by_history(gov, gas, accounts, history):
+    for _ in range(history):
+        gov.changeQuorum(50, {'from': accounts[0]})
+    gov.changeQuorum(50, {'from': accounts[0]})
+    tx = gov.confirmTransaction(history + 1, {'from': accounts[1]})
+    assert tx.events["Execution"]["transactionId"] == history + 1
+
+    gas.record(f"CifGovernance.confirmTransaction[history={history}]", tx.gas_used)
+    gas.record(
+        f"CifGovernance.getTransactionIds[history={history}]", gov.getTransactionIds["bool"].estimate_gas(False)
+    )
+    gas.record(
+        f"CifGovernance.getPendingTransactionIds(limit=50)[history={history}]",
+        gov.getPendingTransactionIds.estimate_gas(0, 50),
+    )
+
+
+@pytest.mark.parametrize("position", [0, 1, 100, 198, 199])
+def test_remove_member_by_position(deploy_gov, gas, accounts, position):
+    gov = deploy_gov(200, quorum=1)
+    to_remove = gov.members(position)
+    gov.removeMember(to_remove, {'from': accounts[2]})
+    tx = gov.confirmTransaction(1, {'from': accounts[3]})
+    assert tx.events["MemberRemoval"]["member"] == to_remove
+    assert len(gov.getMembers()) == 199
+
+    gas.record(f"CifGovernance._removeMember[members=200,position={position}]", tx.gas_used)
+
+
+def test_pass_trophy_committed_delta(gov, cif, deployer, gas, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    n_winners = 20
+    args = ("Tournament", "0xabcd", filler_addresses(n_winners), [f"Winner {i}" for i in range(n_winners)])
+
+    stored = gov.passTrophy(*args, {'from': accounts[0]}).gas_used
+    stored += gov.confirmTransaction(1, {'from': accounts[1]}).gas_used
+
+    args = ("Tournament", "0xabcd", filler_addresses(n_winners, 0x20000), [f"Winner {i}" for i in range(n_winners)])
+    committed = gov.passTrophyCommitted(*args, {'from': accounts[0]}).gas_used
+    committed += gov.confirmPassTrophy(2, *args, {'from': accounts[1]}).gas_used
+    assert committed < stored
+
+    gas.record(f"CifGovernance.passTrophy(stored)[winners={n_winners}]", stored)
+    gas.record(f"CifGovernance.passTrophyCommitted[winners={n_winners}]", committed)
+
+
+@pytest.mark.parametrize("n_proposals", [1, 5, 20])
+def test_confirm_transactions_batch(gov, gas, accounts, n_proposals):
+    for _ in range(2 * n_proposals):
+        gov.changeQuorum(50, {'from': accounts[0]})
+
+    singles = sum(gov.confirmTransaction(i, {'from': accounts[1]}).gas_used for i in range(1, n_proposals + 1))
+    tx = gov.confirmTransactions(list(range(n_proposals + 1, 2 * n_proposals + 1)), {'from': accounts[1]})
+    assert tx.return_value == 2 ** n_proposals - 1
+    assert gov.getTransactionIdCount(False) == 0
+
+    gas.record(f"CifGovernance.confirmTransaction(single)[proposals={n_proposals}]", singles)
+    gas.record(f"CifGovernance.confirmTransactions[proposals={n_proposals}]", tx.gas_used)
+
+
+def test_trophy_history_range(cif, deployer, gas):
+    n_trophies, page_size = 500, 100
+    for i in range(n_trophies):
+        winners = filler_addresses(3, 0x10000 + 3 * i)
+        cif.passTrophy(f"Tournament {i}", "0xabcd", winners, ["A", "B", "C"], {'from': deployer})
+
+    # One eth_call per trophy against one per page
+    per_id = [cif.getInfoByTrophyId.estimate_gas(i) for i in range(1, n_trophies + 1)]
+    pages = [cif.getTrophiesRange.estimate_gas(i, page_size) for i in range(1, n_trophies + 1, page_size)]
+    assert (len(per_id), len(pages)) == (n_trophies, n_trophies // page_size)
+
+    gas.record(f"CifEsportsMultiTrophy.getInfoByTrophyId(loop)[trophies={n_trophies}]", sum(per_id))
+    gas.record(f"CifEsportsMultiTrophy.getTrophiesRange(limit={page_size})[trophies={n_trophies}]", sum(pages))
+
+
+def test_storage_per_winner_and_proposal(gov, cif, deployer, gas, accounts):
+    # Marginal cost of one more winner, names up to 27 bytes share the slot with the trophy id
+    one = cif.passTrophy("Tournament", "0xabcd", filler_addresses(1), ["Winner"], {'from': deployer}).gas_used
+    many = cif.passTrophy(
+        "Tournament", "0xabcd", filler_addresses(51, 0x20000), ["Winner"] * 51, {'from': deployer}
+    ).gas_used
+    long_names = cif.passTrophy(
+        "Tournament", "0xabcd", filler_addresses(51, 0x30000), ["A winner with a rather long name"] * 51,
+        {'from': deployer}
+    ).gas_used
+    gas.record("CifEsportsMultiTrophy.passTrophy(per winner)", (many - one) // 50)
+    gas.record("CifEsportsMultiTrophy.passTrophy(per winner, long name)", (long_names - one) // 50)
+
+    tx = gov.changeQuorum(50, {'from': accounts[0]})
+    gas.record("CifGovernance.changeQuorum(per proposal)", tx.gas_used)
+
+
+@pytest.mark.parametrize("n_winners", [1, 10, 50])
+@pytest.mark.parametrize("variant", ["cif", "lean_cif"])
+def test_pass_trophy_by_variant(request, deployer, gas, variant, n_winners):
+    trophy = request.getfixturevalue(variant)
+    names = [f"Winner {i}" for i in range(n_winners)]
+    tx = trophy.passTrophy("Tournament", "0xabcd", filler_addresses(n_winners), names, {'from': deployer})
+    assert trophy.totalSupply() == n_winners
+
+    gas.record(f"{trophy._name}.passTrophy[winners={n_winners}]", tx.gas_used)
+
+
+@pytest.mark.parametrize("team", ["distinct", "repeated"])
+@pytest.mark.parametrize("variant", ["cif", "lean_cif"])
+def test_pass_trophy_by_team(request, deployer, gas, accounts, variant, team):
+    # Teams are usually distinct players, a repeated address is the best case for consecutive minting
+    trophy = request.getfixturevalue(variant)
+    n_winners = 10
+    winners = filler_addresses(n_winners) if team == "distinct" else [accounts[1]] * n_winners
+    names = [f"Winner {i}" for i in range(n_winners)]
+    tx = trophy.passTrophy("Tournament", "0xabcd", winners, names, {'from': deployer})
+    assert trophy.totalSupply() == n_winners
+
+    gas.record(f"{trophy._name}.passTrophy(team={team})[winners={n_winners}]", tx.gas_used)
+
+
+@pytest.mark.parametrize("n_trophies", [1, 10, 50])
+@pytest.mark.parametrize("variant", ["cif", "lean_cif"])
+def test_token_of_owner_by_supply(request, deployer, gas, variant, n_trophies):
+    trophy = request.getfixturevalue(variant)
+    n_winners = 10
+    names = [f"Winner {i}" for i in range(n_winners)]
+    for i in range(n_trophies):
+        winners = filler_addresses(n_winners, 0x10000 * (i + 1))
+        trophy.passTrophy(f"Tournament {i}", "0xabcd", winners, names, {'from': deployer})
+    # The newest token is the last one the lean variant finds
+    assert trophy.tokenOfOwnerByIndex(winners[-1], 0) == n_trophies * n_winners
+
+    gas.record(
+        f"{trophy._name}.tokenOfOwnerByIndex[supply={n_trophies * n_winners}]",
+        trophy.tokenOfOwnerByIndex.estimate_gas(winners[-1], 0),
+    )
+
+
+@pytest.mark.parametrize("n_winners", [1, 10, 50])
+def test_pass_trophy_cycle_net(gov, cif, deployer, gas, accounts, n_winners):
+    # gas_used is net of the refunds for the payload that is deleted on execution
+    cif.transferOwnership(gov, {'from': deployer})
+    names = [f"Winner {i}" for i in range(n_winners)]
+    tx_submit = gov.passTrophy("Tournament", "0xabcd", filler_addresses(n_winners), names, {'from': accounts[0]})
+    tx_execute = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert gov.passTrophyPayloads(1)[1] == ""
+
+    gas.record(f"CifGovernance.passTrophy(cycle, net)[winners={n_winners}]", tx_submit.gas_used + tx_execute.gas_used)
+
+
+def test_cancel_stale_net(gov, cif, deployer, gas, accounts):
+    cif.passTrophy("Tournament 0", "0xabcd", [accounts[2]], ["Winner"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    n_proposals, n_winners = 10, 10
+    names = [f"Winner {i}" for i in range(n_winners)]
+    for i in range(n_proposals):
+        winners = filler_addresses(n_winners, 0x10000 * (i + 1))
+        gov.passTrophy("Tournament", "0xabcd", winners, names, {'from': accounts[0]})
+    gov.passTrophy("Tournament", "0xabcd", [accounts[3]], ["Winner"], {'from': accounts[2]})
+
+    tx = gov.cancelStale(list(range(1, n_proposals + 1)), {'from': accounts[1]})
+    assert tx.return_value == 2 ** n_proposals - 1
+    assert gov.getTransactionIdCount(False) == 0
+
+    gas.record(f"CifGovernance.cancelStale(net)[proposals={n_proposals},winners={n_winners}]", tx.gas_used)
+
+
+@pytest.mark.parametrize("variant", ["cif", "lean_cif"])
+def test_pass_trophy_packed(request, deployer, gas, variant):
+    trophy = request.getfixturevalue(variant)
+    n_winners = 30
+    winners, names = filler_addresses(n_winners), [f"Winner {i}" for i in range(n_winners)]
+    tx_arrays = trophy.passTrophy("Tournament", "0xabcd", winners, names, {'from': deployer})
+    tx_packed = trophy.passTrophy("Tournament", "0xabcd", encode_winners(winners, names), {'from': deployer})
+
+    gas.record(f"{trophy._name}.passTrophy(arrays, calldata)[winners={n_winners}]", calldata_gas(tx_arrays.input))
+    gas.record(f"{trophy._name}.passTrophy(packed, calldata)[winners={n_winners}]", calldata_gas(tx_packed.input))
+    gas.record(f"{trophy._name}.passTrophy(arrays)[winners={n_winners}]", tx_arrays.gas_used)
+    gas.record(f"{trophy._name}.passTrophy(packed)[winners={n_winners}]", tx_packed.gas_used)
+
+
+def test_pass_trophy_gov_packed(gov, cif, deployer, gas, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    n_winners = 30
+    winners, names = filler_addresses(n_winners), [f"Winner {i}" for i in range(n_winners)]
+    tx_submit = gov.passTrophy("Tournament", "0xabcd", encode_winners(winners, names), {'from': accounts[0]})
+    tx_execute = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert tx_execute.events["TrophyPassed"]["trophyId"] == 1
+
+    gas.record(f"CifGovernance.passTrophy(packed, calldata)[winners={n_winners}]", calldata_gas(tx_submit.input))
+    gas.record(f"CifGovernance.passTrophy(packed, cycle, net)[winners={n_winners}]", tx_submit.gas_used + tx_execute.gas_used)
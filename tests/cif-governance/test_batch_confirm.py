@@ -0,0 +1,104 @@
+import brownie
+
+REMOVE_MEMBER = 2
+
+
+def submit_proposals(gov, accounts):
+    gov.addMember(accounts[5], {'from': accounts[0]})
+    gov.changeQuorum(50, {'from': accounts[0]})
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov.replaceMember(accounts[3], accounts[6], {'from': accounts[0]})
+    gov.transferOwnership(accounts[7], {'from': accounts[0]})
+
+
+def test_confirm_transactions(gov, cif, deployer, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    assert gov.requiredVotes() == 3
+    submit_proposals(gov, accounts)
+    gov.confirmTransaction(3, {'from': accounts[1]})
+
+    # 1 is executed, 3 is already confirmed by accounts[1], 99 does not exist
+    tx = gov.confirmTransactions([1, 2, 3, 99, 4, 5, 6], {'from': accounts[1]})
+    assert tx.return_value == 0b1110010
+    assert [e["transactionId"] for e in tx.events["Confirmation"]] == [2, 4, 5, 6]
+    assert "Execution" not in tx.events
+
+    # The third vote executes all proposals in one transaction, the quorum change goes first
+    # so that the added member does not raise the required votes
+    tx = gov.confirmTransactions([3, 2, 4, 5, 6], {'from': accounts[2]})
+    assert tx.return_value == 0b11111
+    assert [e["transactionId"] for e in tx.events["Execution"]] == [3, 2, 4, 5, 6]
+    assert gov.isMember(accounts[5])
+    assert gov.isMember(accounts[6])
+    assert cif.owner() == accounts[7]
+    assert gov.getTransactionIdCount(False) == 0
+
+
+def test_confirm_transactions_sender_removed(gov, accounts):
+    gov.removeMember(accounts[1], {'from': accounts[0]})
+    gov.changeQuorum(75, {'from': accounts[0]})
+
+    # The removal executes first, the sender can't vote on the rest of the batch
+    tx = gov.confirmTransactions([1, 2], {'from': accounts[1]})
+    assert tx.return_value == 0b01
+    assert not gov.isMember(accounts[1])
+    assert not gov.transactions(2)[1]  # executed
+
+
+def test_execute_transactions(gov, accounts):
+    gov.changeQuorum(100, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    assert gov.requiredVotes() == 4
+    gov.changeQuorum(50, {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    gov.confirmTransaction(2, {'from': accounts[2]})
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.confirmTransaction(3, {'from': accounts[1]})
+
+    # Lowering the quorum leaves a confirmed proposal behind that still needs to be executed
+    gov.confirmTransaction(2, {'from': accounts[3]})
+    assert gov.requiredVotes() == 2
+    assert gov.isConfirmed(3)
+    assert not gov.transactions(3)[1]  # executed
+
+    tx = gov.executeTransactions([1, 3, 4, 42], {'from': accounts[3]})
+    assert tx.return_value == 0b0010
+    assert [e["transactionId"] for e in tx.events["Execution"]] == [3]
+    assert gov.quorum() == 75
+
+
+def test_batch_reverts(gov, accounts):
+    with brownie.reverts("Gov: caller is not a member"):
+        gov.confirmTransactions([1], {'from': accounts[5]})
+    with brownie.reverts("Gov: caller is not a member"):
+        gov.executeTransactions([1], {'from': accounts[5]})
+    with brownie.reverts("Gov: too many transactions"):
+        gov.confirmTransactions(list(range(257)), {'from': accounts[0]})
+    with brownie.reverts("Gov: too many transactions"):
+        gov.executeTransactions(list(range(257)), {'from': accounts[0]})
+
+
+def test_failing_payload_does_not_revert_batch(gov, accounts):
+    gov.removeMember(accounts[3], {'from': accounts[0]})
+    gov.removeMember(accounts[3], {'from': accounts[0]})
+    gov.changeQuorum(60, {'from': accounts[0]})
+
+    # The second removal fails after the first one, the quorum change still executes
+    tx = gov.confirmTransactions([1, 2, 3], {'from': accounts[1]})
+    assert tx.return_value == 0b111
+    assert [e["transactionId"] for e in tx.events["Execution"]] == [1, 3]
+    assert [e["transactionId"] for e in tx.events["ExecutionFailure"]] == [2]
+    assert gov.transactions(2) == (REMOVE_MEMBER, False)
+    assert gov.getConfirmations(2) == [accounts[0], accounts[1]]
+    assert gov.getTransactionIds(False) == [2]
+    assert gov.quorum() == 60
+
+    tx = gov.executeTransactions([2], {'from': accounts[2]})
+    assert tx.return_value == 0
+    assert [e["transactionId"] for e in tx.events["ExecutionFailure"]] == [2]
+    assert "Execution" not in tx.events
+
+    with brownie.reverts("Gov: caller is not the governance"):
+        gov.executeBatched(2, {'from': accounts[0]})
@@ -0,0 +1,84 @@
+import brownie
+import pytest
+
+PASS_TROPHY = 4
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2]], ["Hannes"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def test_payloads_deleted_on_execution(gov_trophy, cif, accounts):
+    gov_trophy.passTrophy("Tournament 1", "0xa1b2", [accounts[0], accounts[8]], ["Daniel", "Markus"], {'from': accounts[0]})
+    gov_trophy.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov_trophy.replaceMember(accounts[3], accounts[6], {'from': accounts[0]})
+    assert gov_trophy.passTrophyPayloads(1)[1] == "Tournament 1"
+
+    gov_trophy.confirmTransactions([1, 2, 3], {'from': accounts[1]})
+    assert cif.currentTrophy()[3] == ("Daniel", "Markus")
+    assert cif.baseURI() == "https://cif.unibas.ch/"
+    assert gov_trophy.passTrophyPayloads(1) == (0, "", "0x" + "00" * 32, "0x")
+    assert gov_trophy.stringPayloads(2) == ""
+    assert gov_trophy.replaceMemberPayloads(3) == (brownie.ZERO_ADDRESS, brownie.ZERO_ADDRESS)
+
+    # Who voted for an executed proposal is still recorded
+    assert gov_trophy.getConfirmations(1) == [accounts[0], accounts[1]]
+    assert gov_trophy.getTransactionIds(True) == [1, 2, 3]
+
+
+def test_cancel_stale(gov_trophy, cif, accounts):
+    gov_trophy.passTrophy("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel"], {'from': accounts[0]})
+    gov_trophy.passTrophyByClaim("Tournament 1", "0xa1b2", "0x1234", 2, {'from': accounts[0]})
+    gov_trophy.changeQuorum(75, {'from': accounts[0]})
+
+    # Nothing is stale while the trophy has not been passed on
+    tx = gov_trophy.cancelStale([1, 2, 3], {'from': accounts[1]})
+    assert tx.return_value == 0
+    assert "Cancellation" not in tx.events
+
+    gov_trophy.passTrophy("Tournament 2", "0xffff", [accounts[3], accounts[1]], ["Pascal", "Miguel"], {'from': accounts[2]})
+    assert cif.currentTrophyId() == 2
+    with brownie.reverts("Gov: trophy has been passed already"):
+        gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+
+    tx = gov_trophy.cancelStale([1, 3, 2, 99], {'from': accounts[1]})
+    assert tx.return_value == 0b101
+    assert [e["transactionId"] for e in tx.events["Cancellation"]] == [1, 2]
+    assert gov_trophy.getTransactionIds(False) == [3]
+    assert gov_trophy.getTransactionIds(True) == []
+    assert gov_trophy.isCancelled(1)
+    assert gov_trophy.transactions(1) == (PASS_TROPHY, False)
+    assert gov_trophy.passTrophyPayloads(1)[1] == ""
+    assert gov_trophy.trophyCommitmentPayloads(2)[3] == "0x" + "00" * 32
+
+    # Cancelled proposals can't be voted on anymore and are skipped by batches
+    with brownie.reverts("Gov: transaction cancelled"):
+        gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+    with brownie.reverts("Gov: transaction cancelled"):
+        gov_trophy.revokeConfirmation(1, {'from': accounts[0]})
+    with brownie.reverts("Gov: transaction cancelled"):
+        gov_trophy.executeTransaction(1, {'from': accounts[0]})
+    assert gov_trophy.confirmTransactions([1, 2], {'from': accounts[1]}).return_value == 0
+    assert gov_trophy.cancelStale([1, 2], {'from': accounts[1]}).return_value == 0
+
+
+def test_cancel_stale_committed(gov_trophy, cif, accounts):
+    args = ("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel"])
+    gov_trophy.passTrophyCommitted(*args, {'from': accounts[0]})
+    gov_trophy.passTrophy("Tournament 2", "0xffff", [accounts[3]], ["Pascal"], {'from': accounts[2]})
+
+    assert gov_trophy.cancelStale([1], {'from': accounts[1]}).return_value == 1
+    assert gov_trophy.uintPayloads(1) == 0
+    assert gov_trophy.bytes32Payloads(1) == "0x" + "00" * 32
+    with brownie.reverts("Gov: transaction cancelled"):
+        gov_trophy.executePassTrophy(1, *args, {'from': accounts[1]})
+
+
+def test_cancel_stale_reverts(gov_trophy, accounts):
+    with brownie.reverts("Gov: caller is not a member"):
+        gov_trophy.cancelStale([1], {'from': accounts[8]})
+    with brownie.reverts("Gov: too many transactions"):
+        gov_trophy.cancelStale(list(range(257)), {'from': accounts[0]})
@@ -0,0 +1,108 @@
+CHANGE_QUORUM = 6
+
+
+def assert_count_matches(gov, transaction_id, expected):
+    confirmed = [member for member in gov.getMembers() if gov.confirmations(transaction_id, member)]
+    assert len(confirmed) == expected
+    assert gov.getConfirmationCount(transaction_id) == expected
+    assert gov.getConfirmations(transaction_id) == confirmed
+    assert gov.isConfirmed(transaction_id) == (expected >= gov.requiredVotes())
+
+
+def test_count_confirm_and_revoke(gov, accounts):
+    gov.changeQuorum(75, {'from': accounts[0]})
+    assert gov.transactions(1)[0] == CHANGE_QUORUM
+    assert gov.confirmations(1, accounts[0])
+    assert_count_matches(gov, 1, 1)
+
+    gov.revokeConfirmation(1, {'from': accounts[0]})
+    assert_count_matches(gov, 1, 0)
+
+    gov.confirmTransaction(1, {'from': accounts[3]})
+    assert_count_matches(gov, 1, 1)
+    tx = gov.confirmTransaction(1, {'from': accounts[0]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert_count_matches(gov, 1, 2)
+
+
+def test_count_after_add_member(gov, accounts):
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.addMember(accounts[9], {'from': accounts[1]})
+    gov.confirmTransaction(2, {'from': accounts[2]})
+    assert gov.isMember(accounts[9])
+    assert gov.requiredVotes() == 3
+
+    assert_count_matches(gov, 1, 1)
+    gov.confirmTransaction(1, {'from': accounts[9]})
+    assert_count_matches(gov, 1, 2)
+    assert not gov.transactions(1)[1]  # executed
+
+    tx = gov.confirmTransaction(1, {'from': accounts[3]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert_count_matches(gov, 1, 3)
+
+
+def test_count_after_remove_member(gov, accounts):
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.removeMember(accounts[0], {'from': accounts[1]})
+    gov.confirmTransaction(2, {'from': accounts[2]})
+    assert not gov.isMember(accounts[0])
+    assert gov.requiredVotes() == 2
+
+    # The vote of the removed member no longer counts
+    assert_count_matches(gov, 1, 0)
+    tx = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert "Execution" not in tx.events
+    assert_count_matches(gov, 1, 1)
+
+    tx = gov.confirmTransaction(1, {'from': accounts[3]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert_count_matches(gov, 1, 2)
+
+
+def test_count_after_replace_member(gov, accounts):
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.replaceMember(accounts[0], accounts[8], {'from': accounts[1]})
+    gov.confirmTransaction(2, {'from': accounts[2]})
+    assert gov.isMember(accounts[8])
+
+    assert_count_matches(gov, 1, 0)
+    gov.confirmTransaction(1, {'from': accounts[8]})
+    assert_count_matches(gov, 1, 1)
+    assert gov.getConfirmations(1) == [accounts[8]]
+
+
+def test_bits_follow_moved_member(gov, accounts):
+    gov.changeQuorum(100, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[3]})
+    assert gov.getConfirmations(1) == [accounts[0], accounts[3]]
+
+    # accounts[3] moves from the last slot into the slot of accounts[1]
+    gov.removeMember(accounts[1], {'from': accounts[2]})
+    gov.confirmTransaction(2, {'from': accounts[0]})
+    assert gov.getMembers() == [accounts[0], accounts[3], accounts[2]]
+
+    assert gov.confirmations(1, accounts[0])
+    assert gov.confirmations(1, accounts[3])
+    assert not gov.confirmations(1, accounts[1])
+    assert not gov.confirmations(1, accounts[2])
+    assert gov.getConfirmations(1) == [accounts[0], accounts[3]]
+    assert_count_matches(gov, 1, 2)
+
+    tx = gov.confirmTransaction(1, {'from': accounts[2]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert gov.getConfirmations(1) == [accounts[0], accounts[3], accounts[2]]
+    assert_count_matches(gov, 1, 3)
+
+
+def test_removed_member_vote_not_restored(gov, accounts):
+    gov.changeQuorum(100, {'from': accounts[1]})
+    gov.removeMember(accounts[1], {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[2]})
+    assert_count_matches(gov, 1, 0)
+
+    gov.addMember(accounts[1], {'from': accounts[0]})
+    gov.confirmTransaction(3, {'from': accounts[2]})
+    assert gov.isMember(accounts[1])
+    assert not gov.confirmations(1, accounts[1])
+    assert_count_matches(gov, 1, 0)
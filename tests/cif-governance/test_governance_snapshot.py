@@ -0,0 +1,82 @@
+import pytest
+
+from helpers.signatures import decode_payload
+from helpers.winners import encode_winners
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2]], ["Hannes"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def normalize(value):
+    """Makes getter results and decoded payloads comparable: bytes as hex, addresses lowercase, tuples as lists."""
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, str) and value.startswith("0x") and len(value) == 42:
+        return value.lower()
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+
+def test_governance_snapshot(gov_trophy, accounts):
+    gov = gov_trophy
+    gov.addMember(accounts[7], {'from': accounts[0]})
+    gov.removeMember(accounts[3], {'from': accounts[1]})
+    gov.replaceMember(accounts[2], accounts[8], {'from': accounts[0]})
+    gov.passTrophy("Tournament 1", "0xa1b2", [accounts[6], accounts[7]], ["Jonas", "Daniel"], {'from': accounts[0]})
+    packed = encode_winners([accounts[8], accounts[9]], ["Miguel", "Markus"])
+    gov.passTrophy("Tournament 2", "0xa1b2", packed, {'from': accounts[1]})
+    gov.transferOwnership(accounts[9], {'from': accounts[0]})
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov.passTrophyByClaim("Tournament 3", "0x" + "ab" * 32, "0x1234", 2, {'from': accounts[0]})
+    gov.openTrophy("Tournament 4", "0xa1b2", "0x5678", {'from': accounts[1]})
+    gov.passTrophyCommitted("Tournament 5", "0xa1b2", [accounts[6]], ["Jonas"], {'from': accounts[0]})
+    gov.setTrophyURI(1, "ipfs://trophy-1", {'from': accounts[0]})
+    gov.confirmTransaction(3, {'from': accounts[2]})
+    gov.confirmTransaction(8, {'from': accounts[1]})
+
+    def pass_trophy(transaction_id, winners, names):
+        payload = gov.passTrophyPayloads(transaction_id)
+        return [payload[1], payload[2], winners, names]
+
+    expected_payloads = {
+        1: [gov.addressPayloads(1)],
+        2: [gov.addressPayloads(2)],
+        4: pass_trophy(4, [accounts[6], accounts[7]], ["Jonas", "Daniel"]),
+        5: pass_trophy(5, [accounts[8], accounts[9]], ["Miguel", "Markus"]),
+        6: [gov.addressPayloads(6)],
+        7: [gov.uintPayloads(7)],
+        9: list(gov.trophyCommitmentPayloads(9))[1:],
+        10: list(gov.trophyCommitmentPayloads(10))[1:4],
+        11: [gov.uintPayloads(11), gov.bytes32Payloads(11)],
+        12: list(gov.trophyURIPayloads(12)),
+    }
+
+    snapshot = gov.getGovernanceSnapshot(0, 100)
+    assert snapshot[0] == gov.getMembers()
+    assert snapshot[1:5] == (gov.quorum(), gov.requiredVotes(), gov.transactionCount(), gov.getTransactionIdCount(False))
+    assert [p[0] for p in snapshot[5]] == gov.getTransactionIds(False, 0, 100)
+    assert sorted(p[0] for p in snapshot[5]) == sorted(expected_payloads)
+    for transaction_id, txn_type, confirmations, payload in snapshot[5]:
+        assert txn_type == gov.transactions(transaction_id)[0]
+        assert confirmations == gov.getConfirmations(transaction_id)
+        assert normalize(decode_payload(txn_type, payload)) == normalize(expected_payloads[transaction_id])
+
+
+def test_governance_snapshot_pages(gov_trophy, accounts):
+    for i in range(7):
+        gov_trophy.setBaseURI(f"https://cif.unibas.ch/{i}/", {'from': accounts[0]})
+    gov_trophy.confirmTransaction(2, {'from': accounts[1]})
+
+    pages = [gov_trophy.getGovernanceSnapshot(offset, 4)[5] for offset in (0, 4)]
+    assert [[p[0] for p in page] for page in pages] == [
+        gov_trophy.getTransactionIds(False, 0, 4), gov_trophy.getTransactionIds(False, 4, 4)
+    ]
+    assert len(pages[1]) == 2
+    assert gov_trophy.getGovernanceSnapshot(6, 4)[5] == []
+    assert gov_trophy.getGovernanceSnapshot(6, 4)[4] == 6
@@ -0,0 +1,105 @@
+import pytest
+
+from helpers.indexer import Indexer
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2], accounts[5]], ["Hannes", "Pascal"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+@pytest.fixture
+def indexer(web3, gov_trophy, cif):
+    # Small ranges so that every scenario spans several eth_getLogs calls
+    yield Indexer(web3, cif, gov_trophy, start_block=gov_trophy.tx.block_number, batch_size=3)
+
+
+def assert_matches_chain(indexer, gov, trophy, accounts):
+    indexer.sync()
+    assert indexer.current_trophy_id() == trophy.currentTrophyId()
+    for index in range(trophy.totalSupply()):
+        token_id = trophy.tokenByIndex(index)
+        assert indexer.holder_of(token_id) == trophy.ownerOf(token_id)
+        assert indexer.trophy_of(token_id) == trophy.winners(token_id)[0]
+    for account in accounts[:10]:
+        assert indexer.has_current_trophy(account) == trophy.hasAddressCurrentTrophy(account)
+        assert indexer.tokens_of(account) == sorted(
+            trophy.tokenOfOwnerByIndex(account, i) for i in range(trophy.balanceOf(account))
+        )
+
+    assert indexer.members() == gov.getMembers()
+    assert indexer.quorum() == gov.quorum()
+    assert indexer.required_votes() == gov.requiredVotes()
+    assert indexer.transaction_ids("pending") == gov.getTransactionIds(False)
+    assert indexer.transaction_ids("executed") == gov.getTransactionIds(True, 0, gov.transactionCount())
+    for transaction_id in range(1, gov.transactionCount() + 1):
+        assert indexer.transaction_type(transaction_id) == gov.transactions(transaction_id)[0]
+        assert indexer.confirmations(transaction_id) == gov.getConfirmations(transaction_id)
+
+
+def test_indexer_follows_governance(indexer, gov_trophy, cif, accounts):
+    gov = gov_trophy
+    assert_matches_chain(indexer, gov, cif, accounts)
+
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    gov.addMember(accounts[7], {'from': accounts[0]})
+    gov.replaceMember(accounts[3], accounts[6], {'from': accounts[0]})
+    gov.removeMember(accounts[1], {'from': accounts[0]})
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov.confirmTransaction(5, {'from': accounts[3]})
+    gov.revokeConfirmation(5, {'from': accounts[3]})
+    gov.confirmTransaction(4, {'from': accounts[3]})
+    assert_matches_chain(indexer, gov, cif, accounts)
+
+    gov.confirmTransactions([3, 2], {'from': accounts[1]})
+    gov.confirmTransactions([3, 2], {'from': accounts[2]})
+    assert gov.getMembers() == [accounts[0], accounts[1], accounts[2], accounts[6], accounts[7]]
+    assert_matches_chain(indexer, gov, cif, accounts)
+
+    # The vote of the replaced member is gone, the last member moves into the free slot
+    for member in [accounts[2], accounts[6], accounts[7]]:
+        gov.confirmTransaction(4, {'from': member})
+    assert gov.getMembers() == [accounts[0], accounts[7], accounts[2], accounts[6]]
+    assert_matches_chain(indexer, gov, cif, accounts)
+
+    cif.transferFrom(accounts[5], accounts[8], 2, {'from': accounts[5]})
+    gov.passTrophy("Tournament 1", "0xdef", [accounts[9]], ["Markus"], {'from': accounts[0]})
+    gov.passTrophy("Tournament 2", "0xdef", [accounts[0], accounts[6]], ["Jonas", "Daniel"], {'from': accounts[2]})
+    gov.cancelStale([6], {'from': accounts[0]})
+    assert_matches_chain(indexer, gov, cif, accounts)
+    assert indexer.transaction_ids("cancelled") == [6]
+
+
+def test_indexer_reorg(indexer, gov_trophy, cif, accounts, chain):
+    gov = gov_trophy
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.addMember(accounts[7], {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert_matches_chain(indexer, gov, cif, accounts)
+    assert indexer.members()[-1] == accounts[7]
+
+    # The last three blocks are replaced by a different history of the same length
+    chain.undo(3)
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov.removeMember(accounts[3], {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert_matches_chain(indexer, gov, cif, accounts)
+    assert indexer.transaction_type(1) == 7
+
+    # A shorter chain rolls back without new blocks
+    chain.undo(2)
+    assert_matches_chain(indexer, gov, cif, accounts)
+    assert indexer.members() == list(accounts[:4])
+
+
+def test_indexer_consecutive_runs(web3, CifGovernance, lean_cif, gov_deployer, deployer, accounts):
+    lean_gov = gov_deployer.deploy(CifGovernance, lean_cif, 50, accounts[:4])
+    indexer = Indexer(web3, lean_cif, lean_gov, start_block=lean_gov.tx.block_number)
+    winners = [accounts[1]] * 3 + [accounts[2]] * 2 + [accounts[3]]
+    lean_cif.passTrophy("Tournament 1", "0xabc", winners, [f"Winner {i}" for i in range(6)], {'from': deployer})
+    lean_cif.transferFrom(accounts[1], accounts[4], 2, {'from': accounts[1]})
+    assert_matches_chain(indexer, lean_gov, lean_cif, accounts)
+    assert indexer.tokens_of(accounts[1]) == [1, 3]
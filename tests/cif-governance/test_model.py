@@ -0,0 +1,141 @@
+import random
+
+import pytest
+from hypothesis import HealthCheck, settings, strategies as st
+from hypothesis.stateful import RuleBasedStateMachine, invariant, precondition, rule, run_state_machine_as_test
+
+from helpers.model import INITIAL_INFO_HASH, apply, apply_on_chain, chain_state, model_state, new_model
+from helpers.winners import filler_addresses
+
+N_ACCOUNTS = 8
+ADDRESSES = [f"0x{i:040x}" for i in range(1, N_ACCOUNTS + 1)]
+
+accounts_ = st.integers(0, N_ACCOUNTS - 1)
+candidates = st.integers(-1, N_ACCOUNTS - 1)  # -1 is the zero address
+
+
+class GovernanceMachine(RuleBasedStateMachine):
+    """Explores the model only, the generated sequences are kept in `sequences` for replays against the contracts."""
+
+    sequences = []
+
+    def __init__(self):
+        super().__init__()
+        self.model = new_model(ADDRESSES)
+        self.ops = []
+
+    def run(self, op):
+        self.ops.append(op)
+        apply(self.model, ADDRESSES, op)
+
+    def transaction_id(self, data):
+        return data.draw(st.integers(1, len(self.model.proposals) + 1), label="transaction_id")
+
+    @rule(sender=accounts_, member=candidates)
+    def add_member(self, sender, member):
+        self.run(("add_member", sender, member))
+
+    @rule(sender=accounts_, member=accounts_)
+    def remove_member(self, sender, member):
+        self.run(("remove_member", sender, member))
+
+    @rule(sender=accounts_, old_member=accounts_, new_member=candidates)
+    def replace_member(self, sender, old_member, new_member):
+        self.run(("replace_member", sender, old_member, new_member))
+
+    @rule(sender=accounts_, quorum=st.integers(0, 110))
+    def change_quorum(self, sender, quorum):
+        self.run(("change_quorum", sender, quorum))
+
+    @rule(sender=accounts_, uri=st.integers(0, 3))
+    def set_base_uri(self, sender, uri):
+        self.run(("set_base_uri", sender, uri))
+
+    @rule(sender=accounts_, winners=st.lists(accounts_, max_size=3), tournament=st.integers(1, 1000))
+    def pass_trophy(self, sender, winners, tournament):
+        self.run(("pass_trophy", sender, tuple(winners), tournament))
+
+    @rule(sender=accounts_, data=st.data())
+    def confirm(self, sender, data):
+        self.run(("confirm", sender, self.transaction_id(data)))
+
+    @rule(sender=accounts_, data=st.data())
+    def revoke(self, sender, data):
+        self.run(("revoke", sender, self.transaction_id(data)))
+
+    @rule(sender=accounts_, data=st.data())
+    def execute(self, sender, data):
+        self.run(("execute", sender, self.transaction_id(data)))
+
+    @rule(sender=accounts_, data=st.data())
+    def cancel_stale(self, sender, data):
+        transaction_ids = data.draw(st.lists(st.integers(1, len(self.model.proposals) + 1), max_size=4))
+        self.run(("cancel_stale", sender, tuple(transaction_ids)))
+
+    @precondition(lambda self: self.model.trophy.owners)
+    @rule(data=st.data(), to=accounts_)
+    def transfer(self, data, to):
+        owners = self.model.trophy.owners
+        token_id = data.draw(st.sampled_from(sorted(owners)), label="token_id")
+        self.run(("transfer", ADDRESSES.index(owners[token_id]), token_id, to))
+
+    @invariant()
+    def proposals_consistent(self):
+        gov = self.model
+        assert len(set(gov.members)) == len(gov.members) == len(gov.is_member)
+        assert sorted(gov.pending + gov.executed) == sorted(
+            i for i, p in gov.proposals.items() if not p.cancelled
+        )
+        for proposal in gov.proposals.values():
+            assert proposal.confirmations <= gov.is_member
+            assert not (proposal.executed and proposal.cancelled)
+
+    def teardown(self):
+        GovernanceMachine.sequences.append(self.ops)
+
+
+def explore(max_examples, steps):
+    GovernanceMachine.sequences = []
+    run_state_machine_as_test(GovernanceMachine, settings=settings(
+        max_examples=max_examples,
+        stateful_step_count=steps,
+        deadline=None,
+        derandomize=True,
+        database=None,
+        suppress_health_check=[HealthCheck.too_slow],
+    ))
+    return GovernanceMachine.sequences
+
+
+def test_model_fuzz():
+    # Pure Python, the invariants are checked after every step
+    explore(max_examples=500, steps=60)
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", INITIAL_INFO_HASH, [accounts[2]], ["Hannes"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def test_model_matches_contracts(gov_trophy, cif, accounts, chain):
+    sequences = [ops for ops in explore(max_examples=100, steps=30) if ops]
+    addresses = [str(a) for a in accounts[:N_ACCOUNTS]]
+    chain.snapshot()
+    for ops in random.Random(0).sample(sequences, 8):
+        model = new_model(addresses)
+        for op in ops:
+            assert apply_on_chain(gov_trophy, cif, accounts, op) == apply(model, addresses, op), op
+            assert gov_trophy.requiredVotes() == model.required_votes, op
+        assert chain_state(gov_trophy, cif) == model_state(model)
+        chain.revert()
+
+
+@pytest.mark.parametrize("n_members", [1, 2, 3, 7, 30])
+def test_required_votes_sweep(CifGovernance, cif, gov_deployer, n_members):
+    # The smallest number of votes that reaches the quorum, counted up instead of using the model's formula
+    for quorum in [0, 1, 33, 34, 50, 51, 66, 67, 99, 100]:
+        gov = gov_deployer.deploy(CifGovernance, cif, quorum, filler_addresses(n_members))
+        expected = next(votes for votes in range(n_members + 1) if votes * 100 >= n_members * quorum)
+        assert gov.requiredVotes() == expected, quorum
@@ -0,0 +1,74 @@
+import brownie
+import pytest
+
+PASS_TROPHY_COMMITTED = 10
+
+
+@pytest.fixture(scope="module")
+def owned_gov(gov, cif, deployer):
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def test_pass_trophy_committed(owned_gov, cif, accounts):
+    args = ("Tournament 1", "0xa1b2", [accounts[0], accounts[8]], ["Daniel", "Markus"])
+    tx = owned_gov.passTrophyCommitted(*args, {'from': accounts[0]})
+    assert tx.return_value == 1
+    assert tx.events["Submission"]["transactionId"] == 1
+    assert owned_gov.transactions(1)[0] == PASS_TROPHY_COMMITTED
+    assert owned_gov.uintPayloads(1) == 0
+    assert owned_gov.bytes32Payloads(1) != "0x" + "00" * 32
+
+    tx = owned_gov.confirmPassTrophy(1, *args, {'from': accounts[1]})
+    assert tx.return_value
+    assert tx.events["Confirmation"]["sender"] == accounts[1]
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert tx.events["TrophyPassed"]["trophyId"] == 1
+    assert owned_gov.transactions(1)[1]  # executed
+    assert cif.ownerOf(2) == accounts[8]
+    assert cif.currentTrophy()[3] == ("Daniel", "Markus")
+
+
+def test_execute_after_quorum(owned_gov, cif, accounts):
+    args = ("Tournament 1", "0xa1b2", [accounts[0], accounts[8]], ["Daniel", "Markus"])
+    owned_gov.passTrophyCommitted(*args, {'from': accounts[0]})
+
+    # Quorum is reached, but execution needs the arguments
+    tx = owned_gov.confirmTransaction(1, {'from': accounts[1]})
+    assert "Execution" not in tx.events
+    assert owned_gov.isConfirmed(1)
+    assert not owned_gov.executeTransaction(1, {'from': accounts[1]}).return_value
+    assert not owned_gov.transactions(1)[1]
+
+    with brownie.reverts("Gov: arguments do not match the proposal"):
+        owned_gov.executePassTrophy(1, "Tournament 1", "0xa1b2", [accounts[0], accounts[8]], ["Daniel", "Max"], {'from': accounts[2]})
+
+    tx = owned_gov.executePassTrophy(1, *args, {'from': accounts[2]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert cif.currentTrophyId() == 1
+
+    with brownie.reverts("Gov: transaction already executed"):
+        owned_gov.executePassTrophy(1, *args, {'from': accounts[2]})
+
+
+def test_pass_trophy_committed_reverts(owned_gov, cif, accounts):
+    args = ("Tournament 1", "0xa1b2", [accounts[0], accounts[8]], ["Daniel", "Markus"])
+    with brownie.reverts("Gov: caller is not a member"):
+        owned_gov.passTrophyCommitted(*args, {'from': accounts[8]})
+    with brownie.reverts("Gov: not same length for address- and name arrays"):
+        owned_gov.passTrophyCommitted("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel", "Markus"], {'from': accounts[0]})
+
+    owned_gov.changeQuorum(50, {'from': accounts[0]})
+    with brownie.reverts("Gov: not a committed trophy pass"):
+        owned_gov.executePassTrophy(1, *args, {'from': accounts[0]})
+
+    # Not confirmed yet
+    owned_gov.passTrophyCommitted(*args, {'from': accounts[0]})
+    assert not owned_gov.executePassTrophy(2, *args, {'from': accounts[0]}).return_value
+
+    # Superseded by another pass
+    owned_gov.passTrophy("Tournament 1", "0xa1b2", [accounts[3]], ["Pascal"], {'from': accounts[1]})
+    owned_gov.confirmTransaction(3, {'from': accounts[2]})
+    assert cif.currentTrophyId() == 1
+    with brownie.reverts("Gov: trophy has been passed already"):
+        owned_gov.confirmPassTrophy(2, *args, {'from': accounts[1]})
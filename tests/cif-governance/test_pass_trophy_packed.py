@@ -0,0 +1,58 @@
+import brownie
+import pytest
+
+from helpers.winners import encode_winners, filler_addresses
+
+N_WINNERS = 30
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2]], ["Hannes"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def test_pass_trophy_packed_vote(gov_trophy, cif, accounts):
+    addresses = filler_addresses(N_WINNERS)
+    names = [f"Player {i}" for i in range(N_WINNERS)]
+    packed = encode_winners(addresses, names)
+
+    tx = gov_trophy.passTrophy("Tournament 1", "0xa1b2", packed, {'from': accounts[0]})
+    assert tx.return_value == 1
+    payload = gov_trophy.passTrophyPayloads(1)
+    assert payload[0] == 1
+    assert payload[1] == "Tournament 1"
+    assert payload[3] == "0x" + packed.hex()
+
+    tx = gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 2
+    assert cif.currentTrophy()[3] == tuple(names)
+    assert [cif.ownerOf(i) for i in cif.currentTrophy()[4]] == addresses
+    assert gov_trophy.passTrophyPayloads(1)[3] == "0x"
+
+
+def test_pass_trophy_packed_without_vote(gov_trophy, cif, accounts):
+    packed = encode_winners([accounts[0], accounts[1]], ["Daniel", "Markus"])
+    tx = gov_trophy.passTrophy("Tournament 1", "0xa1b2", packed, {'from': accounts[2]})
+    assert tx.return_value == 0
+    assert "Submission" not in tx.events
+    assert cif.currentTrophy()[3] == ("Daniel", "Markus")
+
+    with brownie.reverts("WinnerEncoding: malformed winners"):
+        gov_trophy.passTrophy("Tournament 2", "0xa1b2", packed[:-1], {'from': accounts[0]})
+
+
+def test_pass_trophy_packed_gas(gov_trophy, accounts):
+    addresses = filler_addresses(N_WINNERS)
+    names = [f"Player {i}" for i in range(N_WINNERS)]
+
+    arrays = gov_trophy.passTrophy("Tournament 1", "0xa1b2", addresses, names, {'from': accounts[0]}).gas_used
+    arrays += gov_trophy.confirmTransaction(1, {'from': accounts[1]}).gas_used
+    packed = gov_trophy.passTrophy(
+        "Tournament 2", "0xa1b2", encode_winners(addresses, names), {'from': accounts[0]}
+    ).gas_used
+    packed += gov_trophy.confirmTransaction(2, {'from': accounts[1]}).gas_used
+
+    # The packed roster is cheaper to send and to store
+    assert packed < arrays
@@ -0,0 +1,165 @@
+import brownie
+import pytest
+
+from helpers import preflight
+from helpers.roster import roster_batches
+
+COMMITTED = "Gov: committed trophy pass, execute with confirmPassTrophy or executePassTrophy"
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2]], ["Hannes"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def pass_on(gov, accounts):
+    # accounts[2] holds the current trophy and passes it on without a vote
+    gov.passTrophy("Tournament 2", "0xffff", [accounts[3]], ["Pascal"], {'from': accounts[2]})
+
+
+def test_preview_votes(gov_trophy, accounts):
+    gov_trophy.changeQuorum(75, {'from': accounts[0]})
+    assert gov_trophy.previewExecution(1, accounts[1]) == (True, 1, 2, True, "", True)
+    assert gov_trophy.previewExecution(1, accounts[0]) == (False, 1, 2, True, "", False)  # already confirmed
+    assert gov_trophy.previewExecution(1, accounts[8]) == (False, 1, 2, True, "", False)  # not a member
+    assert gov_trophy.previewExecution(1, brownie.ZERO_ADDRESS) == (False, 1, 2, True, "", False)
+
+    gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+    assert gov_trophy.previewExecution(1, accounts[2]) == (
+        False, 2, 3, False, "Gov: transaction already executed", False
+    )
+    with brownie.reverts("Gov: invalid transaction"):
+        gov_trophy.previewExecution(99, accounts[1])
+
+
+def test_preview_members(gov_trophy, accounts):
+    gov_trophy.addMember(accounts[5], {'from': accounts[0]})
+    gov_trophy.addMember(accounts[5], {'from': accounts[0]})
+    gov_trophy.removeMember(accounts[2], {'from': accounts[0]})
+    gov_trophy.removeMember(accounts[2], {'from': accounts[0]})
+    gov_trophy.replaceMember(accounts[3], accounts[6], {'from': accounts[0]})
+    gov_trophy.replaceMember(accounts[3], accounts[7], {'from': accounts[0]})
+    for transaction_id in range(1, 7):
+        assert gov_trophy.previewExecution(transaction_id, accounts[1]) == (True, 1, 2, True, "", True)
+
+    # The removal goes first so that the added member does not raise the required votes
+    gov_trophy.confirmTransactions([3, 5, 1], {'from': accounts[1]})
+    assert gov_trophy.previewExecution(2, accounts[0])[3:5] == (False, "Gov: member already exists")
+    assert gov_trophy.previewExecution(4, accounts[0])[3:5] == (False, "Gov: member does not exist")
+    assert gov_trophy.previewExecution(6, accounts[0])[3:5] == (False, "Gov: old member does not exist")
+
+
+def test_preview_trophy_passes(gov_trophy, cif, accounts):
+    args = ("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel"])
+    gov_trophy.passTrophy(*args, {'from': accounts[0]})
+    gov_trophy.passTrophyByClaim("Tournament 1", "0xa1b2", "0x1234", 2, {'from': accounts[0]})
+    gov_trophy.openTrophy("Tournament 1", "0xa1b2", "0x1234", {'from': accounts[0]})
+    gov_trophy.passTrophyCommitted(*args, {'from': accounts[0]})
+    for transaction_id in range(1, 4):
+        assert gov_trophy.previewExecution(transaction_id, accounts[1]) == (True, 1, 2, True, "", True)
+    # confirmTransaction only records the vote, the arguments are needed for the execution
+    assert gov_trophy.previewExecution(4, accounts[1]) == (True, 1, 2, False, COMMITTED, True)
+    gov_trophy.confirmPassTrophy(4, *args, {'from': accounts[1]})
+    assert cif.currentTrophyId() == 2
+    assert gov_trophy.previewExecution(1, accounts[1])[3:5] == (False, "Gov: trophy has been passed already")
+
+    gov_trophy.passTrophyCommitted(*args, {'from': accounts[0]})
+    # accounts[0] holds trophy 2 now and passes it on without a vote
+    gov_trophy.passTrophy("Tournament 2", "0xffff", [accounts[3]], ["Pascal"], {'from': accounts[0]})
+    assert cif.currentTrophyId() == 3
+    assert gov_trophy.transactionCount() == 5
+    for transaction_id in (1, 2, 3, 5):
+        assert gov_trophy.previewExecution(transaction_id, accounts[1]) == (
+            True, 1, 2, False, "Gov: trophy has been passed already", True
+        )
+    with brownie.reverts("Gov: trophy has been passed already"):
+        gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+
+    gov_trophy.cancelStale([1], {'from': accounts[1]})
+    assert gov_trophy.previewExecution(1, accounts[1])[3:] == (False, "Gov: transaction cancelled", False)
+
+
+def test_preview_trophy_owner(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2]], ["Hannes"], {'from': deployer})
+    gov.transferOwnership(accounts[9], {'from': accounts[0]})
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov.setTrophyURI(1, "ipfs://results/tour-0", {'from': accounts[0]})
+    for transaction_id in range(1, 4):
+        assert gov.previewExecution(transaction_id, accounts[1])[3:5] == (False, "Ownable: caller is not the owner")
+
+    cif.transferOwnership(gov, {'from': deployer})
+    for transaction_id in range(1, 4):
+        assert gov.previewExecution(transaction_id, accounts[1]) == (True, 1, 2, True, "", True)
+    gov.confirmTransactions([2, 3, 1], {'from': accounts[1]})
+    assert cif.owner() == accounts[9]
+
+
+def test_preflight_helper(gov_trophy, cif, accounts):
+    gov_trophy.passTrophy("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel"], {'from': accounts[0]})
+    with pytest.raises(preflight.PreflightError, match="1 of 2 votes"):
+        preflight.execute(gov_trophy, 1, accounts[0])
+
+    pass_on(gov_trophy, accounts)
+    height = brownie.chain.height
+    with pytest.raises(preflight.PreflightError, match="trophy has been passed already"):
+        preflight.confirm(gov_trophy, 1, accounts[1])
+    assert brownie.chain.height == height  # nothing was broadcast
+
+    gov_trophy.changeQuorum(75, {'from': accounts[0]})
+    tx = preflight.confirm(gov_trophy, 2, accounts[1])
+    assert tx.events["Execution"]["transactionId"] == 2
+
+
+def test_preview_open_trophy(gov_trophy, cif, accounts):
+    roster_hash, batches = roster_batches([accounts[5]], ["Pascal"], 1)
+    gov_trophy.openTrophy("Tournament 1", "0xa1b2", roster_hash, {'from': accounts[0]})
+    gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+    assert cif.openTrophyId() == 2
+
+    # Trophy passes can't execute while the batch pass is open
+    gov_trophy.passTrophy("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel"], {'from': accounts[0]})
+    gov_trophy.passTrophyByClaim("Tournament 1", "0xa1b2", "0x1234", 2, {'from': accounts[0]})
+    gov_trophy.openTrophy("Tournament 1", "0xa1b2", roster_hash, {'from': accounts[0]})
+    gov_trophy.cancelOpenTrophy({'from': accounts[0]})
+    for transaction_id in range(2, 5):
+        assert gov_trophy.previewExecution(transaction_id, accounts[1]) == (
+            True, 1, 2, False, "Cif: trophy pass in progress", True
+        )
+        with brownie.reverts("Cif: trophy pass in progress"):
+            gov_trophy.confirmTransaction(transaction_id, {'from': accounts[1]})
+    assert gov_trophy.previewExecution(5, accounts[1]) == (True, 1, 2, True, "", True)
+
+    gov_trophy.confirmTransaction(5, {'from': accounts[1]})
+    for transaction_id in range(2, 5):
+        assert gov_trophy.previewExecution(transaction_id, accounts[1]) == (True, 1, 2, True, "", True)
+
+    # A cancellation of a pass that was finalized in the meantime
+    gov_trophy.confirmTransaction(4, {'from': accounts[1]})
+    gov_trophy.cancelOpenTrophy({'from': accounts[0]})
+    cif.appendWinners(*batches[0], {'from': accounts[9]})
+    cif.finalizeTrophy({'from': accounts[9]})
+    assert gov_trophy.previewExecution(6, accounts[1])[3:5] == (False, "Gov: trophy pass is not open anymore")
+
+
+def test_preview_lean_trophy(CifGovernance, lean_cif, deployer, gov_deployer, accounts):
+    gov = gov_deployer.deploy(CifGovernance, lean_cif, 50, accounts[:4])
+    lean_cif.transferOwnership(gov, {'from': deployer})
+    gov.passTrophy("Tournament 1", "0xa1b2", [accounts[0]], ["Daniel"], {'from': accounts[0]})
+    assert gov.previewExecution(1, accounts[1]) == (True, 1, 2, True, "", True)
+
+
+def test_preflight_voter(gov_trophy, accounts):
+    gov_trophy.changeQuorum(75, {'from': accounts[0]})
+    height = brownie.chain.height
+    with pytest.raises(preflight.PreflightError, match="Gov: transaction already confirmed"):
+        preflight.confirm(gov_trophy, 1, accounts[0])
+    with pytest.raises(preflight.PreflightError, match="Gov: caller is not a member"):
+        preflight.confirm(gov_trophy, 1, accounts[8])
+    assert brownie.chain.height == height
+
+    preflight.confirm(gov_trophy, 1, accounts[1])
+    with pytest.raises(preflight.PreflightError, match="Gov: transaction already executed"):
+        preflight.confirm(gov_trophy, 1, accounts[2])
+    assert brownie.chain.height == height + 1
@@ -0,0 +1,125 @@
+import pytest
+
+from helpers.client import LRUCache, ReadClient
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    for i in range(5):
+        names = ["Hannes", "Pascal"]
+        cif.passTrophy(f"Tournament {i}", "0x" + f"{i:064x}", [accounts[2], accounts[5]], names, {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[0]})
+    gov.changeQuorum(75, {'from': accounts[0]})
+    gov.passTrophy("Tournament 5", "0xa1b2", [accounts[6]], ["Jonas"], {'from': accounts[0]})
+    yield gov
+
+
+def naive_dashboard(web3, cif, gov):
+    """One eth_call per value, the way the dashboard used to load."""
+    trophy = web3.eth.contract(address=cif.address, abi=cif.abi)
+    gov = web3.eth.contract(address=gov.address, abi=gov.abi)
+    trophy_id = trophy.functions.currentTrophyId().call()
+    pending = gov.functions.getTransactionIds(False).call()
+    return {
+        "trophies": [trophy.functions.getInfoByTrophyId(i).call() for i in range(1, trophy_id + 1)],
+        "members": gov.functions.getMembers().call(),
+        "required_votes": gov.functions.requiredVotes().call(),
+        "pending": [
+            (i, gov.functions.transactions(i).call(), gov.functions.getConfirmations(i).call()) for i in pending
+        ],
+    }
+
+
+def assert_refresh(client, expected, requests, calls):
+    before = client.requests, client.calls
+    assert client.dashboard() == expected
+    assert (client.requests - before[0], client.calls - before[1]) == (requests, calls)
+
+
+def test_dashboard_refresh(web3, rpc_methods, gov_trophy, cif, accounts):
+    gov = gov_trophy
+    expected = naive_dashboard(web3, cif, gov)
+    assert rpc_methods.count("eth_call") == 4 + 5 + 2 * 3
+
+    client = ReadClient(web3, cif, gov)
+    assert_refresh(client, expected, requests=3, calls=15)
+    assert_refresh(client, expected, requests=1, calls=0)
+
+    # Executing a proposal refetches it and the pending ids
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    assert_refresh(client, naive_dashboard(web3, cif, gov), requests=2, calls=1)
+
+    # Passing the trophy also refetches the current and the previous trophy
+    gov.confirmTransaction(3, {'from': accounts[1]})
+    assert_refresh(client, naive_dashboard(web3, cif, gov), requests=3, calls=4)
+
+    # A quorum change drops all governance results
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert_refresh(client, naive_dashboard(web3, cif, gov), requests=2, calls=3)
+    assert_refresh(client, naive_dashboard(web3, cif, gov), requests=1, calls=0)
+
+
+def test_transfers_and_proposal_lists(web3, gov_trophy, cif, accounts):
+    gov = gov_trophy
+    client = ReadClient(web3, cif, gov)
+    views = [
+        (cif, "ownerOf", (1,)),
+        (cif, "balanceOf", (accounts[2],)),
+        (gov, "getTransactionIds", (False, 0, 10)),
+        (gov, "getTransactionIdCount", (False,)),
+        (gov, "transactionCount", ()),
+    ]
+    client.sync()
+    owner, balance, pending, n_pending, n_transactions = client.call_many(views)
+    assert (owner, balance, list(pending), n_pending, n_transactions) == (accounts[2], 5, [1, 2, 3], 3, 3)
+
+    cif.transferFrom(accounts[2], accounts[7], 1, {'from': accounts[2]})
+    gov.addMember(accounts[7], {'from': accounts[0]})
+    client.sync()
+    owner, balance, pending, n_pending, n_transactions = client.call_many(views)
+    assert (owner, balance, list(pending), n_pending, n_transactions) == (accounts[7], 4, [1, 2, 3, 4], 4, 4)
+    # Only the owner of the transferred token and the proposal lists were cached
+    assert client.calls == 2 * len(views)
+    assert (cif.address, "balanceOf", (accounts[2],)) not in client.cache
+
+
+def test_persisted_cache(web3, gov_trophy, cif, accounts, tmp_path):
+    path = tmp_path / "cache.json"
+    client = ReadClient(web3, cif, gov_trophy, path=path)
+    expected = client.dashboard()
+    assert [tuple(w) for w in client.winners([1, 2])] == [(1, "Hannes"), (1, "Pascal")]
+    client.cache.save()
+
+    client = ReadClient(web3, cif, gov_trophy, path=path)
+    assert_refresh(client, expected, requests=1, calls=0)
+    assert tuple(client.winners([2])[0]) == (1, "Pascal")
+    assert client.calls == 0
+
+    gov_trophy.confirmTransaction(1, {'from': accounts[1]})
+    assert_refresh(client, naive_dashboard(web3, cif, gov_trophy), requests=2, calls=1)
+
+
+def test_persisted_cache_mismatch(web3, gov_trophy, cif, tmp_path):
+    path = tmp_path / "cache.json"
+    client = ReadClient(web3, cif, gov_trophy, path=path)
+    client.dashboard()
+    client.cache.save()
+    assert LRUCache(path=path, identity=[web3.eth.chain_id, cif.address, gov_trophy.address])
+
+    # Entries of other contracts are never loaded and the file is deleted
+    cache = LRUCache(path=path, identity=[web3.eth.chain_id, gov_trophy.address, cif.address])
+    assert len(cache) == 0 and cache.block is None
+    assert not path.exists()
+
+    path.write_bytes(b"\x80\x04not json")
+    client = ReadClient(web3, cif, gov_trophy, path=path)
+    assert len(client.cache) == 0
+    assert not path.exists()
+    assert client.dashboard() == naive_dashboard(web3, cif, gov_trophy)
+
+
+def test_cache_size(web3, gov_trophy, cif):
+    client = ReadClient(web3, cif, gov_trophy, cache_size=4)
+    assert client.dashboard() == naive_dashboard(web3, cif, gov_trophy)
+    assert len(client.cache) == 4
@@ -87,3 +87,19 @@ def test_add_member_reverts(gov, accounts):
     with brownie.reverts("Gov: member does not exist"):
         gov.removeMember(accounts[7], {'from': accounts[1]})
 
+
+def test_remove_last_member(gov, accounts):
+    gov.removeMember(accounts[3], {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    assert gov.getMembers() == [accounts[0], accounts[1], accounts[2]]
+    assert not gov.isMember(accounts[3])
+
+    gov.replaceMember(accounts[2], accounts[3], {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert gov.getMembers() == [accounts[0], accounts[1], accounts[3]]
+
+    gov.removeMember(accounts[0], {'from': accounts[1]})
+    gov.confirmTransaction(3, {'from': accounts[3]})
+    assert gov.getMembers() == [accounts[3], accounts[1]]
+    assert gov.confirmations(3, accounts[3])
+    assert gov.confirmations(3, accounts[1])
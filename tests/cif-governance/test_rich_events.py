@@ -0,0 +1,95 @@
+import pytest
+
+from helpers.indexer import Indexer
+from helpers.merkle import claim_tree
+from helpers.signatures import SignatureAggregator
+
+SET_BASE_URI = 7
+
+
+@pytest.fixture(scope="module")
+def gov_trophy(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 0", "0xabc", [accounts[2], accounts[5]], ["Hannes", "Pascal"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+    yield gov
+
+
+def test_proposal_events(gov_trophy, accounts):
+    tx = gov_trophy.setBaseURI("https://cif.unibas.ch/", {'from': accounts[3]})
+    assert tx.events["Submission"]["transactionId"] == 1
+    assert tx.events["ProposalSubmitted"]["transactionId"] == 1
+    assert tx.events["ProposalSubmitted"]["txnType"] == 7
+    assert tx.events["ProposalSubmitted"]["proposer"] == accounts[3]
+
+    tx = gov_trophy.confirmTransaction(1, {'from': accounts[0]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert tx.events["ProposalExecuted"]["transactionId"] == 1
+    assert tx.events["ProposalExecuted"]["txnType"] == 7
+
+
+def test_relayed_proposer(gov_trophy, accounts, chain):
+    aggregator = SignatureAggregator(gov_trophy, SET_BASE_URI, ("https://cif.unibas.ch/",), chain.time() + 3600)
+    for member in accounts[1:3]:
+        aggregator.sign(member)
+    tx = gov_trophy.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[9]})
+    # The relayer submits, the signers only confirm
+    assert tx.events["ProposalSubmitted"]["proposer"] == accounts[9]
+    assert [event["sender"] for event in tx.events["Confirmation"]] == accounts[1:3]
+
+
+@pytest.mark.parametrize("variant", ["cif", "lean_cif"])
+def test_winner_minted_before_transfer(request, deployer, accounts, variant):
+    trophy = request.getfixturevalue(variant)
+    winners = [accounts[1], accounts[1], accounts[2]]
+    tx = trophy.passTrophy("Tournament 1", "0xabc", winners, ["Jonas", "Daniel", "Hannes"], {'from': deployer})
+    minted, transferred = {}, {}
+    for event in tx.events:
+        if event.name == "WinnerMinted":
+            minted[event["tokenId"]] = event.pos[0]
+        elif event.name == "Transfer":
+            transferred[event["tokenId"]] = event.pos[0]
+        elif event.name == "ConsecutiveTransfer":
+            for token_id in range(event["fromTokenId"], event["toTokenId"] + 1):
+                transferred[token_id] = event.pos[0]
+    # The indexer can only move tokens that it has seen minted
+    assert sorted(minted) == sorted(transferred) == [1, 2, 3]
+    assert all(minted[token_id] < transferred[token_id] for token_id in minted)
+
+
+def test_history_from_logs_only(web3, rpc_methods, gov_trophy, cif, accounts):
+    gov = gov_trophy
+    indexer = Indexer(web3, cif, gov, start_block=gov.tx.block_number)
+    # Reading the initial members and quorum are the only calls
+    indexer.sync()
+    rpc_methods.clear()
+
+    proposers = {}
+    gov.passTrophy("Tournament 1", "0xa1b2", [accounts[6], accounts[7]], ["Jonas", "Daniel"], {'from': accounts[0]})
+    proposers[1] = accounts[0]
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    tree, claims = claim_tree([accounts[8], accounts[9]], ["Miguel", "Markus"])
+    gov.passTrophyByClaim("Tournament 2", "0x" + "ab" * 32, tree.root, 2, {'from': accounts[1]})
+    proposers[2] = accounts[1]
+    gov.confirmTransaction(2, {'from': accounts[2]})
+    cif.claim(3, *claims[1], {'from': accounts[4]})
+    gov.setBaseURI("https://cif.unibas.ch/", {'from': accounts[3]})
+    proposers[3] = accounts[3]
+    cif.transferFrom(accounts[6], accounts[5], 3, {'from': accounts[6]})
+
+    indexer.sync()
+    assert "eth_call" not in rpc_methods
+
+    for trophy_id in range(1, 4):
+        tournament, info_hash = cif.trophies(trophy_id)[:2]
+        assert indexer.trophy(trophy_id) == (tournament, info_hash, 2)
+    for index in range(cif.totalSupply()):
+        token_id = cif.tokenByIndex(index)
+        assert (indexer.trophy_of(token_id), indexer.winner_name(token_id)) == cif.winners(token_id)
+        assert indexer.holder_of(token_id) == cif.ownerOf(token_id)
+    assert indexer.tokens_of(accounts[9]) == [6]
+
+    for transaction_id, proposer in proposers.items():
+        assert indexer.proposer(transaction_id) == proposer
+        assert indexer.transaction_type(transaction_id) == gov.transactions(transaction_id)[0]
+    assert indexer.transaction_ids("executed") == [1, 2]
+    assert indexer.transaction_ids("pending") == [3]
@@ -0,0 +1,26 @@
+import brownie
+
+SET_TROPHY_URI = 11
+
+
+def test_set_trophy_uri(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0], accounts[1]], ["Jonas", "Daniel"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+
+    tx = gov.setTrophyURI(1, "ipfs://results/tour-1", {'from': accounts[0]})
+    assert tx.return_value == 1
+    assert gov.transactions(1)[0] == SET_TROPHY_URI
+    assert gov.trophyURIPayloads(1) == (1, "ipfs://results/tour-1")
+    assert cif.tokenURI(1) == ""
+
+    tx = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert cif.tokenURI(1) == "ipfs://results/tour-1"
+    assert cif.tokenURI(2) == "ipfs://results/tour-1"
+
+
+def test_set_trophy_uri_reverts(gov, cif, deployer, accounts):
+    with brownie.reverts("Gov: caller is not a member"):
+        gov.setTrophyURI(1, "foo", {'from': accounts[9]})
+    with brownie.reverts("Gov: trophy does not exist"):
+        gov.setTrophyURI(1, "foo", {'from': accounts[0]})
@@ -0,0 +1,144 @@
+import brownie
+import pytest
+
+from helpers.signatures import SignatureAggregator, sign_digest
+
+PASS_TROPHY = 4
+CHANGE_QUORUM = 6
+PASS_TROPHY_COMMITTED = 10
+
+
+@pytest.fixture(scope="module")
+def signers(accounts):
+    yield [accounts.add() for _ in range(30)]
+
+
+@pytest.fixture(scope="module")
+def signed_gov(CifGovernance, cif, gov_deployer, signers):
+    yield gov_deployer.deploy(CifGovernance, cif, 50, signers)
+
+
+def deadline():
+    return brownie.chain.time() + 3600
+
+
+def test_pass_trophy_with_signatures(signed_gov, cif, deployer, signers, accounts):
+    cif.transferOwnership(signed_gov, {'from': deployer})
+    assert signed_gov.requiredVotes() == 15
+    args = ("Tournament 1", "0x" + "ab" * 32, [accounts[1], accounts[2]], ["Daniel", "Hannes"])
+    aggregator = SignatureAggregator(signed_gov, PASS_TROPHY, args, deadline(), current_trophy_id=0)
+    for signer in signers[10:25]:
+        aggregator.sign(signer)
+    assert aggregator.nonce == 0
+    assert signed_gov.proposalDigest(PASS_TROPHY, aggregator.payload, 0, aggregator.deadline) == (
+        "0x" + aggregator.digest.hex()
+    )
+
+    # A non-member relays the proposal, it executes in the same transaction
+    tx = signed_gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[9]})
+    assert tx.return_value == 1
+    assert tx.events["Submission"]["transactionId"] == 1
+    assert [e["sender"] for e in tx.events["Confirmation"]] == signers[10:25]
+    assert tx.events["Execution"]["transactionId"] == 1
+    assert tx.events["TrophyPassed"]["trophyId"] == 1
+    assert signed_gov.getConfirmationCount(1) == 15
+    assert signed_gov.confirmations(1, signers[10])
+    assert not signed_gov.confirmations(1, signers[9])
+    assert signed_gov.passTrophyPayloads(1)[1] == ""  # deleted on execution
+    assert cif.currentTrophy()[3] == ("Daniel", "Hannes")
+    assert signed_gov.proposalNonce() == 1
+
+    with brownie.reverts("Gov: invalid nonce"):
+        signed_gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[9]})
+
+    # Signatures for the previous trophy don't match the current trophy id anymore
+    stale = SignatureAggregator(signed_gov, PASS_TROPHY, args, deadline(), current_trophy_id=0)
+    for signer in signers[10:25]:
+        stale.sign(signer)
+    with brownie.reverts("Gov: signer is not a member"):
+        signed_gov.submitTransactionWithSignatures(*stale.submission_args(), {'from': accounts[9]})
+
+
+def test_change_quorum_with_signatures(signed_gov, signers, accounts):
+    aggregator = SignatureAggregator(signed_gov, CHANGE_QUORUM, (75,), deadline())
+    for signer in signers[:15]:
+        aggregator.sign(signer)
+    aggregator.sign(signers[0])  # signing twice keeps a single signature
+
+    tx = signed_gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[0]})
+    assert tx.events["QuorumChange"]["newQuorum"] == 75
+    assert signed_gov.requiredVotes() == 23
+    assert signed_gov.getTransactionIdCount(False) == 0
+
+    # The next decision needs more signatures
+    aggregator = SignatureAggregator(signed_gov, CHANGE_QUORUM, (50,), deadline())
+    assert aggregator.nonce == 1
+    for signer in signers[:22]:
+        aggregator.sign(signer)
+    with brownie.reverts("Gov: not enough signatures"):
+        signed_gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[0]})
+    aggregator.sign(signers[29])
+    signed_gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[0]})
+    assert signed_gov.quorum() == 50
+
+
+def test_signature_reverts(signed_gov, signers, accounts):
+    aggregator = SignatureAggregator(signed_gov, CHANGE_QUORUM, (75,), deadline())
+    for signer in signers[:15]:
+        aggregator.sign(signer)
+    txn_type, payload, nonce, valid_until, signatures = aggregator.submission_args()
+
+    with brownie.reverts("Gov: duplicate signature"):
+        signed_gov.submitTransactionWithSignatures(
+            txn_type, payload, nonce, valid_until, signatures[:14] + [signatures[0]], {'from': accounts[0]}
+        )
+    outsider = accounts.add()
+    with brownie.reverts("Gov: signer is not a member"):
+        signed_gov.submitTransactionWithSignatures(
+            txn_type, payload, nonce, valid_until,
+            signatures[:14] + [sign_digest(outsider.private_key, aggregator.digest)], {'from': accounts[0]},
+        )
+    # Signatures are bound to the payload, the nonce and the deadline
+    with brownie.reverts("Gov: signer is not a member"):
+        signed_gov.submitTransactionWithSignatures(
+            txn_type, payload[:-1] + b"\x64", nonce, valid_until, signatures, {'from': accounts[0]}
+        )
+    with brownie.reverts("Gov: signer is not a member"):
+        signed_gov.submitTransactionWithSignatures(
+            txn_type, payload, nonce, valid_until + 1, signatures, {'from': accounts[0]}
+        )
+    with brownie.reverts("Gov: invalid nonce"):
+        signed_gov.submitTransactionWithSignatures(
+            txn_type, payload, nonce + 1, valid_until, signatures, {'from': accounts[0]}
+        )
+    with brownie.reverts("Gov: transaction type can't be signed"):
+        signed_gov.submitTransactionWithSignatures(
+            PASS_TROPHY_COMMITTED, payload, nonce, valid_until, signatures, {'from': accounts[0]}
+        )
+    with pytest.raises(ValueError, match="trophy passes are signed for the current trophy id"):
+        SignatureAggregator(signed_gov, PASS_TROPHY, ("Tournament 1", "0xab", [], []), valid_until)
+    invalid = SignatureAggregator(signed_gov, CHANGE_QUORUM, (101,), valid_until)
+    with brownie.reverts("Gov: new quorum must be between 0 and 100"):
+        signed_gov.submitTransactionWithSignatures(*invalid.submission_args(), {'from': accounts[0]})
+
+    signed_gov.submitTransactionWithSignatures(txn_type, payload, nonce, valid_until, signatures, {'from': accounts[0]})
+    assert signed_gov.quorum() == 75
+
+    expiring = SignatureAggregator(signed_gov, CHANGE_QUORUM, (50,), brownie.chain.time() + 60)
+    for signer in signers[:23]:
+        expiring.sign(signer)
+    brownie.chain.sleep(120)
+    with brownie.reverts("Gov: signatures expired"):
+        signed_gov.submitTransactionWithSignatures(*expiring.submission_args(), {'from': accounts[0]})
+
+
+def test_signatures_without_quorum(CifGovernance, cif, gov_deployer, signers, accounts):
+    # Even without a quorum, a relayer needs the signature of a member
+    gov = gov_deployer.deploy(CifGovernance, cif, 0, signers)
+    assert gov.requiredVotes() == 0
+    aggregator = SignatureAggregator(gov, CHANGE_QUORUM, (50,), deadline())
+    with brownie.reverts("Gov: not enough signatures"):
+        gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[9]})
+    aggregator.sign(signers[0])
+    gov.submitTransactionWithSignatures(*aggregator.submission_args(), {'from': accounts[9]})
+    assert gov.quorum() == 50
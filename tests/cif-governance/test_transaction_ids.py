@@ -0,0 +1,66 @@
+def test_transaction_ids_paginated(gov, accounts):
+    for _ in range(5):
+        gov.changeQuorum(50, {'from': accounts[0]})
+    assert gov.getTransactionIdCount(False) == 5
+    assert gov.getTransactionIdCount(True) == 0
+    assert gov.getPendingTransactionIds(0, 10) == [1, 2, 3, 4, 5]
+    assert gov.getPendingTransactionIds(1, 2) == [2, 3]
+    assert gov.getPendingTransactionIds(4, 10) == [5]
+    assert gov.getPendingTransactionIds(5, 10) == []
+    assert gov.getPendingTransactionIds(0, 0) == []
+
+    # Executing unlinks the id, the remaining ids keep their order
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    gov.confirmTransaction(4, {'from': accounts[1]})
+    assert gov.getTransactionIdCount(False) == 3
+    assert gov.getTransactionIdCount(True) == 2
+    assert gov.getPendingTransactionIds(0, 10) == [1, 3, 5]
+    assert gov.getPendingTransactionIds(1, 1) == [3]
+    assert gov.getTransactionIds(True, 0, 10) == [2, 4]
+    assert gov.getTransactionIds(True, 1, 1) == [4]
+    assert gov.getTransactionIds(False, 0, 10) == gov.getPendingTransactionIds(0, 10)
+
+    # Emptying the list and submitting again links the new id as the first one
+    for transaction_id in (1, 3, 5):
+        gov.confirmTransaction(transaction_id, {'from': accounts[1]})
+    assert gov.getPendingTransactionIds(0, 10) == []
+    gov.changeQuorum(50, {'from': accounts[0]})
+    assert gov.getPendingTransactionIds(0, 10) == [6]
+    assert gov.getTransactionIdCount(False) == 1
+
+
+def test_pages_while_executing(gov, accounts):
+    for _ in range(6):
+        gov.changeQuorum(50, {'from': accounts[0]})
+    first = gov.getPendingTransactionIds(0, 3)
+    assert first == [1, 2, 3]
+
+    # Executing an id of the first page moves the next page one position down
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert gov.getPendingTransactionIds(3, 3) == [5, 6]
+
+    # Overlapping the pages and dropping the ids already seen skips nothing
+    overlap = gov.getPendingTransactionIds(2, 4)
+    assert overlap == [4, 5, 6]
+    seen = first + [i for i in overlap if i > first[-1]]
+    assert [i for i in seen if i != 2] == gov.getTransactionIds(False)
+
+
+def test_transaction_ids_wrapper(gov, accounts):
+    for _ in range(3):
+        gov.changeQuorum(50, {'from': accounts[0]})
+    gov.confirmTransaction(3, {'from': accounts[1]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+
+    # Executed ids are sorted by id, the paginated view lists them in order of execution
+    assert gov.getTransactionIds(True) == [1, 3]
+    assert gov.getTransactionIds(True, 0, 100) == [3, 1]
+    assert gov.getTransactionIds(False) == [2]
+
+    for _ in range(3):
+        gov.changeQuorum(50, {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert gov.getPendingTransactionIds(0, 100) == [4, 5, 6]
+    assert gov.getTransactionIds(False) == [4, 5, 6]
+    assert gov.getTransactionIds(True) == [1, 2, 3]
+    assert gov.getTransactionIds(True, 0, 100) == [3, 1, 2]
@@ -0,0 +1,118 @@
+import brownie
+
+from helpers.merkle import claim_tree
+from helpers.winners import filler_addresses
+
+PASS_TROPHY_BY_CLAIM = 8
+
+
+def test_claim_many(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0]], ["Jonas"], {'from': deployer})
+
+    n_winners = 300
+    addresses = filler_addresses(n_winners)
+    names = [f"Player {i}" for i in range(n_winners)]
+    tree, claims = claim_tree(addresses, names)
+    tx = cif.passTrophyByClaim("Tournament 2", "0xdef", tree.root, n_winners, {'from': deployer})
+    assert tx.events["TrophyPassed"]["trophyId"] == 2
+    assert "Transfer" not in tx.events
+    assert cif.currentTrophyId() == 2
+    assert cif.trophyClaims(2) == (tree.root, 2, n_winners)  # root, first token id, token count
+    assert cif.currentTrophy()[3] == ()
+    assert cif.totalSupply() == 1
+
+    # Anybody can submit the claims
+    for index, address, name, proof in claims:
+        cif.claim(2, index, address, name, proof, {'from': accounts[5]})
+
+    assert cif.totalSupply() == n_winners + 1
+    info = cif.currentTrophy()
+    assert info[3] == tuple(names)
+    assert info[4] == tuple(range(2, n_winners + 2))
+    for i in [0, 1, 150, 299]:
+        assert cif.ownerOf(i + 2) == addresses[i]
+        assert cif.winners(i + 2) == (2, names[i])
+        assert cif.hasAddressCurrentTrophy(addresses[i])
+    assert not cif.hasAddressCurrentTrophy(accounts[0])
+
+    # The next trophy continues after the reserved token ids
+    cif.passTrophy("Tournament 3", "0x123", [accounts[1]], ["Daniel"], {'from': deployer})
+    assert cif.ownerOf(n_winners + 2) == accounts[1]
+
+
+def test_unclaimed_tokens(cif, deployer, accounts):
+    addresses = [accounts[1], accounts[2], accounts[3]]
+    names = ["Jonas", "Daniel", "Hannes"]
+    tree, claims = claim_tree(addresses, names)
+    cif.passTrophyByClaim("Tournament 1", "0xabc", tree.root, 3, {'from': deployer})
+
+    assert not cif.hasAddressCurrentTrophy(accounts[1])
+    with brownie.reverts("Cif: token does not exist"):
+        cif.getInfoByTokenId(1)
+
+    index, address, name, proof = claims[1]
+    cif.claim(1, index, address, name, proof, {'from': accounts[2]})
+    assert cif.hasAddressCurrentTrophy(accounts[2])
+    assert not cif.hasAddressCurrentTrophy(accounts[1])
+    assert cif.getInfoByTokenId(2)[3] == ("Daniel",)
+    assert cif.getInfoByTrophyId(1)[4] == (2,)
+
+
+def test_claim_reverts(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0]], ["Jonas"], {'from': deployer})
+    tree, claims = claim_tree([accounts[1], accounts[2]], ["Daniel", "Hannes"])
+    cif.passTrophyByClaim("Tournament 2", "0xdef", tree.root, 2, {'from': deployer})
+    index, address, name, proof = claims[0]
+
+    with brownie.reverts("Ownable: caller is not the owner"):
+        cif.passTrophyByClaim("Tournament 3", "0xdef", tree.root, 2, {'from': accounts[0]})
+    with brownie.reverts("Cif: claim root is empty"):
+        cif.passTrophyByClaim("Tournament 3", "0xdef", "0x0", 2, {'from': deployer})
+    # Token ids 1 to 3 are taken, reserved ids must fit in 32 bits
+    with brownie.reverts("Cif: number of winners out of range"):
+        cif.passTrophyByClaim("Tournament 3", "0xdef", tree.root, 0, {'from': deployer})
+    with brownie.reverts("Cif: number of winners out of range"):
+        cif.passTrophyByClaim("Tournament 3", "0xdef", tree.root, 2**32 - 3, {'from': deployer})
+    with brownie.reverts("Cif: number of winners out of range"):
+        cif.passTrophyByClaim("Tournament 3", "0xdef", tree.root, 2**256 - 1, {'from': deployer})
+    cif.passTrophyByClaim("Tournament 3", "0xdef", tree.root, 2**32 - 4, {'from': deployer})
+    assert cif.trophyClaims(3)[1:] == (4, 2**32 - 4)
+    with brownie.reverts("Cif: number of winners out of range"):
+        cif.passTrophyByClaim("Tournament 4", "0xdef", tree.root, 1, {'from': deployer})
+    with brownie.reverts("SafeCast: value doesn't fit in 32 bits"):
+        cif.passTrophy("Tournament 4", "0xdef", [accounts[1]], ["Daniel"], {'from': deployer})
+    with brownie.reverts("Cif: trophy has no claimable tokens"):
+        cif.claim(1, index, address, name, proof, {'from': accounts[1]})
+    with brownie.reverts("Cif: claim index out of range"):
+        cif.claim(2, 2, address, name, proof, {'from': accounts[1]})
+    with brownie.reverts("Cif: invalid claim proof"):
+        cif.claim(2, index, accounts[3], name, proof, {'from': accounts[1]})
+    with brownie.reverts("Cif: invalid claim proof"):
+        cif.claim(2, index, address, "Someone Else", proof, {'from': accounts[1]})
+
+    cif.claim(2, index, address, name, proof, {'from': accounts[1]})
+    with brownie.reverts("Cif: token already claimed"):
+        cif.claim(2, index, address, name, proof, {'from': accounts[1]})
+
+
+def test_pass_trophy_by_claim_gov(gov, cif, deployer, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    tree, claims = claim_tree([accounts[5], accounts[6]], ["Pascal", "Miguel"])
+    tx = gov.passTrophyByClaim("Tournament 1", "0xabc", tree.root, 2, {'from': accounts[0]})
+    assert gov.transactions(1)[0] == PASS_TROPHY_BY_CLAIM
+    payload = gov.trophyCommitmentPayloads(1)
+    assert payload[0] == 0
+    assert payload[3] == tree.root
+    assert payload[4] == 2
+
+    tx = gov.confirmTransaction(1, {'from': accounts[1]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 1
+    for index, address, name, proof in claims:
+        cif.claim(1, index, address, name, proof, {'from': address})
+    assert cif.ownerOf(2) == accounts[6]
+
+    # A claimed token lets the holder pass the trophy without a vote
+    gov.addMember(accounts[5], {'from': accounts[0]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    tx = gov.passTrophy("Tournament 2", "0xdef", [accounts[0]], ["Jonas"], {'from': accounts[5]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 2
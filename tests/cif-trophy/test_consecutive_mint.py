@@ -0,0 +1,56 @@
+import brownie
+
+
+def test_consecutive_runs(lean_cif, deployer, accounts):
+    team, player = accounts[1], accounts[2]
+    winners = [team, team, team, team, player, team, team]
+    names = [f"Player {i}" for i in range(len(winners))]
+    tx = lean_cif.passTrophy("Tournament 1", "0xabc", winners, names, {'from': deployer})
+
+    # One event per run of equal addresses
+    assert [list(e.values()) for e in tx.events["ConsecutiveTransfer"]] == [
+        [1, 4, "0x" + "00" * 20, team],
+        [6, 7, "0x" + "00" * 20, team],
+    ]
+    assert list(tx.events["Transfer"].values()) == ["0x" + "00" * 20, player, 5]
+
+    assert lean_cif.totalSupply() == 7
+    assert lean_cif.balanceOf(team) == 6
+    assert [lean_cif.ownerOf(i) for i in range(1, 8)] == winners
+    assert lean_cif.currentTrophy()[3] == tuple(names)
+    assert all(lean_cif.winners(i) == (1, names[i - 1]) for i in range(1, 8))
+
+
+def test_partial_transfer_inside_run(lean_cif, deployer, accounts):
+    team = accounts[1]
+    lean_cif.passTrophy("Tournament 1", "0xabc", [team] * 5, ["A", "B", "C", "D", "E"], {'from': deployer})
+    lean_cif.passTrophy("Tournament 2", "0xdef", [accounts[3]], ["F"], {'from': deployer})
+
+    lean_cif.transferFrom(team, accounts[2], 3, {'from': team})
+    assert [lean_cif.ownerOf(i) for i in range(1, 7)] == [team, team, accounts[2], team, team, accounts[3]]
+    assert lean_cif.balanceOf(team) == 4
+    assert lean_cif.balanceOf(accounts[2]) == 1
+    assert lean_cif.holdsTrophy(accounts[2], 1)
+    assert lean_cif.holdsTrophy(team, 1)
+    assert lean_cif.winners(4) == (1, "D")
+    assert [lean_cif.tokenOfOwnerByIndex(team, i) for i in range(4)] == [1, 2, 4, 5]
+
+    # Transfer the last token of the run and the first token after it
+    lean_cif.transferFrom(team, accounts[2], 5, {'from': team})
+    lean_cif.transferFrom(accounts[3], accounts[2], 6, {'from': accounts[3]})
+    assert lean_cif.hasAddressCurrentTrophy(accounts[2])
+    assert not lean_cif.hasAddressCurrentTrophy(accounts[3])
+    assert [lean_cif.ownerOf(i) for i in range(1, 7)] == [team, team, accounts[2], team, accounts[2], accounts[2]]
+
+    # Giving away the whole run
+    for token_id in [1, 2, 4]:
+        lean_cif.transferFrom(team, accounts[4], token_id, {'from': team})
+    assert lean_cif.balanceOf(team) == 0
+    assert not lean_cif.holdsTrophy(team, 1)
+    assert lean_cif.getInfoByTokenId(4)[1] == 1
+
+
+def test_consecutive_mint_to_contract(lean_cif, gov, deployer, accounts):
+    # The receiver check still runs for every token minted to a contract
+    with brownie.reverts("ERC721: transfer to non ERC721Receiver implementer"):
+        lean_cif.passTrophy("Tournament 1", "0xabc", [gov, gov], ["A", "B"], {'from': deployer})
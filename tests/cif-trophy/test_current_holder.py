@@ -0,0 +1,46 @@
+def test_holder_after_transfer(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0], accounts[1]], ["Jonas", "Daniel"], {'from': deployer})
+    assert cif.hasAddressCurrentTrophy(accounts[0])
+    assert cif.hasAddressCurrentTrophy(accounts[1])
+    assert not cif.hasAddressCurrentTrophy(accounts[5])
+
+    cif.transferFrom(accounts[0], accounts[5], 1, {'from': accounts[0]})
+    assert not cif.hasAddressCurrentTrophy(accounts[0])
+    assert cif.hasAddressCurrentTrophy(accounts[5])
+
+    # Holding two tokens of the current trophy and giving one away
+    cif.transferFrom(accounts[1], accounts[5], 2, {'from': accounts[1]})
+    assert not cif.hasAddressCurrentTrophy(accounts[1])
+    cif.safeTransferFrom(accounts[5], accounts[1], 2, {'from': accounts[5]})
+    assert cif.hasAddressCurrentTrophy(accounts[5])
+    assert cif.hasAddressCurrentTrophy(accounts[1])
+
+
+def test_holder_of_previous_trophy(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0]], ["Jonas"], {'from': deployer})
+    cif.passTrophy("Tournament 2", "0xdef", [accounts[1]], ["Daniel"], {'from': deployer})
+    assert not cif.hasAddressCurrentTrophy(accounts[0])
+
+    # Receiving a token of an old trophy does not make the receiver a current holder
+    cif.transferFrom(accounts[0], accounts[5], 1, {'from': accounts[0]})
+    assert not cif.hasAddressCurrentTrophy(accounts[5])
+    cif.transferFrom(accounts[1], accounts[5], 2, {'from': accounts[1]})
+    assert cif.hasAddressCurrentTrophy(accounts[5])
+    assert not cif.hasAddressCurrentTrophy(accounts[1])
+
+
+def test_governance_pass_after_transfer(gov, cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[2], accounts[8]], ["Daniel", "Markus"], {'from': deployer})
+    cif.transferOwnership(gov, {'from': deployer})
+
+    # The original winner gave the token to another member
+    cif.transferFrom(accounts[2], accounts[3], 1, {'from': accounts[2]})
+    tx = gov.passTrophy("Tournament 2", "0xdef", [accounts[0]], ["Pascal"], {'from': accounts[2]})
+    assert "TrophyPassed" not in tx.events
+    assert gov.transactionCount() == 1
+
+    tx = gov.passTrophy("Tournament 2", "0xdef", [accounts[0]], ["Pascal"], {'from': accounts[3]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 2
+    assert gov.transactionCount() == 1
+    assert cif.hasAddressCurrentTrophy(accounts[0])
+    assert not cif.hasAddressCurrentTrophy(accounts[3])
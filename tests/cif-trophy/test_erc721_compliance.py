@@ -0,0 +1,109 @@
+import brownie
+import pytest
+
+ZERO_ADDRESS = "0x" + "00" * 20
+INTERFACE_IDS = {
+    "ERC165": "0x01ffc9a7",
+    "ERC721": "0x80ac58cd",
+    "ERC721Metadata": "0x5b5e139f",
+    "ERC721Enumerable": "0x780e9d63",
+}
+
+
+@pytest.fixture(scope="module", params=["cif", "lean_cif"])
+def trophy(request, deployer, accounts):
+    trophy = request.getfixturevalue(request.param)
+    trophy.passTrophy("Tournament 1", "0xabc", [accounts[0], accounts[1]], ["Jonas", "Daniel"], {'from': deployer})
+    trophy.passTrophy("Tournament 2", "0xdef", [accounts[1], accounts[2]], ["Daniel", "Hannes"], {'from': deployer})
+    yield trophy
+
+
+def test_interfaces(trophy):
+    assert trophy.name() == "CIF ESports Trophy"
+    assert trophy.symbol() == "CIF"
+    for interface_id in INTERFACE_IDS.values():
+        assert trophy.supportsInterface(interface_id)
+    assert not trophy.supportsInterface("0xffffffff")
+
+
+def test_enumeration(trophy, accounts):
+    assert trophy.totalSupply() == 4
+    assert [trophy.tokenByIndex(i) for i in range(4)] == [1, 2, 3, 4]
+    assert trophy.balanceOf(accounts[1]) == 2
+    assert sorted(trophy.tokenOfOwnerByIndex(accounts[1], i) for i in range(2)) == [2, 3]
+    assert [trophy.ownerOf(i) for i in range(1, 5)] == [accounts[0], accounts[1], accounts[1], accounts[2]]
+    assert trophy.winners(3) == (2, "Daniel")
+    assert trophy.getInfoByTokenId(4)[3] == ("Daniel", "Hannes")
+    assert trophy.hasAddressCurrentTrophy(accounts[2])
+    assert not trophy.hasAddressCurrentTrophy(accounts[0])
+
+    with brownie.reverts():
+        trophy.tokenByIndex(4)
+    with brownie.reverts():
+        trophy.tokenOfOwnerByIndex(accounts[1], 2)
+    with brownie.reverts("ERC721: owner query for nonexistent token"):
+        trophy.ownerOf(5)
+    with brownie.reverts("ERC721: balance query for the zero address"):
+        trophy.balanceOf(ZERO_ADDRESS)
+
+
+def test_transfers(trophy, accounts):
+    tx = trophy.transferFrom(accounts[1], accounts[3], 2, {'from': accounts[1]})
+    assert list(tx.events["Transfer"].values()) == [accounts[1], accounts[3], 2]
+    assert trophy.ownerOf(2) == accounts[3]
+    assert trophy.balanceOf(accounts[1]) == 1
+    assert trophy.tokenOfOwnerByIndex(accounts[3], 0) == 2
+    assert trophy.holdsTrophy(accounts[3], 1)
+    assert not trophy.holdsTrophy(accounts[1], 1)
+
+    # Approved address
+    tx = trophy.approve(accounts[4], 3, {'from': accounts[1]})
+    assert list(tx.events["Approval"].values()) == [accounts[1], accounts[4], 3]
+    assert trophy.getApproved(3) == accounts[4]
+    trophy.transferFrom(accounts[1], accounts[5], 3, {'from': accounts[4]})
+    assert trophy.getApproved(3) == ZERO_ADDRESS
+    assert trophy.ownerOf(3) == accounts[5]
+    assert trophy.hasAddressCurrentTrophy(accounts[5])
+
+    # Operator
+    tx = trophy.setApprovalForAll(accounts[6], True, {'from': accounts[5]})
+    assert list(tx.events["ApprovalForAll"].values()) == [accounts[5], accounts[6], True]
+    assert trophy.isApprovedForAll(accounts[5], accounts[6])
+    trophy.safeTransferFrom(accounts[5], accounts[7], 3, {'from': accounts[6]})
+    assert trophy.ownerOf(3) == accounts[7]
+    assert trophy.totalSupply() == 4
+
+
+def test_transfer_reverts(trophy, gov, accounts):
+    with brownie.reverts("ERC721: transfer caller is not owner nor approved"):
+        trophy.transferFrom(accounts[0], accounts[3], 1, {'from': accounts[3]})
+    with brownie.reverts("ERC721: transfer of token that is not own"):
+        trophy.transferFrom(accounts[1], accounts[3], 1, {'from': accounts[0]})
+    with brownie.reverts("ERC721: transfer to the zero address"):
+        trophy.transferFrom(accounts[0], ZERO_ADDRESS, 1, {'from': accounts[0]})
+    with brownie.reverts("ERC721: approval to current owner"):
+        trophy.approve(accounts[0], 1, {'from': accounts[0]})
+    with brownie.reverts("ERC721: approve caller is not owner nor approved for all"):
+        trophy.approve(accounts[3], 1, {'from': accounts[3]})
+    with brownie.reverts("ERC721: approve to caller"):
+        trophy.setApprovalForAll(accounts[0], True, {'from': accounts[0]})
+
+    # The governance contract does not implement onERC721Received
+    with brownie.reverts("ERC721: transfer to non ERC721Receiver implementer"):
+        trophy.safeTransferFrom(accounts[0], gov, 1, {'from': accounts[0]})
+    trophy.transferFrom(accounts[0], gov, 1, {'from': accounts[0]})
+    assert trophy.ownerOf(1) == gov
+
+
+def test_metadata(trophy, deployer):
+    trophy.setTokenURI(2, "tour-1/2", {'from': deployer})
+    assert trophy.tokenURI(2) == "tour-1/2"
+    assert trophy.tokenURI(1) == ""
+
+    trophy.setBaseURI("http://example.com/", {'from': deployer})
+    assert trophy.baseURI() == "http://example.com/"
+    assert trophy.tokenURI(1) == "http://example.com/1"
+    assert trophy.tokenURI(2) == "http://example.com/tour-1/2"
+
+    with brownie.reverts("ERC721Metadata: URI query for nonexistent token"):
+        trophy.tokenURI(5)
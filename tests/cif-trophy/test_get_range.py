@@ -0,0 +1,71 @@
+import brownie
+
+from helpers.merkle import claim_tree
+
+
+def pass_trophies(cif, deployer, accounts, n_trophies):
+    for i in range(n_trophies):
+        winners = [accounts[(i + j) % 10] for j in range(i % 3 + 1)]
+        names = [f"Player {i}-{j}" for j in range(len(winners))]
+        cif.passTrophy(f"Tournament {i + 1}", "0x" + f"{i:064x}", winners, names, {'from': deployer})
+
+
+def test_trophies_range(cif, deployer, accounts):
+    assert cif.getTrophiesRange(1, 10) == []
+    pass_trophies(cif, deployer, accounts, 7)
+
+    expected = [tuple(cif.getInfoByTrophyId(i)) for i in range(1, 8)]
+    assert [tuple(t) for t in cif.getTrophiesRange(1, 7)] == expected
+    assert [tuple(t) for t in cif.getTrophiesRange(3, 2)] == expected[2:4]
+    assert [tuple(t) for t in cif.getTrophiesRange(5, 100)] == expected[4:]
+    assert cif.getTrophiesRange(8, 10) == []
+    assert cif.getTrophiesRange(2, 0) == []
+
+    # The last trophy of a page is passed on when the first trophy of the next page was received
+    page = cif.getTrophiesRange(2, 2)
+    assert page[1][6] == cif.getTrophiesRange(4, 1)[0][5]
+    assert cif.getTrophiesRange(7, 1)[0][6] == 0
+
+    with brownie.reverts("Cif: trophy does not exist"):
+        cif.getTrophiesRange(0, 1)
+
+
+def test_winners_range(cif, deployer, accounts):
+    pass_trophies(cif, deployer, accounts, 3)
+    cif.transferFrom(accounts[1], accounts[8], 2, {'from': accounts[1]})
+
+    winners = cif.getWinnersRange(1, 100)
+    assert len(winners) == 6
+    for token_id, trophy_id, holder, name in winners:
+        assert (trophy_id, name) == cif.winners(token_id)
+        assert holder == cif.ownerOf(token_id)
+    assert winners[1] == (2, 2, accounts[8], "Player 1-0")
+    assert [w[0] for w in winners] == list(range(1, 7))
+    assert cif.getWinnersRange(3, 2) == winners[2:4]
+    assert cif.getWinnersRange(7, 1) == []
+
+    with brownie.reverts("Cif: token does not exist"):
+        cif.getWinnersRange(0, 1)
+
+
+def test_winners_range_partially_claimed(cif, deployer, accounts):
+    pass_trophies(cif, deployer, accounts, 3)
+    names = ["Pascal", "Miguel", "Jonas", "Daniel"]
+    tree, claims = claim_tree([accounts[4], accounts[5], accounts[6], accounts[7]], names)
+    cif.passTrophyByClaim("Tournament 4", "0x" + "ab" * 32, tree.root, 4, {'from': deployer})
+    # Token ids 7 to 10 are reserved, 8 and 10 are claimed
+    cif.claim(4, *claims[3], {'from': accounts[7]})
+    cif.claim(4, *claims[1], {'from': accounts[5]})
+
+    winners = cif.getWinnersRange(1, 100)
+    assert [w[0] for w in winners] == [1, 2, 3, 4, 5, 6, 8, 10]
+    assert winners[6] == (8, 4, accounts[5], "Miguel")
+    assert winners[7] == (10, 4, accounts[7], "Daniel")
+
+    # Pages cover token ids, unclaimed ids leave them shorter
+    assert cif.getWinnersRange(6, 3) == [winners[5], winners[6]]
+    assert cif.getWinnersRange(7, 1) == []
+    assert cif.getWinnersRange(9, 2) == [winners[7]]
+
+    cif.claim(4, *claims[0], {'from': accounts[4]})
+    assert cif.getWinnersRange(7, 1) == [(7, 4, accounts[4], "Pascal")]
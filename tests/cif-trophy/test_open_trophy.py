@@ -0,0 +1,225 @@
+import brownie
+
+from helpers.roster import roster_batches
+from helpers.winners import filler_addresses
+
+OPEN_TROPHY = 9
+CANCEL_OPEN_TROPHY = 12
+
+
+def test_open_trophy_in_chunks(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0]], ["Jonas"], {'from': deployer})
+
+    n_winners = 1000
+    addresses = filler_addresses(n_winners)
+    names = [f"Player {i}" for i in range(n_winners)]
+    roster_hash, batches = roster_batches(addresses, names, 50)
+    assert len(batches) == 20
+
+    tx = cif.openTrophy("Tournament 2", "0xdef", roster_hash, {'from': deployer})
+    assert "TrophyPassed" not in tx.events
+    assert cif.openTrophyId() == 2
+    assert cif.currentTrophyId() == 1
+
+    # Anybody can push the batches, the trophy only becomes current on finalize
+    for batch_addresses, batch_names, next_hash in batches:
+        cif.appendWinners(batch_addresses, batch_names, next_hash, {'from': accounts[5]})
+        assert cif.currentTrophyId() == 1
+        assert cif.hasAddressCurrentTrophy(accounts[0])
+
+    tx = cif.finalizeTrophy({'from': accounts[6]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 2
+    assert cif.openTrophyId() == 0
+    assert cif.currentTrophyId() == 2
+    assert not cif.hasAddressCurrentTrophy(accounts[0])
+
+    info = cif.currentTrophy()
+    assert info[0] == "Tournament 2"
+    assert info[3] == tuple(names)
+    assert info[4] == tuple(range(2, n_winners + 2))
+    assert cif.getInfoByTrophyId(1)[6] == info[5]  # timePassedOn of the previous trophy
+    for i in [0, 499, 999]:
+        assert cif.ownerOf(i + 2) == addresses[i]
+        assert cif.hasAddressCurrentTrophy(addresses[i])
+
+
+def test_open_trophy_reverts(cif, deployer, accounts):
+    addresses = [accounts[1], accounts[2], accounts[3]]
+    names = ["Jonas", "Daniel", "Hannes"]
+    roster_hash, batches = roster_batches(addresses, names, 2)
+
+    with brownie.reverts("Ownable: caller is not the owner"):
+        cif.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': accounts[0]})
+    with brownie.reverts("Cif: no trophy pass in progress"):
+        cif.appendWinners(*batches[0], {'from': accounts[0]})
+    with brownie.reverts("Cif: no trophy pass in progress"):
+        cif.finalizeTrophy({'from': accounts[0]})
+    with brownie.reverts("Cif: no trophy pass in progress"):
+        cif.cancelOpenTrophy({'from': deployer})
+    with brownie.reverts("Cif: roster hash is empty"):
+        cif.openTrophy("Tournament 1", "0xabc", "0x0", {'from': deployer})
+
+    cif.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': deployer})
+    with brownie.reverts("Ownable: caller is not the owner"):
+        cif.cancelOpenTrophy({'from': accounts[0]})
+    with brownie.reverts("Cif: trophy pass in progress"):
+        cif.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': deployer})
+    with brownie.reverts("Cif: trophy pass in progress"):
+        cif.passTrophy("Tournament 1", "0xabc", addresses, names, {'from': deployer})
+    with brownie.reverts("Cif: batch does not match roster"):
+        cif.appendWinners(*batches[1], {'from': accounts[0]})
+    with brownie.reverts("Cif: batch does not match roster"):
+        cif.appendWinners(addresses[:2], ["Jonas", "Someone Else"], batches[0][2], {'from': accounts[0]})
+
+    cif.appendWinners(*batches[0], {'from': accounts[0]})
+    with brownie.reverts("Cif: roster is incomplete"):
+        cif.finalizeTrophy({'from': accounts[0]})
+    with brownie.reverts("Cif: trophy does not exist"):
+        cif.currentTrophy()
+
+    cif.appendWinners(*batches[1], {'from': accounts[0]})
+    with brownie.reverts("Cif: batch does not match roster"):
+        cif.appendWinners(*batches[1], {'from': accounts[0]})
+    cif.finalizeTrophy({'from': accounts[0]})
+    assert cif.currentTrophy()[3] == tuple(names)
+
+
+def test_open_trophy_gov(gov, cif, deployer, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    addresses = filler_addresses(30)
+    names = [f"Player {i}" for i in range(30)]
+    roster_hash, batches = roster_batches(addresses, names, 10)
+
+    gov.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': accounts[0]})
+    assert gov.transactions(1)[0] == OPEN_TROPHY
+    assert gov.trophyCommitmentPayloads(1)[3] == roster_hash
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    assert cif.openTrophyId() == 1
+
+    # After a single vote, a non-member pushes the whole roster
+    for batch in batches:
+        cif.appendWinners(*batch, {'from': accounts[9]})
+    tx = cif.finalizeTrophy({'from': accounts[9]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 1
+    assert cif.totalSupply() == 30
+
+
+def test_cancel_open_trophy(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0]], ["Jonas"], {'from': deployer})
+    addresses = [accounts[1], accounts[2], accounts[3], accounts[4]]
+    names = ["Daniel", "Hannes", "Pascal", "Miguel"]
+    roster_hash, batches = roster_batches(addresses, names, 2)
+    cif.openTrophy("Tournament 2", "0xdef", roster_hash, {'from': deployer})
+    cif.appendWinners(*batches[0], {'from': accounts[5]})
+    assert cif.totalSupply() == 3
+
+    # The tokens of the appended batch are burned, their ids are not used again
+    tx = cif.cancelOpenTrophy({'from': deployer})
+    assert tx.events["TrophyCancelled"]["trophyId"] == 2
+    assert [e["tokenId"] for e in tx.events["Transfer"]] == [2, 3]
+    assert all(e["to"] == brownie.ZERO_ADDRESS for e in tx.events["Transfer"])
+    assert cif.openTrophyId() == 0
+    assert cif.currentTrophyId() == 1
+    assert cif.totalSupply() == 1
+    assert cif.balanceOf(accounts[1]) == 0
+    assert cif.winners(2) == (0, "")
+    assert cif.trophies(2)[0] == ""
+    with brownie.reverts("Cif: no trophy pass in progress"):
+        cif.appendWinners(*batches[1], {'from': accounts[5]})
+    with brownie.reverts("Cif: no trophy pass in progress"):
+        cif.finalizeTrophy({'from': accounts[5]})
+
+    # The next batch pass gets the same trophy id, holders of the burned tokens don't hold it
+    roster_hash, batches = roster_batches(addresses[2:], names[2:], 1)
+    cif.openTrophy("Tournament 2", "0x123", roster_hash, {'from': deployer})
+    assert cif.openTrophyId() == 2
+    assert cif.openTrophyCount() == 2
+    for batch in batches:
+        cif.appendWinners(*batch, {'from': accounts[5]})
+    cif.finalizeTrophy({'from': accounts[5]})
+    info = cif.currentTrophy()
+    assert info[3] == ("Pascal", "Miguel")
+    assert info[4] == (4, 5)
+    assert not cif.holdsTrophy(accounts[1], 2)
+    assert cif.holdsTrophy(accounts[3], 2)
+
+    # Cancelling right after opening, then passing directly
+    roster_hash, _ = roster_batches(addresses, names, 2)
+    cif.openTrophy("Tournament 3", "0x456", roster_hash, {'from': deployer})
+    cif.cancelOpenTrophy({'from': deployer})
+    tx = cif.passTrophy("Tournament 3", "0x789", [accounts[6]], ["Jürg"], {'from': deployer})
+    assert tx.events["TrophyPassed"]["trophyId"] == 3
+    assert cif.ownerOf(6) == accounts[6]
+
+
+def test_cancel_open_trophy_gov(gov, cif, deployer, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    addresses = filler_addresses(30)
+    names = [f"Player {i}" for i in range(30)]
+    roster_hash, batches = roster_batches(addresses, names, 10)
+
+    with brownie.reverts("Gov: roster hash is empty"):
+        gov.openTrophy("Tournament 1", "0xabc", "0x0", {'from': accounts[0]})
+    with brownie.reverts("Gov: no trophy pass in progress"):
+        gov.cancelOpenTrophy({'from': accounts[0]})
+
+    gov.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    cif.appendWinners(*batches[0], {'from': accounts[9]})
+
+    with brownie.reverts("Gov: caller is not a member"):
+        gov.cancelOpenTrophy({'from': accounts[9]})
+    gov.cancelOpenTrophy({'from': accounts[0]})
+    assert gov.transactions(2)[0] == CANCEL_OPEN_TROPHY
+    assert gov.uintPayloads(2) == cif.openTrophyCount() == 1
+    tx = gov.confirmTransaction(2, {'from': accounts[1]})
+    assert tx.events["TrophyCancelled"]["trophyId"] == 1
+    assert gov.uintPayloads(2) == 0
+    assert cif.openTrophyId() == 0
+    assert cif.totalSupply() == 0
+
+    # Passing again after the cancellation
+    tx = gov.passTrophy("Tournament 1", "0xabc", [accounts[5]], ["Pascal"], {'from': accounts[0]})
+    gov.confirmTransaction(tx.return_value, {'from': accounts[1]})
+    assert cif.currentTrophyId() == 1
+    assert cif.ownerOf(11) == accounts[5]
+
+
+def test_cancel_open_trophy_stale(gov, cif, deployer, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    roster_hash, batches = roster_batches([accounts[5]], ["Pascal"], 1)
+    gov.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    gov.cancelOpenTrophy({'from': accounts[0]})
+
+    # Once the pass is finalized the cancellation can never execute
+    cif.appendWinners(*batches[0], {'from': accounts[9]})
+    cif.finalizeTrophy({'from': accounts[9]})
+    with brownie.reverts("Gov: trophy pass is not open anymore"):
+        gov.confirmTransaction(2, {'from': accounts[1]})
+    tx = gov.cancelStale([2], {'from': accounts[0]})
+    assert tx.return_value == 1
+    assert gov.isCancelled(2)
+
+
+def test_cancel_open_trophy_reopened(gov, cif, deployer, accounts):
+    cif.transferOwnership(gov, {'from': deployer})
+    roster_hash, batches = roster_batches([accounts[5]], ["Pascal"], 1)
+    gov.openTrophy("Tournament 1", "0xabc", roster_hash, {'from': accounts[0]})
+    gov.confirmTransaction(1, {'from': accounts[1]})
+    gov.cancelOpenTrophy({'from': accounts[0]})
+    gov.cancelOpenTrophy({'from': accounts[2]})
+    gov.confirmTransaction(2, {'from': accounts[1]})
+    assert cif.openTrophyId() == 0
+
+    # The new batch pass has the same trophy id, the second cancellation was for the previous pass
+    gov.openTrophy("Tournament 1", "0xdef", roster_hash, {'from': accounts[0]})
+    gov.confirmTransaction(4, {'from': accounts[1]})
+    assert cif.openTrophyId() == 1
+    with brownie.reverts("Gov: trophy pass is not open anymore"):
+        gov.confirmTransaction(3, {'from': accounts[1]})
+    assert gov.cancelStale([3], {'from': accounts[0]}).return_value == 1
+
+    cif.appendWinners(*batches[0], {'from': accounts[9]})
+    tx = cif.finalizeTrophy({'from': accounts[9]})
+    assert tx.events["TrophyPassed"]["trophyId"] == 1
@@ -0,0 +1,22 @@
+NAMES = ["", "J", "Jonas", "x" * 27, "y" * 28, "Jürg Müller-Lüdenscheidt", "🏆" * 6, "🏆" * 7]
+
+
+def test_winner_names_round_trip(cif, deployer, accounts):
+    addresses = [accounts[i % 10] for i in range(len(NAMES))]
+    cif.passTrophy("Tournament 1", "0xabc", addresses, NAMES, {'from': deployer})
+
+    assert cif.currentTrophy()[3] == tuple(NAMES)
+    for token_id, name in enumerate(NAMES, start=1):
+        assert cif.winners(token_id) == (1, name)
+    assert [w[3] for w in cif.getWinnersRange(1, len(NAMES))] == NAMES
+
+
+def test_trophy_getter(cif, deployer, accounts):
+    tx = cif.passTrophy("Tournament 1", "0x" + "ab" * 32, [accounts[0], accounts[1]], ["Jonas", "Daniel"], {'from': deployer})
+    tournament, info_hash, time_received = cif.trophies(1)
+    assert tournament == "Tournament 1"
+    assert info_hash == "0x" + "ab" * 32
+    assert time_received == tx.timestamp
+    assert cif.trophyClaims(1) == ("0x" + "00" * 32, 0, 0)
+    assert cif.trophies(2) == ("", "0x" + "00" * 32, 0)
+    assert cif.trophyClaims(2) == ("0x" + "00" * 32, 0, 0)
@@ -0,0 +1,54 @@
+import brownie
+import pytest
+
+from helpers.winners import calldata_gas, encode_winners, filler_addresses
+
+N_WINNERS = 30
+# Empty, multi-byte UTF-8 and names around the 32 byte word boundary
+NAMES = ["", "Zoë", "Jürg 🏆", "A" * 31, "B" * 32, "C" * 33, "D" * 255] + [f"Player {i}" for i in range(N_WINNERS - 7)]
+
+
+@pytest.fixture(scope="module", params=["cif", "lean_cif"])
+def trophy(request):
+    yield request.getfixturevalue(request.param)
+
+
+def test_packed_matches_arrays(trophy, deployer):
+    addresses = filler_addresses(N_WINNERS)
+    tx_arrays = trophy.passTrophy("Tournament", "0xabc", addresses, NAMES, {'from': deployer})
+    tx_packed = trophy.passTrophy("Tournament", "0xabc", encode_winners(addresses, NAMES), {'from': deployer})
+    assert tx_packed.events["TrophyPassed"]["trophyId"] == 2
+
+    by_arrays, by_packed = trophy.getInfoByTrophyId(1), trophy.getInfoByTrophyId(2)
+    assert by_packed[0] == by_arrays[0]
+    assert by_packed[3] == by_arrays[3] == tuple(NAMES)
+    assert [n.encode("utf-8") for n in by_packed[3]] == [n.encode("utf-8") for n in NAMES]
+    for i in range(N_WINNERS):
+        assert trophy.ownerOf(by_packed[4][i]) == trophy.ownerOf(by_arrays[4][i]) == addresses[i]
+        assert trophy.winners(by_packed[4][i])[1] == trophy.winners(by_arrays[4][i])[1]
+
+    # Each winner takes 21 bytes plus its name instead of four padded words
+    assert calldata_gas(tx_packed.input) < calldata_gas(tx_arrays.input)
+
+
+def test_packed_reverts(trophy, deployer, accounts):
+    packed = encode_winners([accounts[1], accounts[2]], ["Daniel", "Hannes"])
+    with brownie.reverts("Ownable: caller is not the owner"):
+        trophy.passTrophy("Tournament", "0xabc", packed, {'from': accounts[1]})
+    with brownie.reverts("WinnerEncoding: malformed winners"):
+        trophy.passTrophy("Tournament", "0xabc", packed[:-1], {'from': deployer})
+    with brownie.reverts("WinnerEncoding: malformed winners"):
+        trophy.passTrophy("Tournament", "0xabc", packed[:30], {'from': deployer})
+    with brownie.reverts("WinnerEncoding: malformed winners"):
+        trophy.passTrophy("Tournament", "0xabc", packed + b"\x01", {'from': deployer})
+
+    # No winners at all is still a valid trophy
+    trophy.passTrophy("Tournament", "0xabc", b"", {'from': deployer})
+    assert trophy.currentTrophy()[3] == ()
+
+
+def test_encoder_reverts(accounts):
+    with pytest.raises(ValueError):
+        encode_winners([accounts[1]], ["Daniel", "Hannes"])
+    with pytest.raises(ValueError):
+        encode_winners([accounts[1]], ["X" * 256])
@@ -0,0 +1,38 @@
+def test_trophies_of(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0], accounts[1]], ["Jonas", "Daniel"], {'from': deployer})
+    cif.passTrophy("Tournament 2", "0xdef", [accounts[1], accounts[1]], ["Daniel", "Dani"], {'from': deployer})
+    cif.passTrophy("Tournament 3", "0x123", [accounts[2]], ["Hannes"], {'from': deployer})
+    cif.transferFrom(accounts[0], accounts[1], 1, {'from': accounts[0]})
+
+    trophy_ids, tokens = cif.trophiesOf(accounts[1], 0, 10)
+    assert sorted(trophy_ids) == [1, 2]
+    assert sorted(tokens) == [
+        (1, 1, accounts[1], "Jonas"),
+        (2, 1, accounts[1], "Daniel"),
+        (3, 2, accounts[1], "Daniel"),
+        (4, 2, accounts[1], "Dani"),
+    ]
+
+    # Pages follow tokenOfOwnerByIndex, trophies are distinct within a page
+    for offset in range(4):
+        page_ids, page = cif.trophiesOf(accounts[1], offset, 1)
+        assert page[0][0] == cif.tokenOfOwnerByIndex(accounts[1], offset)
+        assert page_ids == [page[0][1]]
+    assert cif.trophiesOf(accounts[1], 4, 10) == ([], [])
+    assert cif.trophiesOf(accounts[5], 0, 10) == ([], [])
+
+
+def test_holds_trophy(cif, deployer, accounts):
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0], accounts[1]], ["Jonas", "Daniel"], {'from': deployer})
+    cif.passTrophy("Tournament 2", "0xdef", [accounts[2]], ["Hannes"], {'from': deployer})
+
+    assert cif.holdsTrophy(accounts[0], 1)
+    assert cif.holdsTrophy(accounts[2], 2)
+    assert not cif.holdsTrophy(accounts[2], 1)
+    assert not cif.holdsTrophy(accounts[0], 2)
+    assert not cif.holdsTrophy(accounts[0], 3)
+    assert cif.holdsTrophy(accounts[2], 2) == cif.hasAddressCurrentTrophy(accounts[2])
+
+    cif.transferFrom(accounts[0], accounts[5], 1, {'from': accounts[0]})
+    assert not cif.holdsTrophy(accounts[0], 1)
+    assert cif.holdsTrophy(accounts[5], 1)
@@ -1,4 +1,5 @@
 import brownie
+import pytest
 
 
 def test_uri(cif, accounts):
@@ -22,3 +23,43 @@ def test_uri(cif, accounts):
 def test_uri_reverts(cif, accounts):
     with brownie.reverts("Ownable: caller is not the owner"):
         cif.setBaseURI("http://example.com/", {'from': accounts[0]})
+
+
+@pytest.mark.parametrize("variant", ["cif", "lean_cif"])
+def test_trophy_uri_precedence(request, deployer, accounts, variant):
+    trophy = request.getfixturevalue(variant)
+    trophy.passTrophy("Tournament 1", "0xabc", [accounts[0], accounts[1], accounts[2]], ["A", "B", "C"], {'from': deployer})
+    trophy.passTrophy("Tournament 2", "0xdef", [accounts[3]], ["D"], {'from': deployer})
+
+    # Without a base URI
+    trophy.setTrophyURI(1, "ipfs://results/tour-1", {'from': deployer})
+    assert trophy.trophyURI(1) == "ipfs://results/tour-1"
+    assert [trophy.tokenURI(i) for i in range(1, 5)] == ["ipfs://results/tour-1"] * 3 + [""]
+    trophy.setTokenURI(2, "ipfs://players/2", {'from': deployer})
+    assert trophy.tokenURI(2) == "ipfs://players/2"
+    assert trophy.tokenURI(1) == "ipfs://results/tour-1"
+
+    # The base URI is prefixed to token and trophy URIs and followed by the token id otherwise
+    trophy.setBaseURI("http://example.com/", {'from': deployer})
+    trophy.setTokenURI(2, "players/2", {'from': deployer})
+    trophy.setTrophyURI(1, "tour-1", {'from': deployer})
+    assert [trophy.tokenURI(i) for i in range(1, 5)] == [
+        "http://example.com/tour-1",
+        "http://example.com/players/2",
+        "http://example.com/tour-1",
+        "http://example.com/4",
+    ]
+
+    # Clearing the token URI falls back to the trophy URI
+    trophy.setTokenURI(2, "", {'from': deployer})
+    assert trophy.tokenURI(2) == "http://example.com/tour-1"
+
+
+def test_trophy_uri_reverts(cif, deployer, accounts):
+    with brownie.reverts("Cif: trophy does not exist"):
+        cif.setTrophyURI(1, "tour-1", {'from': deployer})
+    cif.passTrophy("Tournament 1", "0xabc", [accounts[0]], ["A"], {'from': deployer})
+    with brownie.reverts("Ownable: caller is not the owner"):
+        cif.setTrophyURI(1, "tour-1", {'from': accounts[0]})
+    with brownie.reverts("ERC721Metadata: URI query for nonexistent token"):
+        cif.tokenURI(2)
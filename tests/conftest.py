@@ -3,6 +3,18 @@
 import pytest
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--gas-update", action="store_true", help="write measured benchmark gas to tests/benchmarks/gas_baseline.json"
+    )
+    parser.addoption(
+        "--gas-compare", action="store_true", help="fail benchmarks that use more gas than the checked-in baseline"
+    )
+    parser.addoption(
+        "--gas-tolerance", type=float, default=5.0, help="allowed gas increase over the baseline in percent"
+    )
+
+
 @pytest.fixture(scope="function", autouse=True)
 def isolate(fn_isolation):
     pass
@@ -24,7 +36,28 @@ def cif(CifEsportsMultiTrophy, deployer):
     yield cif
 
 
+@pytest.fixture(scope="module")
+def lean_cif(CifEsportsLeanTrophy, deployer):
+    yield deployer.deploy(CifEsportsLeanTrophy)
+
+
 @pytest.fixture(scope="module")
 def gov(CifGovernance, cif, gov_deployer, accounts):
     gov = gov_deployer.deploy(CifGovernance, cif, 50, accounts[:4])
     yield gov
+
+
+@pytest.fixture
+def rpc_methods(web3):
+    """The JSON-RPC methods requested through `web3` during the test."""
+    methods = []
+
+    def middleware(make_request, w3):
+        def record(method, params):
+            methods.append(method)
+            return make_request(method, params)
+        return record
+
+    web3.middleware_onion.add(middleware, "rpc_methods")
+    yield methods
+    web3.middleware_onion.remove("rpc_methods")
@@ -0,0 +1,8 @@
+try:
+    from eth_abi import encode as abi_encode
+    from eth_abi import decode as abi_decode
+except ImportError:  # eth-abi < 4
+    from eth_abi import encode_abi as abi_encode
+    from eth_abi import decode_abi as abi_decode
+
+__all__ = ["abi_decode", "abi_encode"]
@@ -0,0 +1,260 @@
+"""Caching read client for the trophy and governance views.
+
+The views in `CACHED_VIEWS` are cached until a log shows that they changed: passed trophies only change once, when the
+next trophy sets their `timePassedOn`, minted winners only change when a cancelled batch pass burns them, token owners
+change with a `Transfer` and proposals only change with a vote, execution or cancellation. All other views are read
+from the chain on every call. Each refresh first fetches the logs since the last refresh and drops the entries they
+touch, cold lookups are then sent as JSON-RPC batches over one pooled HTTP session.
+"""
+import json
+import os
+from collections import OrderedDict
+
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from hexbytes import HexBytes
+import requests
+from requests.adapters import HTTPAdapter
+from web3._utils.abi import get_abi_input_types, get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+TROPHY_EVENTS = ["TrophyPassed", "WinnerMinted", "TrophyCancelled", "Transfer", "ConsecutiveTransfer"]
+GOVERNANCE_EVENTS = [
+    "Submission",
+    "Confirmation",
+    "Revocation",
+    "Execution",
+    "Cancellation",
+    "MemberAddition",
+    "MemberRemoval",
+    "QuorumChange",
+]
+# Proposal lists and counts, they change with every submission, execution and cancellation
+LIST_VIEWS = {"getTransactionIds", "getPendingTransactionIds", "getTransactionIdCount", "transactionCount"}
+# Views with results that only change with the logs handled in `ReadClient._invalidate`
+CACHED_VIEWS = {
+    "currentTrophyId",
+    "getInfoByTrophyId",
+    "winners",
+    "ownerOf",
+    "getMembers",
+    "isMember",
+    "quorum",
+    "requiredVotes",
+    "transactions",
+    "getConfirmations",
+    "getConfirmationCount",
+    "confirmations",
+} | LIST_VIEWS
+
+
+class RPCError(Exception):
+    pass
+
+
+class LRUCache:
+    """Keeps the `maxsize` most recently used entries, optionally persisted to `path` as JSON with the block they are
+    valid at. Keys are `(address, name, args)` tuples of JSON values. `identity` names the chain and contracts the
+    entries belong to, a file written for another identity or that can't be read is deleted instead of loaded."""
+
+    def __init__(self, maxsize=4096, path=None, identity=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.identity = identity
+        self.block = None
+        self._entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+                valid = state["identity"] == identity
+            except (ValueError, KeyError, TypeError):
+                valid = False
+            if not valid:
+                os.remove(path)
+                return
+            self.block = state["block"]
+            for (address, name, args), value in state["entries"]:
+                self.put((address, name, tuple(args)), value)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key):
+        self._entries.pop(key, None)
+
+    def discard_where(self, predicate):
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump({"identity": self.identity, "block": self.block, "entries": list(self._entries.items())}, f)
+
+
+class ReadClient:
+    """Reads the views of `trophy` and `gov` through the cache. `requests` and `calls` count the HTTP round trips
+    and the `eth_call`s sent so far. The cache holds the raw `eth_call` results, a cache persisted to `path` is only
+    loaded for the same chain id and contract addresses."""
+
+    def __init__(self, web3, trophy, gov, endpoint=None, cache_size=4096, path=None, pool_size=4):
+        self.web3 = web3
+        self.endpoint = endpoint or web3.provider.endpoint_uri
+        identity = None
+        if path is not None:
+            identity = [web3.eth.chain_id, trophy.address, gov.address]
+        self.cache = LRUCache(cache_size, path, identity)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.requests = 0
+        self.calls = 0
+        self._trophy = trophy
+        self._gov = gov
+        self._topics = {}
+        for contract, names in ((trophy, TROPHY_EVENTS), (gov, GOVERNANCE_EVENTS)):
+            for abi in contract.abi:
+                if abi["type"] == "event" and abi["name"] in names:
+                    self._topics["0x" + event_abi_to_log_topic(abi).hex()] = abi["name"]
+
+    # JSON-RPC
+
+    def _batch(self, batch):
+        if not batch:
+            return []
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, (method, params) in enumerate(batch)
+        ]
+        response = self.session.post(self.endpoint, json=payload)
+        response.raise_for_status()
+        self.requests += 1
+        self.calls += sum(method == "eth_call" for method, _ in batch)
+        results = sorted(response.json(), key=lambda r: r["id"])
+        for result in results:
+            if "error" in result:
+                raise RPCError(result["error"].get("message", result["error"]))
+        return [r["result"] for r in results]
+
+    def _call_request(self, contract, name, args):
+        abi = _function_abi(contract, name, len(args))
+        data = function_abi_to_4byte_selector(abi) + self.web3.codec.encode_abi(get_abi_input_types(abi), args)
+        return "eth_call", [{"to": contract.address, "data": "0x" + data.hex()}, "latest"]
+
+    def _decode(self, contract, name, args, result):
+        abi = _function_abi(contract, name, len(args))
+        types = get_abi_output_types(abi)
+        decoded = map_abi_data(BASE_RETURN_NORMALIZERS, types, self.web3.codec.decode_abi(types, HexBytes(result)))
+        return decoded[0] if len(decoded) == 1 else decoded
+
+    def call_many(self, calls):
+        """Results of `(contract, name, args)` calls, the cold ones are fetched in one batch."""
+        keys = [(contract.address, name, tuple(args)) for contract, name, args in calls]
+        results = {key: self.cache.get(key) for key in keys if key in self.cache}
+        cold = OrderedDict((key, call) for key, call in zip(keys, calls) if key not in results)
+        for key, result in zip(cold, self._batch([self._call_request(*call) for call in cold.values()])):
+            results[key] = result
+            if key[1] in CACHED_VIEWS:
+                self.cache.put(key, result)
+        return [self._decode(*call, results[key]) for key, call in zip(keys, calls)]
+
+    # Invalidation
+
+    def sync(self):
+        """Drops the cached results that changed since the last sync, costs one round trip."""
+        if self.cache.block is None:
+            self.cache.block = int(self._batch([("eth_blockNumber", [])])[0], 16)
+            return
+        block, logs = self._batch([
+            ("eth_blockNumber", []),
+            ("eth_getLogs", [{
+                "fromBlock": hex(self.cache.block + 1),
+                "toBlock": "latest",
+                "address": [self._trophy.address, self._gov.address],
+                "topics": [list(self._topics)],
+            }]),
+        ])
+        for log in logs:
+            self._invalidate(self._topics[log["topics"][0]], [int(t, 16) for t in log["topics"][1:]])
+        # Logs up to `latest` were seen, blocks mined after `eth_blockNumber` are fetched again next time
+        self.cache.block = int(block, 16)
+
+    def _invalidate(self, name, indexed):
+        trophy, gov = self._trophy.address, self._gov.address
+        if name == "TrophyPassed":
+            # The previous trophy is passed on, its `timePassedOn` is set
+            self.cache.discard((trophy, "currentTrophyId", ()))
+            self.cache.discard((trophy, "getInfoByTrophyId", (indexed[0] - 1,)))
+        elif name == "WinnerMinted":
+            trophy_id, _, token_id = indexed
+            self.cache.discard((trophy, "getInfoByTrophyId", (trophy_id,)))
+            self.cache.discard((trophy, "winners", (token_id,)))
+        elif name == "TrophyCancelled":
+            self.cache.discard((trophy, "getInfoByTrophyId", (indexed[0],)))
+        elif name == "Transfer":
+            # Burns of a cancelled batch pass also reset the winner
+            token_id = indexed[2]
+            self.cache.discard((trophy, "ownerOf", (token_id,)))
+            self.cache.discard((trophy, "winners", (token_id,)))
+        elif name == "ConsecutiveTransfer":
+            # Only the first token id of the run is indexed
+            self.cache.discard_where(lambda key: key[0] == trophy and key[1] in ("ownerOf", "winners"))
+        elif name in ("Confirmation", "Revocation", "Execution", "Cancellation"):
+            # The proposal lists take a bool first, which would match the transaction id 1
+            transaction_id = indexed[-1]
+            self.cache.discard_where(
+                lambda key: key[0] == gov and key[1] not in LIST_VIEWS and key[2][:1] == (transaction_id,)
+            )
+            if name in ("Execution", "Cancellation"):
+                self.cache.discard_where(lambda key: key[0] == gov and key[1] in LIST_VIEWS)
+        elif name == "Submission":
+            self.cache.discard_where(lambda key: key[0] == gov and key[1] in LIST_VIEWS)
+        else:
+            # Member and quorum changes move or drop confirmations of every proposal
+            self.cache.discard_where(lambda key: key[0] == gov)
+
+    # Dashboard
+
+    def dashboard(self):
+        """The trophy history and the pending proposals, in at most three round trips."""
+        self.sync()
+        trophy_id, members, required_votes, pending = self.call_many([
+            (self._trophy, "currentTrophyId", ()),
+            (self._gov, "getMembers", ()),
+            (self._gov, "requiredVotes", ()),
+            (self._gov, "getTransactionIds", (False,)),
+        ])
+        records = self.call_many(
+            [(self._trophy, "getInfoByTrophyId", (i,)) for i in range(1, trophy_id + 1)]
+            + [(self._gov, name, (i,)) for i in pending for name in ("transactions", "getConfirmations")]
+        )
+        trophies, proposals = records[:trophy_id], records[trophy_id:]
+        return {
+            "trophies": trophies,
+            "members": members,
+            "required_votes": required_votes,
+            "pending": [(i, proposals[2 * n], proposals[2 * n + 1]) for n, i in enumerate(pending)],
+        }
+
+    def winners(self, token_ids):
+        """Trophy id and name of minted tokens, which never change."""
+        return self.call_many([(self._trophy, "winners", (i,)) for i in token_ids])
+
+
+def _function_abi(contract, name, n_args):
+    for abi in contract.abi:
+        if abi["type"] == "function" and abi["name"] == name and len(abi["inputs"]) == n_args:
+            return abi
+    raise ValueError(f"{name} with {n_args} arguments not found")
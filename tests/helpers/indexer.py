@@ -0,0 +1,343 @@
+"""Event-sourced local index of the trophy and governance contracts.
+
+The decoded logs in the `events` table are the source of truth. All other tables are projections of these events:
+they are updated while logs come in and rebuilt from `events` after a reorg. Reorgs are detected by comparing the
+stored block hashes with the chain. `TrophyDetails`, `WinnerMinted` and `ProposalSubmitted` carry everything the
+projections need, so indexing doesn't call any contract view.
+"""
+import json
+import sqlite3
+
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3._utils.events import get_event_data
+
+# Mints are indexed from WinnerMinted, Transfer only moves and burns existing tokens
+TROPHY_EVENTS = ["TrophyDetails", "WinnerMinted", "Transfer"]
+GOVERNANCE_EVENTS = [
+    "ProposalSubmitted",
+    "Confirmation",
+    "Revocation",
+    "ProposalExecuted",
+    "Cancellation",
+    "MemberAddition",
+    "MemberRemoval",
+    "QuorumChange",
+]
+ZERO_ADDRESS = "0x" + "00" * 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+
+CREATE TABLE IF NOT EXISTS trophies (
+    trophy_id INTEGER PRIMARY KEY,
+    tournament TEXT NOT NULL,
+    info_hash TEXT NOT NULL,
+    n_winners INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    token_id INTEGER PRIMARY KEY,
+    trophy_id INTEGER NOT NULL,
+    holder TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tokens_holder ON tokens (holder);
+CREATE INDEX IF NOT EXISTS tokens_trophy ON tokens (trophy_id, holder);
+CREATE TABLE IF NOT EXISTS proposals (
+    transaction_id INTEGER PRIMARY KEY,
+    txn_type INTEGER NOT NULL,
+    proposer TEXT NOT NULL,
+    status TEXT NOT NULL,
+    execution_order INTEGER
+);
+CREATE INDEX IF NOT EXISTS proposals_status ON proposals (status, execution_order);
+CREATE TABLE IF NOT EXISTS confirmations (
+    transaction_id INTEGER NOT NULL,
+    member TEXT NOT NULL,
+    PRIMARY KEY (transaction_id, member)
+);
+CREATE INDEX IF NOT EXISTS confirmations_member ON confirmations (member);
+CREATE TABLE IF NOT EXISTS members (member TEXT PRIMARY KEY, slot INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+PROJECTIONS = ["trophies", "tokens", "proposals", "confirmations", "members", "settings"]
+
+PENDING, EXECUTED, CANCELLED = "pending", "executed", "cancelled"
+
+
+def _json_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return value
+
+
+class Indexer:
+    """Follows the trophy and governance contracts from `start_block`, which should be the block the governance
+    contract was deployed in. The member set and quorum before the first indexed event are read from the chain
+    once, all other state is derived from the logs.
+    """
+
+    def __init__(self, web3, trophy, gov, db=":memory:", start_block=0, batch_size=1000):
+        self.web3 = web3
+        self.start_block = start_block
+        self.batch_size = batch_size
+        self._trophy = web3.eth.contract(address=trophy.address, abi=trophy.abi)
+        self._gov = web3.eth.contract(address=gov.address, abi=gov.abi)
+        self._event_abis = {}
+        for contract, names in ((trophy, TROPHY_EVENTS), (gov, GOVERNANCE_EVENTS)):
+            for abi in contract.abi:
+                if abi["type"] == "event" and abi["name"] in names:
+                    self._event_abis[(contract.address, event_abi_to_log_topic(abi))] = abi
+        self.db = sqlite3.connect(db)
+        self.db.executescript(SCHEMA)
+
+    # Synchronisation
+
+    def sync(self, to_block=None):
+        """Rolls back blocks that are no longer part of the chain, then indexes all blocks up to `to_block`."""
+        head = self.web3.eth.block_number if to_block is None else to_block
+        self._rollback_reorg(head)
+        if self._meta("initial_members") is None:
+            self._read_initial_state()
+        start = self._cursor() + 1
+        while start <= head:
+            end = min(start + self.batch_size - 1, head)
+            logs = self.web3.eth.get_logs({
+                "fromBlock": start,
+                "toBlock": end,
+                "address": [self._trophy.address, self._gov.address],
+                "topics": [["0x" + topic.hex() for _, topic in self._event_abis]],
+            })
+            events = [self._decode(log) for log in logs]
+            with self.db:
+                for event in events:
+                    self.db.execute(
+                        "INSERT INTO events VALUES (?, ?, ?, ?, ?)",
+                        (event["block"], event["log_index"], event["transaction_hash"], event["name"],
+                         json.dumps(event["args"])),
+                    )
+                    self.db.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?)", (event["block"], event["block_hash"]))
+                self._apply(events)
+                self.db.execute(
+                    "INSERT OR REPLACE INTO blocks VALUES (?, ?)", (end, HexBytes(self.web3.eth.get_block(end).hash).hex())
+                )
+                self._set_meta("cursor", end)
+            start = end + 1
+        return head
+
+    def _cursor(self):
+        cursor = self._meta("cursor")
+        return self.start_block - 1 if cursor is None else cursor
+
+    def _rollback_reorg(self, head):
+        """Finds the newest stored block that is still on the chain and replays the events up to it."""
+        cursor = self._cursor()
+        fork = self.start_block - 1
+        for number, block_hash in self.db.execute("SELECT number, hash FROM blocks ORDER BY number DESC"):
+            if number <= head and HexBytes(self.web3.eth.get_block(number).hash).hex() == block_hash:
+                fork = number
+                break
+        if fork >= cursor:
+            return
+        with self.db:
+            self.db.execute("DELETE FROM events WHERE block_number > ?", (fork,))
+            self.db.execute("DELETE FROM blocks WHERE number > ?", (fork,))
+            self._set_meta("cursor", fork)
+            self._rebuild()
+
+    def _read_initial_state(self):
+        block = self.start_block - 1
+        if block < 0 or self.web3.eth.get_code(self._gov.address, block_identifier=block) in (b"", HexBytes("0x")):
+            block = self.start_block
+        members = self._gov.functions.getMembers().call(block_identifier=block)
+        quorum = self._gov.functions.quorum().call(block_identifier=block)
+        with self.db:
+            self._set_meta("initial_members", list(members))
+            self._set_meta("initial_quorum", quorum)
+            self._rebuild()
+
+    def _decode(self, log):
+        abi = self._event_abis[(log["address"], bytes(log["topics"][0]))]
+        data = get_event_data(self.web3.codec, abi, log)
+        return {
+            "block": log["blockNumber"],
+            "block_hash": HexBytes(log["blockHash"]).hex(),
+            "log_index": log["logIndex"],
+            "transaction_hash": HexBytes(log["transactionHash"]).hex(),
+            "name": abi["name"],
+            "args": {k: _json_value(v) for k, v in data["args"].items()},
+        }
+
+    # Projections
+
+    def _rebuild(self):
+        for table in PROJECTIONS:
+            self.db.execute(f"DELETE FROM {table}")
+        for slot, member in enumerate(self._meta("initial_members")):
+            self.db.execute("INSERT INTO members VALUES (?, ?)", (member, slot))
+        self.db.execute("INSERT INTO settings VALUES ('quorum', ?)", (self._meta("initial_quorum"),))
+        rows = self.db.execute(
+            "SELECT block_number, log_index, transaction_hash, name, args FROM events ORDER BY block_number, log_index"
+        ).fetchall()
+        self._apply([
+            {"block": b, "log_index": i, "transaction_hash": t, "name": n, "args": json.loads(a)}
+            for b, i, t, n, a in rows
+        ])
+
+    def _apply(self, events):
+        for position, event in enumerate(events):
+            name, args = event["name"], event["args"]
+            if name == "TrophyDetails":
+                self.db.execute(
+                    "INSERT INTO trophies VALUES (?, ?, ?, ?)",
+                    (args["trophyId"], args["tournament"], args["infoHash"], args["nWinners"]),
+                )
+            elif name == "WinnerMinted":
+                self.db.execute(
+                    "INSERT INTO tokens VALUES (?, ?, ?, ?)",
+                    (args["tokenId"], args["trophyId"], args["holder"], args["winnerName"]),
+                )
+            elif name == "Transfer":
+                if args["to"] == ZERO_ADDRESS:
+                    # Burned when a batch pass is cancelled
+                    self.db.execute("DELETE FROM tokens WHERE token_id = ?", (args["tokenId"],))
+                elif args["from"] != ZERO_ADDRESS:
+                    self.db.execute("UPDATE tokens SET holder = ? WHERE token_id = ?", (args["to"], args["tokenId"]))
+            elif name == "ProposalSubmitted":
+                self.db.execute(
+                    "INSERT INTO proposals VALUES (?, ?, ?, ?, NULL)",
+                    (args["transactionId"], args["txnType"], args["proposer"], PENDING),
+                )
+            elif name == "Confirmation":
+                self.db.execute("INSERT INTO confirmations VALUES (?, ?)", (args["transactionId"], args["sender"]))
+            elif name == "Revocation":
+                self.db.execute(
+                    "DELETE FROM confirmations WHERE transaction_id = ? AND member = ?",
+                    (args["transactionId"], args["sender"]),
+                )
+            elif name == "ProposalExecuted":
+                self.db.execute(
+                    "UPDATE proposals SET status = ?, execution_order = "
+                    "(SELECT COALESCE(MAX(execution_order), 0) + 1 FROM proposals) WHERE transaction_id = ?",
+                    (EXECUTED, args["transactionId"]),
+                )
+            elif name == "Cancellation":
+                self.db.execute(
+                    "UPDATE proposals SET status = ? WHERE transaction_id = ?", (CANCELLED, args["transactionId"])
+                )
+            elif name == "MemberRemoval":
+                # replaceMember emits the removal directly followed by the addition, the new member takes the slot
+                following = events[position + 1] if position + 1 < len(events) else None
+                replacement = None
+                if (
+                    following is not None
+                    and following["name"] == "MemberAddition"
+                    and following["transaction_hash"] == event["transaction_hash"]
+                    and following["log_index"] == event["log_index"] + 1
+                ):
+                    replacement = following["args"]["member"]
+                self._remove_member(args["member"], replacement)
+            elif name == "MemberAddition":
+                if not self.db.execute("SELECT 1 FROM members WHERE member = ?", (args["member"],)).fetchone():
+                    slot = self.db.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+                    self.db.execute("INSERT INTO members VALUES (?, ?)", (args["member"], slot))
+            elif name == "QuorumChange":
+                self.db.execute("UPDATE settings SET value = ? WHERE key = 'quorum'", (args["newQuorum"],))
+
+    def _remove_member(self, member, replacement):
+        """Mirrors the slot moves of the contract. Confirmations of a removed member are discarded."""
+        self.db.execute("DELETE FROM confirmations WHERE member = ?", (member,))
+        if replacement is not None:
+            self.db.execute("UPDATE members SET member = ? WHERE member = ?", (replacement, member))
+            return
+        slot = self.db.execute("SELECT slot FROM members WHERE member = ?", (member,)).fetchone()[0]
+        self.db.execute("DELETE FROM members WHERE member = ?", (member,))
+        self.db.execute(
+            "UPDATE members SET slot = ? WHERE slot = (SELECT MAX(slot) FROM members) AND slot > ?", (slot, slot)
+        )
+
+    # Queries, answered from the local database
+
+    def current_trophy_id(self):
+        return self.db.execute("SELECT COALESCE(MAX(trophy_id), 0) FROM trophies").fetchone()[0]
+
+    def holder_of(self, token_id):
+        row = self.db.execute("SELECT holder FROM tokens WHERE token_id = ?", (token_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def trophy_of(self, token_id):
+        row = self.db.execute("SELECT trophy_id FROM tokens WHERE token_id = ?", (token_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def winner_name(self, token_id):
+        row = self.db.execute("SELECT name FROM tokens WHERE token_id = ?", (token_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def trophy(self, trophy_id):
+        """Tournament, info hash and number of winners of a passed trophy."""
+        row = self.db.execute(
+            "SELECT tournament, info_hash, n_winners FROM trophies WHERE trophy_id = ?", (trophy_id,)
+        ).fetchone()
+        return None if row is None else tuple(row)
+
+    def tokens_of(self, holder):
+        rows = self.db.execute("SELECT token_id FROM tokens WHERE holder = ? ORDER BY token_id", (str(holder),))
+        return [r[0] for r in rows]
+
+    def holds_trophy(self, holder, trophy_id):
+        row = self.db.execute(
+            "SELECT 1 FROM tokens WHERE trophy_id = ? AND holder = ? LIMIT 1", (trophy_id, str(holder))
+        ).fetchone()
+        return row is not None
+
+    def has_current_trophy(self, holder):
+        return self.holds_trophy(holder, self.current_trophy_id())
+
+    def transaction_ids(self, status):
+        """Pending and cancelled ids in ascending order, executed ids in order of execution."""
+        rows = self.db.execute(
+            "SELECT transaction_id FROM proposals WHERE status = ? ORDER BY execution_order, transaction_id", (status,)
+        )
+        return [r[0] for r in rows]
+
+    def transaction_type(self, transaction_id):
+        row = self.db.execute("SELECT txn_type FROM proposals WHERE transaction_id = ?", (transaction_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def proposer(self, transaction_id):
+        row = self.db.execute("SELECT proposer FROM proposals WHERE transaction_id = ?", (transaction_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def confirmations(self, transaction_id):
+        """Confirming members in the order of `getConfirmations`."""
+        rows = self.db.execute(
+            "SELECT c.member FROM confirmations c JOIN members m ON m.member = c.member "
+            "WHERE c.transaction_id = ? ORDER BY m.slot",
+            (transaction_id,),
+        )
+        return [r[0] for r in rows]
+
+    def members(self):
+        return [r[0] for r in self.db.execute("SELECT member FROM members ORDER BY slot")]
+
+    def quorum(self):
+        return self.db.execute("SELECT value FROM settings WHERE key = 'quorum'").fetchone()[0]
+
+    def required_votes(self):
+        return (len(self.members()) * self.quorum() + 99) // 100
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
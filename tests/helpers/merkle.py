@@ -0,0 +1,49 @@
+from eth_utils import keccak
+
+from helpers.abi import abi_encode
+
+
+def claim_leaf(winner_address, index, winner_name):
+    return keccak(abi_encode(["address", "uint256", "string"], [str(winner_address), index, winner_name]))
+
+
+def _hash_pair(a, b):
+    return keccak(a + b) if a <= b else keccak(b + a)
+
+
+class MerkleTree:
+    """Merkle tree with sorted pair hashing, as verified by OpenZeppelin's MerkleProof."""
+
+    def __init__(self, leaves):
+        if not leaves:
+            raise ValueError("a Merkle tree needs at least one leaf")
+        self.layers = [list(leaves)]
+        while len(self.layers[-1]) > 1:
+            layer = self.layers[-1]
+            parents = [_hash_pair(layer[i], layer[i + 1]) for i in range(0, len(layer) - 1, 2)]
+            if len(layer) % 2:
+                parents.append(layer[-1])
+            self.layers.append(parents)
+
+    @property
+    def root(self):
+        return "0x" + self.layers[-1][0].hex()
+
+    def proof(self, index):
+        proof = []
+        for layer in self.layers[:-1]:
+            sibling = index ^ 1
+            if sibling < len(layer):
+                proof.append("0x" + layer[sibling].hex())
+            index //= 2
+        return proof
+
+
+def claim_tree(winner_addresses, winner_names):
+    """Returns the tree for `passTrophyByClaim` and the (index, address, name, proof) arguments of each claim."""
+    leaves = [claim_leaf(a, i, n) for i, (a, n) in enumerate(zip(winner_addresses, winner_names))]
+    tree = MerkleTree(leaves)
+    claims = [
+        (i, address, name, tree.proof(i)) for i, (address, name) in enumerate(zip(winner_addresses, winner_names))
+    ]
+    return tree, claims
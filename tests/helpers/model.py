@@ -0,0 +1,479 @@
+"""Executable Python model of CifGovernance and CifEsportsMultiTrophy for differential testing.
+
+The model covers member changes, quorum changes, base URI and trophy pass proposals, votes, executions, stale
+cancellations, immediate trophy passes and token transfers. Every operation either applies completely and records the
+events the contracts emit, or raises `ModelRevert` with the revert message and leaves the model unchanged.
+
+Operations are tuples `(kind, sender, *arguments)` with account indices instead of addresses (-1 is the zero
+address), so that the same sequence can be applied to the model with `apply` and to the deployed contracts with
+`apply_on_chain`.
+"""
+from brownie.exceptions import VirtualMachineError
+
+ZERO_ADDRESS = "0x" + "00" * 20
+MAX_MEMBERS = 256
+INITIAL_INFO_HASH = "0x" + f"{0xabc:064x}"
+
+# TransactionType values of the modelled proposals
+ADD_MEMBER, REMOVE_MEMBER, REPLACE_MEMBER, PASS_TROPHY, CHANGE_QUORUM, SET_BASE_URI = 1, 2, 3, 4, 6, 7
+
+# Events compared with the contracts, Transfer and Approval are covered by comparing the token owners
+EVENT_NAMES = {
+    "ProposalSubmitted",
+    "Submission",
+    "Confirmation",
+    "Revocation",
+    "Execution",
+    "ProposalExecuted",
+    "Cancellation",
+    "MemberAddition",
+    "MemberRemoval",
+    "QuorumChange",
+    "TrophyPassed",
+    "TrophyDetails",
+    "WinnerMinted",
+}
+
+
+class ModelRevert(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Proposal:
+    __slots__ = ("txn_type", "payload", "executed", "cancelled", "confirmations")
+
+    def __init__(self, txn_type, payload, proposer):
+        self.txn_type = txn_type
+        self.payload = payload
+        self.executed = False
+        self.cancelled = False
+        self.confirmations = {proposer}
+
+
+class TrophyModel:
+    def __init__(self):
+        self.events = []
+        self.current_trophy_id = 0
+        self.trophies = {}  # trophy id => (tournament, info hash, token ids)
+        self.names = {}
+        self.owners = {}
+        self.balances = {}  # (trophy id, holder) => number of tokens
+        self.token_trophies = {}
+        self.base_uri = ""
+
+    def _emit(self, name, **args):
+        self.events.append((name, args))
+
+    def pass_trophy(self, tournament, info_hash, winners, names):
+        if len(winners) != len(names):
+            raise ModelRevert("Cif: not same length for address- and name arrays")
+        if ZERO_ADDRESS in winners:
+            raise ModelRevert("ERC721: mint to the zero address")
+        trophy_id = self.current_trophy_id + 1
+        token_ids = []
+        for holder, name in zip(winners, names):
+            token_id = len(self.owners) + 1
+            self.owners[token_id] = holder
+            self.names[token_id] = name
+            self.token_trophies[token_id] = trophy_id
+            self.balances[trophy_id, holder] = self.balances.get((trophy_id, holder), 0) + 1
+            token_ids.append(token_id)
+            self._emit("WinnerMinted", trophyId=trophy_id, holder=holder, tokenId=token_id, winnerName=name)
+        self.current_trophy_id = trophy_id
+        self.trophies[trophy_id] = (tournament, info_hash, tuple(token_ids))
+        self._emit("TrophyPassed", trophyId=trophy_id, infoHash=info_hash)
+        self._emit(
+            "TrophyDetails", trophyId=trophy_id, tournament=tournament, infoHash=info_hash, nWinners=len(winners)
+        )
+
+    def transfer(self, sender, token_id, to):
+        """`transferFrom` sent by the holder of the token."""
+        if self.owners.get(token_id) != sender:
+            raise ModelRevert("ERC721: transfer caller is not owner nor approved")
+        if to == ZERO_ADDRESS:
+            raise ModelRevert("ERC721: transfer to the zero address")
+        trophy_id = self.token_trophies[token_id]
+        self.balances[trophy_id, sender] -= 1
+        self.balances[trophy_id, to] = self.balances.get((trophy_id, to), 0) + 1
+        self.owners[token_id] = to
+
+    def has_current_trophy(self, holder):
+        return self.balances.get((self.current_trophy_id, holder), 0) > 0
+
+
+class GovernanceModel:
+    """Owns `trophy` like a deployed governance contract that received the trophy ownership."""
+
+    def __init__(self, trophy, quorum, members):
+        self.trophy = trophy
+        self.events = trophy.events
+        self.members = list(members)
+        self.is_member = set(members)
+        self.quorum = quorum
+        self.required_votes = 0
+        self.proposals = {}
+        self.pending = []
+        self.executed = []
+        self._update_required_votes()
+
+    def _emit(self, name, **args):
+        self.events.append((name, args))
+
+    def _update_required_votes(self):
+        self.required_votes = (len(self.members) * self.quorum + 99) // 100
+
+    def _only_member(self, sender):
+        if sender not in self.is_member:
+            raise ModelRevert("Gov: caller is not a member")
+
+    def _proposal(self, transaction_id):
+        proposal = self.proposals.get(transaction_id)
+        if proposal is None:
+            raise ModelRevert("Gov: invalid transaction")
+        if proposal.executed:
+            raise ModelRevert("Gov: transaction already executed")
+        if proposal.cancelled:
+            raise ModelRevert("Gov: transaction cancelled")
+        return proposal
+
+    # Proposals
+
+    def add_member(self, sender, member):
+        self._only_member(sender)
+        if member == ZERO_ADDRESS:
+            raise ModelRevert("Gov: new member is the zero address")
+        if member in self.is_member:
+            raise ModelRevert("Gov: member already exists")
+        if len(self.members) >= MAX_MEMBERS:
+            raise ModelRevert("Gov: too many members")
+        return self._propose(sender, ADD_MEMBER, (member,))
+
+    def remove_member(self, sender, member):
+        self._only_member(sender)
+        if member not in self.is_member:
+            raise ModelRevert("Gov: member does not exist")
+        return self._propose(sender, REMOVE_MEMBER, (member,))
+
+    def replace_member(self, sender, old_member, new_member):
+        self._only_member(sender)
+        if new_member == ZERO_ADDRESS:
+            raise ModelRevert("Gov: new member is the zero address")
+        if old_member not in self.is_member:
+            raise ModelRevert("Gov: old member does not exist")
+        if new_member in self.is_member:
+            raise ModelRevert("Gov: new member already exists")
+        return self._propose(sender, REPLACE_MEMBER, (old_member, new_member))
+
+    def change_quorum(self, sender, quorum):
+        self._only_member(sender)
+        if quorum > 100:
+            raise ModelRevert("Gov: new quorum must be between 0 and 100")
+        return self._propose(sender, CHANGE_QUORUM, (quorum,))
+
+    def set_base_uri(self, sender, base_uri):
+        self._only_member(sender)
+        return self._propose(sender, SET_BASE_URI, (base_uri,))
+
+    def pass_trophy(self, sender, tournament, info_hash, winners, names):
+        self._only_member(sender)
+        if len(winners) != len(names):
+            raise ModelRevert("Gov: not same length for address- and name arrays")
+        if self.trophy.has_current_trophy(sender) and all(
+            winner != sender and winner in self.is_member for winner in winners
+        ):
+            self.trophy.pass_trophy(tournament, info_hash, winners, names)
+            return 0
+        payload = (self.trophy.current_trophy_id, tournament, info_hash, tuple(winners), tuple(names))
+        return self._propose(sender, PASS_TROPHY, payload)
+
+    def _propose(self, sender, txn_type, payload):
+        """Submits and confirms in one step, like the proposal functions of the contract."""
+        executes = 1 >= self.required_votes
+        if executes:
+            self._check_execution(txn_type, payload)
+        transaction_id = len(self.proposals) + 1
+        self.proposals[transaction_id] = Proposal(txn_type, payload, sender)
+        self.pending.append(transaction_id)
+        self._emit("ProposalSubmitted", transactionId=transaction_id, txnType=txn_type, proposer=sender)
+        self._emit("Submission", transactionId=transaction_id)
+        self._emit("Confirmation", sender=sender, transactionId=transaction_id)
+        if executes:
+            self._execute(transaction_id)
+        return transaction_id
+
+    # Votes
+
+    def confirm(self, sender, transaction_id):
+        self._only_member(sender)
+        proposal = self._proposal(transaction_id)
+        if sender in proposal.confirmations:
+            raise ModelRevert("Gov: transaction already confirmed")
+        executes = len(proposal.confirmations) + 1 >= self.required_votes
+        if executes:
+            self._check_execution(proposal.txn_type, proposal.payload)
+        proposal.confirmations.add(sender)
+        self._emit("Confirmation", sender=sender, transactionId=transaction_id)
+        if executes:
+            self._execute(transaction_id)
+
+    def revoke(self, sender, transaction_id):
+        self._only_member(sender)
+        proposal = self._proposal(transaction_id)
+        if sender not in proposal.confirmations:
+            raise ModelRevert("Gov: transaction not confirmed")
+        proposal.confirmations.remove(sender)
+        self._emit("Revocation", sender=sender, transactionId=transaction_id)
+
+    def execute(self, sender, transaction_id):
+        self._only_member(sender)
+        proposal = self._proposal(transaction_id)
+        if len(proposal.confirmations) < self.required_votes:
+            return False
+        self._check_execution(proposal.txn_type, proposal.payload)
+        self._execute(transaction_id)
+        return True
+
+    def cancel_stale(self, sender, transaction_ids):
+        self._only_member(sender)
+        if len(transaction_ids) > 256:
+            raise ModelRevert("Gov: too many transactions")
+        cancelled = 0
+        for i, transaction_id in enumerate(transaction_ids):
+            proposal = self.proposals.get(transaction_id)
+            if (
+                proposal is not None
+                and not proposal.executed
+                and not proposal.cancelled
+                and proposal.txn_type == PASS_TROPHY
+                and proposal.payload[0] != self.trophy.current_trophy_id
+            ):
+                proposal.cancelled = True
+                self._remove_pending(transaction_id)
+                self._emit("Cancellation", transactionId=transaction_id)
+                cancelled |= 1 << i
+        return cancelled
+
+    # Execution
+
+    def _check_execution(self, txn_type, payload):
+        """Raises the revert message the execution of the payload would fail with."""
+        if txn_type == ADD_MEMBER:
+            if payload[0] in self.is_member:
+                raise ModelRevert("Gov: member already exists")
+            if len(self.members) >= MAX_MEMBERS:
+                raise ModelRevert("Gov: too many members")
+        elif txn_type == REMOVE_MEMBER:
+            if payload[0] not in self.is_member:
+                raise ModelRevert("Gov: member does not exist")
+        elif txn_type == REPLACE_MEMBER:
+            if payload[0] not in self.is_member:
+                raise ModelRevert("Gov: old member does not exist")
+            if payload[1] in self.is_member:
+                raise ModelRevert("Gov: new member already exists")
+        elif txn_type == PASS_TROPHY:
+            if payload[0] != self.trophy.current_trophy_id:
+                raise ModelRevert("Gov: trophy has been passed already")
+            if ZERO_ADDRESS in payload[3]:
+                raise ModelRevert("ERC721: mint to the zero address")
+
+    def _execute(self, transaction_id):
+        proposal = self.proposals[transaction_id]
+        proposal.executed = True
+        self._remove_pending(transaction_id)
+        self.executed.append(transaction_id)
+        payload = proposal.payload
+        if proposal.txn_type == ADD_MEMBER:
+            self.members.append(payload[0])
+            self.is_member.add(payload[0])
+            self._update_required_votes()
+            self._emit("MemberAddition", member=payload[0])
+        elif proposal.txn_type == REMOVE_MEMBER:
+            self._remove_member(payload[0])
+        elif proposal.txn_type == REPLACE_MEMBER:
+            old_member, new_member = payload
+            self.members[self.members.index(old_member)] = new_member
+            self.is_member.remove(old_member)
+            self.is_member.add(new_member)
+            self._drop_confirmations(old_member)
+            self._emit("MemberRemoval", member=old_member)
+            self._emit("MemberAddition", member=new_member)
+        elif proposal.txn_type == CHANGE_QUORUM:
+            old_quorum, self.quorum = self.quorum, payload[0]
+            self._update_required_votes()
+            self._emit("QuorumChange", oldQuorum=old_quorum, newQuorum=payload[0])
+        elif proposal.txn_type == SET_BASE_URI:
+            self.trophy.base_uri = payload[0]
+        elif proposal.txn_type == PASS_TROPHY:
+            self.trophy.pass_trophy(*payload[1:])
+        self._emit("Execution", transactionId=transaction_id)
+        self._emit("ProposalExecuted", transactionId=transaction_id, txnType=proposal.txn_type)
+
+    def _remove_member(self, member):
+        """The last member moves into the free slot."""
+        slot = self.members.index(member)
+        last = self.members.pop()
+        if last != member:
+            self.members[slot] = last
+        self.is_member.remove(member)
+        self._drop_confirmations(member)
+        self._update_required_votes()
+        self._emit("MemberRemoval", member=member)
+
+    def _drop_confirmations(self, member):
+        for proposal in self.proposals.values():
+            proposal.confirmations.discard(member)
+
+    def _remove_pending(self, transaction_id):
+        self.pending.remove(transaction_id)
+
+    # Views
+
+    def get_confirmations(self, transaction_id):
+        """Confirming members in the order of their slots, like `getConfirmations`."""
+        confirmations = self.proposals[transaction_id].confirmations
+        return [member for member in self.members if member in confirmations]
+
+
+# Operations
+
+GOVERNANCE_FUNCTIONS = {
+    "add_member": "addMember",
+    "remove_member": "removeMember",
+    "replace_member": "replaceMember",
+    "change_quorum": "changeQuorum",
+    "set_base_uri": "setBaseURI",
+    "pass_trophy": "passTrophy",
+    "confirm": "confirmTransaction",
+    "revoke": "revokeConfirmation",
+    "execute": "executeTransaction",
+    "cancel_stale": "cancelStale",
+}
+
+
+def operation_arguments(op, address):
+    """Contract arguments of an operation, `address` maps account indices to addresses."""
+    kind, _, *args = op
+    if kind in ("add_member", "remove_member"):
+        return (address(args[0]),)
+    if kind == "replace_member":
+        return address(args[0]), address(args[1])
+    if kind == "set_base_uri":
+        return (f"https://cif.unibas.ch/{args[0]}/",)
+    if kind == "pass_trophy":
+        winners, n = args
+        names = [f"Player {n}-{i}" for i in range(len(winners))]
+        return f"Tournament {n}", "0x" + f"{n:064x}", [address(w) for w in winners], names
+    if kind == "cancel_stale":
+        return (list(args[0]),)
+    if kind == "transfer":
+        return args[0], address(args[1])
+    return tuple(args)
+
+
+def new_model(addresses):
+    """The model of the `gov_trophy` setup: four members, 50% quorum and a first trophy held by the third member."""
+    trophy = TrophyModel()
+    trophy.pass_trophy("Tournament 0", INITIAL_INFO_HASH, [addresses[2]], ["Hannes"])
+    trophy.events.clear()
+    return GovernanceModel(trophy, 50, addresses[:4])
+
+
+def apply(model, addresses, op):
+    """Runs `op` on the model, returns ("ok", return value, events) or ("revert", reason, [])."""
+    address = _address_of(addresses)
+    kind, sender = op[0], address(op[1])
+    args = operation_arguments(op, address)
+    del model.events[:]
+    try:
+        if kind == "transfer":
+            result = model.trophy.transfer(sender, *args)
+        else:
+            result = getattr(model, kind)(sender, *args)
+    except ModelRevert as e:
+        return "revert", e.reason, []
+    return "ok", result, [(name, normalize(event_args)) for name, event_args in model.events]
+
+
+def apply_on_chain(gov, trophy, accounts, op):
+    """Runs `op` on the contracts, with the same result format as `apply`."""
+    address = _address_of(accounts)
+    kind, sender = op[0], accounts[op[1]]
+    args = operation_arguments(op, address)
+    try:
+        if kind == "transfer":
+            tx = trophy.transferFrom(sender, args[1], args[0], {'from': sender})
+        else:
+            tx = getattr(gov, GOVERNANCE_FUNCTIONS[kind])(*args, {'from': sender})
+    except VirtualMachineError as e:
+        return "revert", e.revert_msg, []
+    events = [(e.name, normalize({k: e[k] for k in e.keys()})) for e in tx.events if e.name in EVENT_NAMES]
+    return "ok", tx.return_value, events
+
+
+def model_state(model):
+    gov, trophy = model, model.trophy
+    return normalize({
+        "members": gov.members,
+        "quorum": gov.quorum,
+        "required_votes": gov.required_votes,
+        "transaction_count": len(gov.proposals),
+        "pending": gov.pending,
+        "executed": gov.executed,
+        "proposals": {
+            i: (p.txn_type, p.executed, p.cancelled, gov.get_confirmations(i)) for i, p in gov.proposals.items()
+        },
+        "current_trophy_id": trophy.current_trophy_id,
+        "trophies": {
+            i: (tournament, info_hash, [trophy.names[t] for t in token_ids], token_ids)
+            for i, (tournament, info_hash, token_ids) in trophy.trophies.items()
+        },
+        "owners": trophy.owners,
+        "base_uri": trophy.base_uri,
+    })
+
+
+def chain_state(gov, trophy):
+    transaction_count = gov.transactionCount()
+    proposals = {}
+    for i in range(1, transaction_count + 1):
+        txn_type, executed = gov.transactions(i)
+        proposals[i] = (txn_type, executed, gov.isCancelled(i), gov.getConfirmations(i))
+    current_trophy_id = trophy.currentTrophyId()
+    trophies = {}
+    for i in range(1, current_trophy_id + 1):
+        info = trophy.getInfoByTrophyId(i)
+        trophies[i] = (info[0], info[2], info[3], info[4])
+    return normalize({
+        "members": gov.getMembers(),
+        "quorum": gov.quorum(),
+        "required_votes": gov.requiredVotes(),
+        "transaction_count": transaction_count,
+        "pending": gov.getTransactionIds(False, 0, transaction_count),
+        "executed": gov.getTransactionIds(True, 0, transaction_count),
+        "proposals": proposals,
+        "current_trophy_id": current_trophy_id,
+        "trophies": trophies,
+        "owners": {i: trophy.ownerOf(i) for i in range(1, trophy.totalSupply() + 1)},
+        "base_uri": trophy.baseURI(),
+    })
+
+
+def normalize(value):
+    """Makes model and contract values comparable: bytes as hex, addresses lowercase, tuples as lists."""
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, str):
+        return value.lower() if value.startswith("0x") and len(value) == 42 else str(value)
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+
+def _address_of(accounts):
+    def address(index):
+        return ZERO_ADDRESS if index < 0 else str(accounts[index])
+    return address
@@ -0,0 +1,44 @@
+from collections import namedtuple
+
+from brownie import ZERO_ADDRESS
+
+Preview = namedtuple("Preview", ["reaches_quorum", "votes", "required", "executable", "reason", "can_vote"])
+
+
+class PreflightError(Exception):
+    pass
+
+
+def preview(gov, transaction_id, voter=ZERO_ADDRESS):
+    return Preview(*gov.previewExecution(transaction_id, voter))
+
+
+def confirm(gov, transaction_id, voter):
+    """Confirms only if the vote can't fail: votes that don't reach the quorum are always sent,
+    the deciding vote only if the payload still executes. Deciding votes on committed trophy passes
+    have to be sent with `confirmPassTrophy`."""
+    result = preview(gov, transaction_id, voter)
+    if not result.can_vote:
+        raise PreflightError(f"transaction {transaction_id} would revert: {_vote_failure(gov, result, voter)}")
+    if result.reaches_quorum and not result.executable:
+        raise PreflightError(f"transaction {transaction_id} can't execute: {result.reason}")
+    return gov.confirmTransaction(transaction_id, {'from': voter})
+
+
+def _vote_failure(gov, result, voter):
+    """The revert message of `confirmTransaction` for a voter that can't vote."""
+    if not gov.isMember(voter):
+        return "Gov: caller is not a member"
+    if result.reason in ("Gov: transaction already executed", "Gov: transaction cancelled"):
+        return result.reason
+    return "Gov: transaction already confirmed"
+
+
+def execute(gov, transaction_id, sender):
+    """Executes only if the transaction has the quorum and the payload still executes."""
+    result = preview(gov, transaction_id)
+    if not result.reaches_quorum:
+        raise PreflightError(f"transaction {transaction_id} has {result.votes} of {result.required} votes")
+    if not result.executable:
+        raise PreflightError(f"transaction {transaction_id} would revert: {result.reason}")
+    return gov.executeTransaction(transaction_id, {'from': sender})
@@ -0,0 +1,21 @@
+from eth_utils import keccak
+
+from helpers.abi import abi_encode
+
+
+def roster_batches(winner_addresses, winner_names, batch_size):
+    """Splits a roster into `appendWinners` arguments and returns the roster hash for `openTrophy`.
+
+    Every batch commits to the next one, so the first hash commits to the whole roster in order. The contracts only
+    store this hash, the roster itself is in the `appendWinners` calldata and the `WinnerMinted` logs, so keep the
+    batches until they are all appended.
+    """
+    batches = []
+    next_hash = bytes(32)
+    for start in reversed(range(0, len(winner_addresses), batch_size)):
+        addresses = [str(a) for a in winner_addresses[start:start + batch_size]]
+        names = list(winner_names[start:start + batch_size])
+        batches.append((addresses, names, "0x" + next_hash.hex()))
+        next_hash = keccak(abi_encode(["address[]", "string[]", "bytes32"], [addresses, names, next_hash]))
+    batches.reverse()
+    return "0x" + next_hash.hex(), batches
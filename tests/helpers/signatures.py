@@ -0,0 +1,99 @@
+from eth_keys import keys
+from eth_utils import keccak, to_bytes
+
+from helpers.abi import abi_decode, abi_encode
+
+PROPOSAL_TYPEHASH = keccak(text="Proposal(uint8 txnType,bytes32 payloadHash,uint256 nonce,uint256 deadline)")
+TROPHY_PROPOSAL_TYPEHASH = keccak(
+    text="TrophyProposal(uint8 txnType,bytes32 payloadHash,uint256 nonce,uint256 deadline,uint256 currentTrophyId)"
+)
+# passTrophy, passTrophyByClaim and openTrophy are signed for the current trophy id
+TROPHY_PASS_TYPES = {4, 8, 9}
+
+# Argument types of the proposal functions, by TransactionType
+PAYLOAD_TYPES = {
+    1: ["address"],  # addMember
+    2: ["address"],  # removeMember
+    3: ["address", "address"],  # replaceMember
+    4: ["string", "bytes32", "address[]", "string[]"],  # passTrophy
+    5: ["address"],  # transferOwnership
+    6: ["uint256"],  # changeQuorum
+    7: ["string"],  # setBaseURI
+    8: ["string", "bytes32", "bytes32", "uint256"],  # passTrophyByClaim
+    9: ["string", "bytes32", "bytes32"],  # openTrophy
+    11: ["uint256", "string"],  # setTrophyURI
+    12: [],  # cancelOpenTrophy
+}
+
+
+def _normalize(abi_type, value):
+    if abi_type == "address":
+        return str(value)
+    if abi_type == "address[]":
+        return [str(v) for v in value]
+    if abi_type == "bytes32" and isinstance(value, str):
+        return to_bytes(hexstr=value).rjust(32, b"\0")
+    return value
+
+
+def encode_payload(txn_type, args):
+    """ABI encodes the arguments of a proposal as expected by `submitTransactionWithSignatures`."""
+    types = PAYLOAD_TYPES[txn_type]
+    return abi_encode(types, [_normalize(t, v) for t, v in zip(types, args)])
+
+
+def decode_payload(txn_type, payload):
+    """Decodes a proposal payload returned by `getGovernanceSnapshot`. Committed trophy passes (10) can't be signed,
+    their payload is the trophy id they were proposed for and the hash of the arguments."""
+    types = ["uint256", "bytes32"] if txn_type == 10 else PAYLOAD_TYPES[txn_type]
+    return list(abi_decode(types, bytes(payload)))
+
+
+def proposal_digest(domain_separator, txn_type, payload, nonce, deadline, current_trophy_id=None):
+    if txn_type in TROPHY_PASS_TYPES:
+        if current_trophy_id is None:
+            raise ValueError("trophy passes are signed for the current trophy id")
+        struct_hash = keccak(abi_encode(
+            ["bytes32", "uint8", "bytes32", "uint256", "uint256", "uint256"],
+            [TROPHY_PROPOSAL_TYPEHASH, txn_type, keccak(payload), nonce, deadline, current_trophy_id],
+        ))
+    else:
+        struct_hash = keccak(abi_encode(
+            ["bytes32", "uint8", "bytes32", "uint256", "uint256"],
+            [PROPOSAL_TYPEHASH, txn_type, keccak(payload), nonce, deadline],
+        ))
+    return keccak(b"\x19\x01" + to_bytes(hexstr=str(domain_separator)) + struct_hash)
+
+
+def sign_digest(private_key, digest):
+    """Returns the 65 byte r || s || v signature accepted by OpenZeppelin's ECDSA.recover."""
+    signature = keys.PrivateKey(to_bytes(hexstr=str(private_key))).sign_msg_hash(digest)
+    r, s, v = signature.vrs
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v + 27])
+
+
+class SignatureAggregator:
+    """Collects member signatures for one proposal until it can be relayed. The nonce is the next `proposalNonce`
+    of `gov` and `deadline` the last timestamp the proposal can be relayed at. Trophy passes need the id of the
+    current trophy, they can't be relayed anymore once it has been passed on."""
+
+    def __init__(self, gov, txn_type, args, deadline, current_trophy_id=None, nonce=None):
+        self.txn_type = txn_type
+        self.payload = encode_payload(txn_type, args)
+        self.nonce = gov.proposalNonce() if nonce is None else nonce
+        self.deadline = deadline
+        self.digest = proposal_digest(
+            gov.DOMAIN_SEPARATOR(), txn_type, self.payload, self.nonce, deadline, current_trophy_id
+        )
+        self.signatures = {}
+
+    def sign(self, account):
+        """Signs with a local account, a second signature of the same member replaces the first one."""
+        self.signatures[str(account)] = sign_digest(account.private_key, self.digest)
+
+    def add(self, member, signature):
+        self.signatures[str(member)] = signature
+
+    def submission_args(self):
+        """Arguments for `submitTransactionWithSignatures`."""
+        return self.txn_type, self.payload, self.nonce, self.deadline, list(self.signatures.values())
@@ -0,0 +1,25 @@
+from eth_utils import to_bytes
+
+
+def encode_winners(winner_addresses, winner_names):
+    """Packs winners for the `passTrophy(string,bytes32,bytes)` overloads, see WinnerEncoding.sol."""
+    if len(winner_addresses) != len(winner_names):
+        raise ValueError("not same length for address- and name arrays")
+    packed = b""
+    for address, name in zip(winner_addresses, winner_names):
+        encoded_name = name.encode("utf-8")
+        if len(encoded_name) > 255:
+            raise ValueError(f"name is longer than 255 bytes: {name}")
+        packed += to_bytes(hexstr=str(address)) + bytes([len(encoded_name)]) + encoded_name
+    return packed
+
+
+def calldata_gas(data):
+    """Intrinsic gas of transaction input: 4 per zero byte and 16 per non-zero byte."""
+    data = to_bytes(hexstr=str(data))
+    return sum(4 if b == 0 else 16 for b in data)
+
+
+def filler_addresses(count, start=0x10000):
+    """Deterministic addresses without keys, used to pad member and winner lists."""
+    return [f"0x{i:040x}" for i in range(start, start + count)]